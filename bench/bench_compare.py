@@ -0,0 +1,81 @@
+"""
+Throughput benchmark for the streaming output comparator (src/tools/compare.py).
+
+Generates large expected/actual output files and times compare_files() on:
+- identical integer outputs with different whitespace layout (tokens mode)
+- float outputs with small numeric noise (float mode)
+- a single differing token at the very end (worst case for diagnostics)
+
+Usage:
+    python bench/bench_compare.py [--mb 64] [--repeat 3]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from tools.compare import compare_files  # noqa: E402
+
+
+def _write_ints(path: str, count: int, sep: bytes, last: int | None = None) -> None:
+    rnd = random.Random(42)
+    with open(path, "wb") as f:
+        batch = 1 << 16
+        for start in range(0, count, batch):
+            n = min(batch, count - start)
+            nums = [rnd.randrange(10**9) for _ in range(n)]
+            if last is not None and start + n == count:
+                nums[-1] = last
+            f.write(sep.join(str(x).encode() for x in nums) + sep)
+
+
+def _write_floats(path: str, count: int, noise: float) -> None:
+    rnd = random.Random(7)
+    with open(path, "wb") as f:
+        for _ in range(count):
+            x = rnd.random() * 1000
+            f.write(f"{x + rnd.uniform(-noise, noise):.9f}\n".encode())
+
+
+def _bench(label: str, exp: str, act: str, mode: str, repeat: int) -> None:
+    size = os.path.getsize(exp) + os.path.getsize(act)
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = compare_files(exp, act, mode)
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<28} {size / 2**20:8.1f} MiB  {best * 1000:9.1f} ms  "
+          f"{size / 2**20 / best:8.1f} MiB/s  ok={result['ok']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=int, default=64, help="approximate size of each generated file")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    ints = args.mb * 2**20 // 10
+    floats = args.mb * 2**20 // 14
+    with tempfile.TemporaryDirectory() as d:
+        p = lambda name: os.path.join(d, name)
+        _write_ints(p("a.txt"), ints, b" ")
+        _write_ints(p("b.txt"), ints, b"\n")
+        _write_ints(p("c.txt"), ints, b" ", last=-1)
+        _write_floats(p("f1.txt"), floats, 0.0)
+        _write_floats(p("f2.txt"), floats, 1e-8)
+
+        _bench("tokens, identical", p("a.txt"), p("a.txt"), "tokens", args.repeat)
+        _bench("tokens, different layout", p("a.txt"), p("b.txt"), "tokens", args.repeat)
+        _bench("tokens, last token differs", p("a.txt"), p("c.txt"), "tokens", args.repeat)
+        _bench("float, 1e-8 noise", p("f1.txt"), p("f2.txt"), "float", args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Replay benchmark / regression loop for recorded runs (src/tools/cassette.py).
+
+Replays a cassette recorded with `python main.py --record CASSETTE ...` through the full
+authoring graph N times. Writes go to an in-memory filesystem and every other tool call is
+served from the cassette, so no provider key, compiler or network is needed. Fails if any
+run needs a call that is not in the cassette (e.g. after a prompt change).
+
+Usage:
+    python bench/bench_replay.py CASSETTE [--runs 100]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from dataclasses import fields
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from agents import AuthoringConfig, AuthoringState, build_authoring_graph  # noqa: E402
+from agents.tools import Toolbelt  # noqa: E402
+from tools.cassette import Cassette  # noqa: E402
+
+
+def _memory_toolbelt(files: Dict[str, bytes]) -> Toolbelt:
+    def write_file(path: str, content: str) -> None:
+        files[path] = content.encode("utf-8")
+
+    def write_bytes(path: str, data: bytes) -> None:
+        files[path] = data
+
+    # Tools left unset are bound to the cassette by Cassette.wrap()
+    return Toolbelt(
+        llm_chat=None,
+        run_shell=None,
+        write_file=write_file,
+        read_file=None,
+        list_dir=None,
+        ensure_dir=lambda path: None,
+        generate_image=None,
+        write_bytes=write_bytes,
+        index_problem=lambda *args, **kwargs: None,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cassette")
+    parser.add_argument("--runs", type=int, default=100)
+    args = parser.parse_args()
+
+    graph = build_authoring_graph()
+    samples: List[float] = []
+    outputs = None
+    for _ in range(args.runs):
+        cassette = Cassette(args.cassette, "replay")
+        known = {f.name for f in fields(AuthoringConfig)}
+        cfg = AuthoringConfig(**{k: v for k, v in cassette.meta.get("config", {}).items() if k in known})
+        files: Dict[str, bytes] = {}
+        start = time.perf_counter()
+        state = graph(AuthoringState(cassette.meta.get("seed", "")), cfg, cassette.wrap(_memory_toolbelt(files)))
+        samples.append(time.perf_counter() - start)
+        if outputs is None:
+            outputs = state.io.grading_outputs
+        elif state.io.grading_outputs != outputs:
+            sys.exit("replay is not deterministic: grading outputs differ between runs")
+    print(f"{args.runs} replays of {args.cassette}: median {statistics.median(samples) * 1000:.1f} ms, "
+          f"max {max(samples) * 1000:.1f} ms, {len(files)} file(s) written per run")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Cold-start benchmark for the CLI.
+
+Measures, in fresh interpreters:
+- wall time of `python main.py --help`
+- cumulative import time of `main` (via `python -X importtime`)
+- whether any provider SDK was imported eagerly
+
+Usage:
+    python bench/bench_startup.py [--runs N] [--top K]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# Modules that must only be imported when a provider is first used.
+HEAVY_MODULES = ("langchain_openai", "langchain_core", "google.genai")
+
+
+def _time_help(runs: int) -> list[float]:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "main.py", "--help"],
+            cwd=SRC_DIR,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            check=False,
+        )
+        elapsed = time.perf_counter() - start
+        _require_success(proc, "main.py --help")
+        samples.append(elapsed)
+    return samples
+
+
+def _require_success(proc: subprocess.CompletedProcess, what: str) -> None:
+    # A crash (e.g. an ImportError) must not be reported as a start-up time.
+    if proc.returncode != 0:
+        sys.exit(f"{what} failed with exit code {proc.returncode}:\n{proc.stderr[-2000:]}")
+
+
+def _import_profile() -> list[tuple[int, str]]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        # -X importtime interleaves the traceback with timing lines; keep only the traceback
+        proc.stderr = "\n".join(l for l in proc.stderr.splitlines() if not l.startswith("import time:"))
+    _require_success(proc, "import main")
+    rows = []
+    for line in proc.stderr.splitlines():
+        # "import time:   self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        rows.append((int(parts[1].strip()), parts[2].rstrip()))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    samples = _time_help(args.runs)
+    print(f"main.py --help: median {statistics.median(samples) * 1000:.1f} ms, "
+          f"min {min(samples) * 1000:.1f} ms over {args.runs} runs")
+
+    rows = _import_profile()
+    total = next((us for us, name in rows if name.strip() == "main"), None)
+    if total is not None:
+        print(f"import main: {total / 1000:.1f} ms cumulative")
+    print(f"top {args.top} imports by cumulative time:")
+    for us, name in sorted(rows, reverse=True)[: args.top]:
+        print(f"  {us / 1000:8.1f} ms  {name.strip()}")
+
+    eager = sorted({name.strip() for _, name in rows if name.strip().startswith(HEAVY_MODULES)})
+    if eager:
+        print(f"WARNING: provider SDKs imported at startup: {', '.join(eager)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
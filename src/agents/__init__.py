@@ -8,8 +8,7 @@ from .prompts import (
     ALGO_ANALYSIS_PROMPT,
     PROBLEM_STATEMENT_PROMPT,
     CODEGEN_PROMPT,
-    CASEGEN_PROMPT,
-    BUILD_PROMPT,
+    CASEGEN_SHARD_PROMPT,
     OUTPUT_ANALYSIS_PROMPT,
     IMAGE_GEN_PROMPT,
     REVIEW_PROMPT,
@@ -17,15 +16,15 @@ from .prompts import (
 )
 
 from .state import AuthoringState, AuthoringConfig, ProblemIOBundle
-from .graph import build_authoring_graph
+from .graph import build_authoring_graph, AUTHORING_STEPS
+from .bulk import run_bulk
 
 __all__ = [
     "REQUIREMENT_ANALYSIS_PROMPT",
     "ALGO_ANALYSIS_PROMPT",
     "PROBLEM_STATEMENT_PROMPT",
     "CODEGEN_PROMPT",
-    "CASEGEN_PROMPT",
-    "BUILD_PROMPT",
+    "CASEGEN_SHARD_PROMPT",
     "OUTPUT_ANALYSIS_PROMPT",
     "IMAGE_GEN_PROMPT",
     "REVIEW_PROMPT",
@@ -34,4 +33,6 @@ __all__ = [
     "AuthoringConfig",
     "ProblemIOBundle",
     "build_authoring_graph",
+    "AUTHORING_STEPS",
+    "run_bulk",
 ]
@@ -0,0 +1,169 @@
+"""
+Offline bulk generation: advance many AuthoringStates through the pipeline in lockstep.
+
+For each step, every active state runs against a deferred llm_chat. The first call whose
+answer is not known yet records the request and aborts the step with PendingBatch; all
+recorded requests of that round are sent as ONE batch job, the answers are cached per state,
+and the step is re-run from its pre-step snapshot. Steps that issue several LLM calls simply
+take several rounds. Latency per problem goes up, cost and request count go down.
+"""
+
+import copy
+import hashlib
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .graph import AUTHORING_STEPS
+from .state import AuthoringState, AuthoringConfig
+from .tools import Toolbelt
+
+
+# submit_batch(requests) -> {custom_id: response text}; each request is
+# {"custom_id": str, "prompt": str, "system": str | None}
+SubmitBatch = Callable[[List[Dict[str, Any]]], Dict[str, str]]
+
+
+class PendingBatch(BaseException):
+    """Raised inside a step when its LLM answer will come from the next batch.
+
+    Derives from BaseException so that generic `except Exception` handlers in steps
+    (retries, per-image error capture) let it through.
+    """
+
+
+def _request_key(prompt: str, system: Optional[str], occurrence: int = 0) -> str:
+    h = hashlib.sha256()
+    h.update((system or "").encode("utf-8"))
+    h.update(b"\0")
+    h.update(prompt.encode("utf-8"))
+    if occurrence:
+        h.update(f"\0{occurrence}".encode("ascii"))
+    return h.hexdigest()
+
+
+class _DeferredLLM:
+    def __init__(self, job: int) -> None:
+        self.job = job
+        self.answers: Dict[str, str] = {}
+        self.requests: Dict[str, Dict[str, Any]] = {}
+        self._seen: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def begin_step(self) -> None:
+        # Answers are only replayed within the step that asked for them.
+        self.answers.clear()
+
+    def begin_run(self) -> None:
+        self.requests.clear()
+        self._seen.clear()
+
+    def __call__(self, prompt: str, system: Optional[str] = None) -> str:
+        # A step re-runs from its snapshot each round and makes the same calls in the same order.
+        # Repeating a prompt within one run (a retry, a second regeneration) is a new request,
+        # so the n-th occurrence has its own key instead of getting the first answer back.
+        base = _request_key(prompt, system)
+        with self._lock:
+            occurrence = self._seen.get(base, 0)
+            self._seen[base] = occurrence + 1
+        key = _request_key(prompt, system, occurrence)
+        if key in self.answers:
+            return self.answers[key]
+        # dict assignment is atomic, so concurrent calls from one step are all recorded
+        self.requests[key] = {"custom_id": f"{self.job}-{key[:24]}", "prompt": prompt, "system": system}
+        raise PendingBatch(key)
+
+
+def _index_statement(tb: Toolbelt, state: AuthoringState, cfg: AuthoringConfig) -> bool:
+    # The corpus only learns about a problem in step_persist, which in lockstep runs after every
+    # job has passed dedupe. Index each statement as soon as it is checked so that later jobs of
+    # the same batch are compared against it; persist re-indexes the final statement, and
+    # run_bulk removes the entry again if the job fails.
+    index_problem = getattr(tb, "index_problem", None)
+    if not callable(index_problem) or cfg.problem_id is None:
+        return False
+    index_problem(str(cfg.problem_id), state.statement, state.algo.get("algorithms", []))
+    return True
+
+
+def run_bulk(
+    jobs: List[Tuple[AuthoringState, AuthoringConfig]],
+    tb: Toolbelt,
+    submit_batch: SubmitBatch,
+    on_step: Optional[Callable[[str, int, int], None]] = None,
+    batch_retries: int = 2,
+) -> List[AuthoringState | BaseException]:
+    """Run all jobs step by step, batching each step's LLM requests across jobs.
+
+    Returns one entry per job: the final state, or the exception that stopped it. Jobs are
+    deduplicated against each other as well as the corpus (earlier jobs win).
+    A batch that fails (e.g. ends failed or expired) is resubmitted up to batch_retries times;
+    after that only the jobs waiting on it fail.
+    on_step(step_name, rounds, requests) is called after each step for progress reporting.
+    """
+    llms = [_DeferredLLM(i) for i in range(len(jobs))]
+    states: List[AuthoringState | BaseException] = [state for state, _ in jobs]
+    indexed: List[int] = []
+    for name, step in AUTHORING_STEPS:
+        pending = [i for i, s in enumerate(states) if isinstance(s, AuthoringState)]
+        for i in pending:
+            llms[i].begin_step()
+        rounds = 0
+        total = 0
+        while pending:
+            waiting: List[int] = []
+            for i in pending:
+                llm = llms[i]
+                llm.begin_run()
+                job_tb = copy.copy(tb)
+                job_tb.llm_chat = llm
+                # a hedge or deadline makes no sense for a request that waits for a batch
+                job_tb.hedge_llm = None
+                try:
+                    states[i] = step(copy.deepcopy(states[i]), jobs[i][1], job_tb)
+                    if name == "dedupe" and _index_statement(tb, states[i], jobs[i][1]):
+                        indexed.append(i)
+                except PendingBatch:
+                    waiting.append(i)
+                except Exception as e:
+                    states[i] = e
+            requests = [r for i in waiting for r in llms[i].requests.values()]
+            if not requests:
+                break
+            rounds += 1
+            total += len(requests)
+            answers = _submit(submit_batch, requests, name, batch_retries)
+            if isinstance(answers, BaseException):
+                for i in waiting:
+                    states[i] = answers
+                break
+            for i in waiting:
+                for key, req in llms[i].requests.items():
+                    if req["custom_id"] in answers:
+                        llms[i].answers[key] = answers[req["custom_id"]]
+                    else:
+                        states[i] = RuntimeError(f"batch returned no result for {req['custom_id']} in step {name}")
+                        break
+            pending = [i for i in waiting if isinstance(states[i], AuthoringState)]
+        if on_step:
+            on_step(name, rounds, total)
+    # Early index entries of problems that were never persisted would flag future problems
+    unindex_problem = getattr(tb, "unindex_problem", None)
+    if callable(unindex_problem):
+        for i in indexed:
+            if isinstance(states[i], BaseException):
+                unindex_problem(str(jobs[i][1].problem_id))
+    return states
+
+
+def _submit(
+    submit_batch: SubmitBatch, requests: List[Dict[str, Any]], step: str, retries: int
+) -> Dict[str, str] | BaseException:
+    error: BaseException = RuntimeError("batch was not submitted")
+    for attempt in range(retries + 1):
+        try:
+            return submit_batch(requests)
+        except Exception as e:
+            error = RuntimeError(f"batch for step {step} failed: {e}")
+            logging.warning("Batch for step %s failed (attempt %d/%d): %s", step, attempt + 1, retries + 1, e)
+    return error
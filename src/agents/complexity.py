@@ -0,0 +1,307 @@
+"""
+Empirical time-complexity estimation for reference solutions.
+
+Pure helpers used by step_complexity: reading the largest bound of a size parameter from
+the statement constraints, mapping an "O(...)" hint to a complexity class, fitting measured
+(n, seconds) points against the candidate classes, and deciding whether the timings exceed
+the time budget.
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import math
+import re
+
+
+# (name, growth function); ordered from slowest- to fastest-growing
+CLASSES: List[Tuple[str, Callable[[float], float]]] = [
+    ("1", lambda n: 1.0),
+    ("log n", lambda n: math.log2(max(n, 2))),
+    ("n", lambda n: float(n)),
+    ("n log n", lambda n: n * math.log2(max(n, 2))),
+    ("n sqrt n", lambda n: float(n) ** 1.5),
+    ("n^2", lambda n: float(n) ** 2),
+    ("n^2 log n", lambda n: float(n) ** 2 * math.log2(max(n, 2))),
+    ("n^3", lambda n: float(n) ** 3),
+]
+# Polynomial degree of each class. Log factors are not told apart reliably by timings over a
+# few decades of n, so classes are compared by degree only.
+_DEGREE = {"1": 0, "log n": 0, "n": 1, "n log n": 1, "n sqrt n": 1.5, "n^2": 2, "n^2 log n": 2, "n^3": 3}
+_GROWTH = dict(CLASSES)
+# fit() result when the timings are too close to the fixed overhead to tell classes apart
+INCONCLUSIVE = "inconclusive"
+
+# 200000, 200,000, 2 * 10^5, 2 \times 10^{5}, 2e5, 10^9
+_NUMBER = (
+    r"\d[\d,]*(?:\.\d+)?"
+    r"(?:\s*(?:[*x×·]|\\times|\\cdot)\s*10\s*\^\s*\{?\d+\}?|\s*[eE]\s*\d+|\s*\^\s*\{?\d+\}?)?"
+)
+_LE = r"(?:<=|≤|\\le(?:q)?|=<|<)"
+
+
+def _to_number(text: str) -> Optional[float]:
+    text = text.replace(",", "").replace("{", "").replace("}", "").replace(" ", "")
+    m = re.fullmatch(r"(\d+(?:\.\d+)?)(?:(?:[*x×·]|\\times|\\cdot)10\^(\d+)|[eE](\d+)|\^(\d+))?", text)
+    if not m:
+        return None
+    base = float(m.group(1))
+    if m.group(2):
+        return base * 10 ** int(m.group(2))
+    if m.group(3):
+        return base * 10 ** int(m.group(3))
+    if m.group(4):
+        return base ** int(m.group(4))
+    return base
+
+
+def max_bound(constraints: str, name: str) -> Optional[int]:
+    """Largest upper bound stated for `name` (case-insensitive), e.g. "1 <= N <= 2 * 10^5" -> 200000."""
+    if not constraints or not name:
+        return None
+    pattern = rf"(?<![A-Za-z_]){re.escape(name)}(?![A-Za-z_0-9])\s*{_LE}\s*({_NUMBER})"
+    values = [_to_number(m.group(1)) for m in re.finditer(pattern, constraints, flags=re.IGNORECASE)]
+    values = [v for v in values if v is not None]
+    return int(max(values)) if values else None
+
+
+_TOKEN = re.compile(r"\s*(\d+(?:\.\d+)?|log|lg|ln|sqrt|[a-z]|[()+*/^!])")
+
+
+class _Unknown(ValueError):
+    """The hint is not a polynomial/log expression of the sizes."""
+
+
+def _tokens(body: str) -> List[str]:
+    # Normalise unicode and LaTeX spellings, then split into numbers, letters, log/sqrt and operators
+    body = body.lower().replace("²", "^2").replace("³", "^3").replace("√", "sqrt")
+    body = re.sub(r"\\(?:left|right)|\\[,;! ]", "", body)
+    body = re.sub(r"\\(?:cdot|times)|[·×]", "*", body)
+    body = re.sub(r"\\(?=log|lg|ln|sqrt)", "", body)
+    if "\\" in body:
+        raise _Unknown(body)
+    body = body.replace("{", "(").replace("}", ")")
+    # log_2 n, log2(n), a_i: subscripts do not change the growth
+    body = re.sub(r"(log|lg)2(?=\s*[a-z(])", r"\1", body)
+    body = re.sub(r"_(?:\([^()]*\)|\w)", "", body)
+    if body.strip() in ("const", "constant"):
+        return ["1"]
+    tokens, pos = [], 0
+    while pos < len(body):
+        m = _TOKEN.match(body, pos)
+        if not m:
+            if body[pos:].strip():
+                raise _Unknown(body)
+            break
+        tokens.append(m.group(1))
+        pos = m.end()
+    return tokens
+
+
+def _growth(tokens: List[str]) -> Tuple[float, float]:
+    # Recursive descent over the hint: every (sub)expression evaluates to
+    # (polynomial degree, power of log); a sum keeps its fastest-growing term.
+    pos = 0
+
+    def peek() -> Optional[str]:
+        return tokens[pos] if pos < len(tokens) else None
+
+    def take(expected: Optional[str] = None) -> str:
+        nonlocal pos
+        tok = peek()
+        if tok is None or (expected is not None and tok != expected):
+            raise _Unknown(expected or "end of hint")
+        pos += 1
+        return tok
+
+    def exponent() -> float:
+        tok = take()
+        if tok == "(":
+            num = float(take())
+            if peek() == "/":
+                take("/")
+                num /= float(take())
+            take(")")
+            return num
+        if not re.fullmatch(r"\d+(?:\.\d+)?", tok):
+            raise _Unknown(tok)  # n^k, 2^n: not a fixed polynomial
+        return float(tok)
+
+    def atom() -> Tuple[float, float]:
+        tok = take()
+        if tok in ("log", "lg", "ln"):
+            power = 1.0
+            if peek() == "^":  # log^2 n
+                take("^")
+                power = exponent()
+            inner = atom()
+            return (0.0, power if inner != (0.0, 0.0) else 0.0)
+        if tok == "sqrt":
+            d, l = atom()
+            return (d / 2, l / 2)
+        if tok == "(":
+            value = expr()
+            take(")")
+            return value
+        if re.fullmatch(r"\d+(?:\.\d+)?", tok):
+            if peek() == "^":
+                take("^")
+                exponent()
+            return (0.0, 0.0)
+        if re.fullmatch(r"[a-z]", tok):
+            return (1.0, 0.0)
+        raise _Unknown(tok)
+
+    def factor() -> Tuple[float, float]:
+        d, l = atom()
+        if peek() == "^":
+            take("^")
+            e = exponent()
+            d, l = d * e, l * e
+        if peek() == "!":
+            raise _Unknown("factorial")
+        return d, l
+
+    def term() -> Tuple[float, float]:
+        d, l = factor()
+        while peek() not in (None, "+", ")"):
+            divide = peek() == "/"
+            if peek() in ("*", "/"):
+                take()
+            fd, fl = factor()
+            d, l = (d - fd, l - fl) if divide else (d + fd, l + fl)
+        return d, l
+
+    def expr() -> Tuple[float, float]:
+        value = term()
+        while peek() == "+":
+            take("+")
+            value = max(value, term())
+        return value
+
+    value = expr()
+    if pos != len(tokens):
+        raise _Unknown(tokens[pos])
+    return value
+
+
+def _hint_body(hint: str) -> str:
+    # The argument of the first O(...), with balanced parentheses; the whole hint if there is none
+    m = re.search(r"O\s*\(", hint)
+    if not m:
+        return hint
+    depth, start = 1, m.end()
+    for k in range(start, len(hint)):
+        if hint[k] == "(":
+            depth += 1
+        elif hint[k] == ")":
+            depth -= 1
+            if depth == 0:
+                return hint[start:k]
+    return hint[start:]
+
+
+def hint_class(hint: str) -> Optional[str]:
+    """Map a hint such as "O(N log N)", "O(n^2)" or "O(N \\sqrt{N})" to a key of CLASSES.
+
+    Other size letters count as n and a sum keeps its fastest-growing term, so "O((N + Q) log N)"
+    is "n log n". Exponential, factorial and unrecognised hints give None.
+    """
+    if not hint:
+        return None
+    try:
+        degree, logs = _growth(_tokens(_hint_body(hint)))
+    except (ValueError, ZeroDivisionError):
+        return None
+    if logs < 0:
+        return None
+    if degree == 1.5:
+        return "n sqrt n"
+    names = {0: ("1", "log n"), 1: ("n", "n log n"), 2: ("n^2", "n^2 log n"), 3: ("n^3", None)}
+    pair = names.get(degree) if float(degree).is_integer() else None
+    return pair[1 if logs > 0 else 0] if pair else None
+
+
+def _fit_one(points: List[Tuple[int, float]], g: Callable[[float], float]) -> Tuple[float, float, float]:
+    # Least squares for t = a + c * g(n) with a, c >= 0; error is measured in log space so
+    # that small and large sizes weigh the same.
+    xs = [g(n) for n, _ in points]
+    ts = [t for _, t in points]
+    k = len(points)
+    mx, mt = sum(xs) / k, sum(ts) / k
+    var = sum((x - mx) ** 2 for x in xs)
+    c = sum((x - mx) * (t - mt) for x, t in zip(xs, ts)) / var if var > 0 else 0.0
+    a = mt - c * mx
+    if c < 0:
+        c, a = 0.0, mt
+    if a < 0:
+        a = 0.0
+        sxx = sum(x * x for x in xs)
+        c = sum(x * t for x, t in zip(xs, ts)) / sxx if sxx > 0 else 0.0
+    err = sum((math.log(max(a + c * x, 1e-9)) - math.log(max(t, 1e-9))) ** 2 for x, t in zip(xs, ts))
+    return a, c, err
+
+
+def fit(points: List[Tuple[int, float]]) -> Dict[str, object]:
+    """Fit (n, seconds) points against CLASSES.
+
+    Returns the best class, its coefficients, the log-log slope of the time above the
+    fixed overhead, and the per-class errors. A faster-growing class only wins when it
+    reduces the error by more than 10%, so noise does not promote O(n) to O(n log n).
+    When fewer than three points lie clearly above the overhead (the smallest run), the
+    timings say nothing about growth and the class is "inconclusive".
+    """
+    points = sorted(points)
+    fits = {name: _fit_one(points, g) for name, g in CLASSES}
+    best = CLASSES[0][0]
+    for name, _ in CLASSES[1:]:
+        if fits[name][2] < fits[best][2] * 0.9:
+            best = name
+    # log-log slope over points clearly above the smallest run (startup overhead)
+    base = points[0][1]
+    usable = [(math.log(n), math.log(t - base * 0.9)) for n, t in points if n > 0 and t > base * 1.5]
+    slope = None
+    if len(usable) >= 2:
+        mx = sum(x for x, _ in usable) / len(usable)
+        my = sum(y for _, y in usable) / len(usable)
+        var = sum((x - mx) ** 2 for x, _ in usable)
+        if var > 0:
+            slope = sum((x - mx) * (y - my) for x, y in usable) / var
+    a, c, _ = fits[best]
+    return {
+        "class": best if len(usable) >= 3 and slope is not None else INCONCLUSIVE,
+        "overhead": a,
+        "coefficient": c,
+        "slope": slope,
+        "above_overhead": len(usable),
+        "errors": {name: round(f[2], 4) for name, f in fits.items()},
+    }
+
+
+def project(model: Dict[str, object], n: int) -> float:
+    """Predicted seconds at size n for a conclusive model returned by fit()."""
+    return float(model["overhead"]) + float(model["coefficient"]) * _GROWTH[str(model["class"])](n)
+
+
+def slower_than(measured: str, expected: str) -> bool:
+    """True if the measured class grows polynomially faster than the expected one."""
+    return _DEGREE[measured] > _DEGREE[expected]
+
+
+def exceeds_budget(
+    points: List[Tuple[int, float]],
+    budget: float,
+    max_n: Optional[int] = None,
+    projected: Optional[float] = None,
+    timed_out: Iterable[int] = (),
+) -> bool:
+    """True if the timings show the solution over `budget` seconds at the largest size max_n.
+
+    A measured point above the budget counts whatever class fit() found, including an
+    inconclusive one: runtime does not shrink as n grows, so a slow run at or below max_n is
+    slow at max_n too. A projection above the budget and a size up to max_n that timed out
+    (every size when max_n is None) count as well.
+    """
+    if projected is not None and projected > budget:
+        return True
+    if any(t > budget for _, t in points):
+        return True
+    return any(max_n is None or n <= max_n for n in timed_out)
@@ -1,4 +1,4 @@
-from typing import Callable, Any
+from typing import Callable, Any, List, Tuple
 
 # This file wires steps into a sequential pipeline.
 # It is compatible with LangGraph style by exposing a simple run() that
@@ -10,28 +10,51 @@ from .steps import (
     step_requirement,
     step_algo,
     step_statement,
+    step_dedupe,
     step_codegen,
     step_casegen,
     step_build,
+    step_crosscheck,
+    step_judge,
+    step_minimize,
+    step_adversarial,
+    step_complexity,
     step_output_analysis,
     step_image,
     step_review,
     step_persist,
 )
 
+Step = Callable[[AuthoringState, AuthoringConfig, Toolbelt], AuthoringState]
+
+
+# Ordered (name, step) pairs. build_authoring_graph() runs them one state at a time;
+# agents.bulk advances many states through the same list in lockstep.
+AUTHORING_STEPS: List[Tuple[str, Step]] = [
+    ("requirement", step_requirement),
+    ("algo", step_algo),
+    ("statement", step_statement),
+    ("dedupe", step_dedupe),
+    ("codegen", step_codegen),
+    ("casegen", step_casegen),
+    ("build", step_build),
+    # before crosscheck/judge so that the adversarial cases are verified like the others
+    ("adversarial", step_adversarial),
+    ("crosscheck", step_crosscheck),
+    ("judge", step_judge),
+    ("minimize", step_minimize),
+    ("complexity", step_complexity),
+    ("output_analysis", step_output_analysis),
+    ("image", step_image),
+    ("review", step_review),
+    ("persist", step_persist),
+]
+
 
 def build_authoring_graph() -> Callable[[AuthoringState, AuthoringConfig, Toolbelt], AuthoringState]:
     def run(state: AuthoringState, cfg: AuthoringConfig, tb: Toolbelt) -> AuthoringState:
-        state = step_requirement(state, cfg, tb)
-        state = step_algo(state, cfg, tb)
-        state = step_statement(state, cfg, tb)
-        state = step_codegen(state, cfg, tb)
-        state = step_casegen(state, cfg, tb)
-        state = step_build(state, cfg, tb)
-        state = step_output_analysis(state, cfg, tb)
-        state = step_image(state, cfg, tb)
-        state = step_review(state, cfg, tb)
-        state = step_persist(state, cfg, tb)
+        for _, step in AUTHORING_STEPS:
+            state = step(state, cfg, tb)
         return state
 
     return run
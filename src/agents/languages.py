@@ -0,0 +1,152 @@
+"""
+Language backends for reference solutions.
+
+Each backend knows the source file name, how to compile (if at all), how to run
+the built artifact, and how much extra time it gets relative to the base time
+limit. Backends only produce shell command strings; execution is delegated to
+the injected Toolbelt tools.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import re
+import shlex
+
+
+BUILD_CACHE_ROOT = "problems/.build-cache"
+
+
+@dataclass(frozen=True)
+class LanguageBackend:
+    key: str
+    aliases: Tuple[str, ...]
+    source_name: str
+    # Templates may use {src}, {out_dir}, {bin} and {std}
+    compile_template: Optional[str]
+    run_template: str
+    artifact_name: Optional[str] = None
+    time_multiplier: float = 1.0
+    default_std: str = ""
+
+    @property
+    def extension(self) -> str:
+        return self.source_name[self.source_name.rfind("."):]
+
+    def cache_dir(self, source: str, std: str = "") -> str:
+        """Content-addressed build directory: same source + toolchain => same directory."""
+        h = hashlib.sha256()
+        h.update((self.compile_template or "").encode())
+        h.update((std or self.default_std).encode())
+        h.update(source.encode("utf-8"))
+        return f"{BUILD_CACHE_ROOT}/{self.key}-{h.hexdigest()[:16]}"
+
+    def artifact_path(self, out_dir: str) -> Optional[str]:
+        return f"{out_dir}/{self.artifact_name}" if self.artifact_name else None
+
+    def _fmt(self, template: str, src: str, out_dir: str, std: str) -> str:
+        art = self.artifact_path(out_dir)
+        return template.format(
+            src=shlex.quote(src),
+            out_dir=shlex.quote(out_dir),
+            bin=shlex.quote(_exec_path(art)) if art else "",
+            std=std or self.default_std,
+        )
+
+    def compile_commands(self, src: str, out_dir: str, std: str = "") -> List[str]:
+        if not self.compile_template:
+            return []
+        return [f"mkdir -p {shlex.quote(out_dir)}", self._fmt(self.compile_template, src, out_dir, std)]
+
+    def run_command(self, src: str, out_dir: str, std: str = "") -> str:
+        return self._fmt(self.run_template, src, out_dir, std)
+
+
+def _exec_path(path: str) -> str:
+    # Relative paths must be prefixed so the shell does not search $PATH.
+    if path.startswith(("/", "./", "../")):
+        return path
+    return f"./{path}"
+
+
+BACKENDS: Dict[str, LanguageBackend] = {
+    b.key: b
+    for b in (
+        LanguageBackend(
+            key="cpp",
+            aliases=("c++", "cpp", "cxx", "g++", "gnu++"),
+            source_name="solve.cpp",
+            compile_template="g++ -O2 -pipe -std={std} -o {bin} {src}",
+            run_template="{bin}",
+            artifact_name="solve",
+            default_std="c++17",
+        ),
+        LanguageBackend(
+            key="c",
+            aliases=("c", "gcc", "c11", "c99"),
+            source_name="solve.c",
+            compile_template="gcc -O2 -pipe -std={std} -o {bin} {src} -lm",
+            run_template="{bin}",
+            artifact_name="solve",
+            default_std="c11",
+        ),
+        LanguageBackend(
+            key="python",
+            aliases=("python", "python3", "py"),
+            source_name="solve.py",
+            compile_template="python3 -m py_compile {src}",
+            run_template="python3 {src}",
+            time_multiplier=3.0,
+        ),
+        LanguageBackend(
+            key="java",
+            aliases=("java",),
+            source_name="Main.java",
+            compile_template="javac -encoding UTF-8 -d {out_dir} {src}",
+            run_template="java -Xss256m -cp {out_dir} Main",
+            artifact_name="Main.class",
+            time_multiplier=2.0,
+        ),
+        LanguageBackend(
+            key="rust",
+            aliases=("rust", "rs", "rustc"),
+            source_name="solve.rs",
+            compile_template="rustc -O --edition 2021 -o {bin} {src}",
+            run_template="{bin}",
+            artifact_name="solve",
+        ),
+        LanguageBackend(
+            key="go",
+            aliases=("go", "golang"),
+            source_name="solve.go",
+            compile_template="go build -o {bin} {src}",
+            run_template="{bin}",
+            artifact_name="solve",
+            time_multiplier=1.5,
+        ),
+    )
+}
+
+_ALIASES: Dict[str, str] = {alias: b.key for b in BACKENDS.values() for alias in b.aliases}
+
+
+def resolve_backend(label: str | None) -> Optional[LanguageBackend]:
+    """Map free-form labels such as "C++/17", "cpp", "Python 3.12" or "Java 21" to a backend."""
+    if not label:
+        return None
+    norm = label.strip().lower()
+    if norm in BACKENDS:
+        return BACKENDS[norm]
+    # leading word without version suffix: "python 3.12" -> "python", "c++/17" -> "c++"
+    head = re.split(r"[\s/]|(?<=[a-z+])(?=\d)", norm, maxsplit=1)[0]
+    key = _ALIASES.get(head)
+    return BACKENDS[key] if key else None
+
+
+def std_for(label: str | None, backend: LanguageBackend, fallback: str = "") -> str:
+    """Extract a language standard from a label ("C++/20" -> "c++20") for C/C++ backends."""
+    if backend.key in ("cpp", "c") and label:
+        m = re.search(r"(\d{2})\b", label)
+        if m:
+            return f"{'c++' if backend.key == 'cpp' else 'c'}{m.group(1)}"
+    return fallback or backend.default_std
@@ -80,14 +80,30 @@ Rules:
 - Write clean, minimal, well-structured code with fast I/O when appropriate.
 - If the problem is interactive or requires a special judge:
   - Also produce Python 3.12 judge code.
-  - Judge reads input cases and validates output; for interactive, define clear protocol stubs.
+  - Special judge: define `check(input_text, expected_text, output_text)` returning a bool
+    or a (bool, message) tuple; `expected_text` is the reference solution's output.
+  - Interactive: define `interact(input_text, read_line, write_line)` returning a bool
+    or a (bool, message) tuple; `read_line()` returns the contestant's next line and
+    `write_line(s)` sends one line to the contestant.
+  - Do not read stdin or write stdout at module level; the judge is imported once and reused.
 - Avoid unnecessary logging or extra text in stdout.
+- Java solutions must declare `public class Main`.
 - Prefer standard library over heavy templates unless required.
 
 Output format:
 Return a single JSON object with the following keys:
-- "solve_language": string (usually "cpp")
+- "solve_language": string (usually "cpp"; otherwise e.g. "python", "java", "rust")
 - "solve_code": string (the full source code)
+- "extra_solutions": array of objects with keys "language" and "code", one independent
+  reference solution per language listed in the context field "reference_languages" (may be empty)
+- "naive_language": string, language of the naive solution (usually the same as solve_language)
+- "naive_code": string, a straightforward brute-force solution that is correct but has the
+  slower complexity a careless contestant would submit (e.g. O(N^2) when O(N log N) is intended)
+- "generator_code": string, a Python 3 program that prints ONE valid input to stdout; it reads
+  integer parameters from argv as `name=value` pairs and always accepts `seed=<int>`
+- "generator_params": array of objects {"name": string, "min": integer, "max": integer, "size": boolean}
+  describing the generator parameters, bounded by the statement constraints (size parameters first,
+  "size": true for parameters that scale the input size such as N or M)
 - "needs_judge": boolean
 - "judge_language": string (e.g., "python") if needs_judge is true
 - "judge_code": string, only if needs_judge is true
@@ -99,51 +115,32 @@ Rules:
 - Do NOT wrap code in markdown fences; embed code as plain strings.
 """
 
-CASEGEN_PROMPT = """You generate input/output test cases for the problem.
+CASEGEN_SHARD_PROMPT = """You generate ONE category of input test cases for the problem.
 
-Goals:
-- Produce example cases consistent with the statement examples.
-- Produce diverse grading (hidden) cases that cover edge conditions and typical pitfalls.
-- Respect all constraints from the statement.
+Input context:
+- "category": the category to generate (e.g., "boundary", "random", "worst_case", "special").
+- "focus": what this category must cover.
+- "count": how many cases to produce (approximately).
+- "constraints", "input_spec", "output_spec", "algorithms": problem information.
 
-Behavior:
-- For non-interactive & non-special-judge problems:
-  - Generate both inputs and outputs for examples and grading cases.
-- For interactive or special-judge problems:
-  - Generate only example outputs (grading outputs may be left empty or omitted).
+Goals:
+- Produce only cases of the requested category; other categories are generated separately.
+- Respect all constraints exactly; every input must be valid and complete.
+- Prefer fewer, meaningful cases over many similar ones.
 
 Output format:
 Return a single JSON object with:
-- "example_inputs": array of strings
-- "example_outputs": array of strings
-- "grading_inputs": array of strings (includes all hidden + examples)
-- "grading_outputs": array of strings (may be empty for interactive/special-judge problems)
+- "inputs": array of strings (full input files)
+- "outputs": array of strings, the expected output for each input, or an empty array when an
+  output is impractical to compute by hand (e.g., very large cases)
+- "pinned": optional array of 0-based indices into "inputs" for the few cases that target a specific
+  pitfall (e.g., an off-by-one or overflow trap) and must be kept even if other cases exercise the
+  same code paths
 
 Rules:
-- Ensure |example_inputs| == |example_outputs| when outputs are required.
-- Ensure |grading_inputs| >= |example_inputs|.
 - Respond with JSON only, no extra commentary.
 """
 
-BUILD_PROMPT = """You are a build coordinator. Prepare commands for the gcc build tool.
-
-Context:
-- You will receive the path to the C++ source file and the desired C++ standard.
-
-Task:
-- Produce shell commands that compile the solution into a binary.
-- Specify which artifacts (paths) should exist after compilation.
-
-Output format:
-Return a single JSON object with:
-- "compile_commands": array of strings (each string is a full shell command)
-- "artifacts": array of strings (paths to expected binaries or other outputs)
-
-Rules:
-- Use standard gcc CLI, e.g., `g++ -O2 -std=c++17 ...`.
-- Do NOT include explanations; respond with JSON only.
-"""
-
 OUTPUT_ANALYSIS_PROMPT = """You analyze the behavior of the compiled program on the provided inputs.
 
 Task:
@@ -157,6 +154,7 @@ Return a single JSON object with:
 
 Rules:
 - Do NOT re-derive the full solution; focus on plausibility and consistency.
+- Very large cases are given as {"truncated": true, "bytes", "sha256", "preview"}; reason from the preview and size only.
 - Respond with JSON only.
 """
 
@@ -199,6 +197,9 @@ Tasks:
 - Check for typos, ambiguity, and logical inconsistencies in the statement.
 - Ensure constraints are consistent with the examples and plausible for the algorithm.
 - Ensure interactive/special-judge labels are consistent across all artifacts.
+- If the context field "complexity" reports "exceeds_limit" or "slower_than_hint", report it as an issue
+  (measured growth vs. the intended complexity, projected seconds at max_n vs. budget_seconds) and suggest
+  lowering the constraints, raising the time limit, or fixing the solution.
 - Optionally point out missing corner cases or unclear parts.
 
 Output format:
@@ -208,6 +209,7 @@ Return a single JSON object with:
 
 Rules:
 - Be specific but concise.
+- Very large cases are given as {"truncated": true, "bytes", "sha256", "preview"}; reason from the preview and size only.
 - Respond with JSON only, no extra commentary.
 """
 
@@ -232,5 +234,6 @@ Return a single JSON object with:
 - "notes": string with any additional remarks (e.g., how to enumerate case IDs).
 
 Rules:
+- Very large cases are given as {"truncated": true, "bytes", "sha256", "preview"}; reason from the preview and size only.
 - Respond with JSON only.
 """
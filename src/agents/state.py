@@ -1,5 +1,7 @@
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
+import os
+import tempfile
 
 
 @dataclass
@@ -8,6 +10,8 @@ class ProblemIOBundle:
     grading_inputs: List[str] = field(default_factory=list)
     example_outputs: List[str] = field(default_factory=list)
     grading_outputs: List[str] = field(default_factory=list)
+    # Per grading case labels such as "example", "edge", "max", "random", "pinned", "adversarial"
+    grading_tags: List[List[str]] = field(default_factory=list)
 
 
 @dataclass
@@ -23,6 +27,41 @@ class AuthoringConfig:
     target_language: str = "en"
     # Preferred example programming language for solutions (e.g., "C++/17", "Python 3.12")
     example_prog_lang: str = "C++/17"
+    # Additional languages for reference solutions, cross-checked against the main one
+    reference_languages: List[str] = field(default_factory=list)
+    # Base time limit per case; each language backend applies its own multiplier
+    time_limit_ms: int = 2000
+    # Scratch directory root for solution runs and searches; {work_root}/{problem id} is
+    # removed by step_persist. Kept outside ./problems so it is never persisted.
+    work_root: str = os.path.join(tempfile.gettempdir(), "ps-generator")
+    # Parallel workers for running solutions on cases (None: os.cpu_count())
+    parallel_jobs: Optional[int] = None
+    # Output comparison for problems without a special judge: "tokens" or "float"
+    output_compare: str = "tokens"
+    float_abs_tol: float = 1e-6
+    float_rel_tol: float = 1e-6
+    # Near-duplicate handling after step_statement: "flag", "regenerate" or "stop"
+    duplicate_policy: str = "regenerate"
+    duplicate_threshold: float = 0.6
+    max_regenerations: int = 2
+    # Attempts per casegen shard before it is given up
+    casegen_retries: int = 2
+    # Adversarial search for inputs that make the naive solution slow
+    adversarial_rounds: int = 4
+    adversarial_population: int = 8
+    adversarial_cases: int = 2
+    # Coverage-guided minimization of the grading set (C/C++ main solutions only)
+    minimize_cases: bool = True
+    # Always keep this many of the largest grading inputs
+    keep_largest: int = 2
+    # Empirical complexity check: sizes max/4^k for k < complexity_points, runs per size
+    complexity_points: int = 5
+    complexity_repeats: int = 3
+    # Per-step limit (seconds) on each LLM call, e.g. {"codegen": 240}; steps not listed are unbounded
+    step_deadlines: Dict[str, float] = field(default_factory=dict)
+    # Re-send an LLM call that is slower than this percentile of the step's recent latencies (None: off)
+    hedge_percentile: Optional[float] = None
+    hedge_min_samples: int = 5
 
 
 @dataclass
@@ -33,15 +72,28 @@ class AuthoringState:
     requirement: Dict[str, Any] = field(default_factory=dict)
     algo: Dict[str, Any] = field(default_factory=dict)
     statement: Dict[str, Any] = field(default_factory=dict)
+    dedupe: Dict[str, Any] = field(default_factory=dict)
     code: Dict[str, Any] = field(default_factory=dict)
     io: ProblemIOBundle = field(default_factory=ProblemIOBundle)
+    casegen: Dict[str, Any] = field(default_factory=dict)
     build: Dict[str, Any] = field(default_factory=dict)
     output_analysis: Dict[str, Any] = field(default_factory=dict)
     images: Dict[str, Any] = field(default_factory=dict)
     review: Dict[str, Any] = field(default_factory=dict)
     persist_plan: Dict[str, Any] = field(default_factory=dict)
+    crosscheck: Dict[str, Any] = field(default_factory=dict)
+    judge: Dict[str, Any] = field(default_factory=dict)
+    minimize: Dict[str, Any] = field(default_factory=dict)
+    adversarial: Dict[str, Any] = field(default_factory=dict)
+    complexity: Dict[str, Any] = field(default_factory=dict)
 
     # Artifacts resolved during run
     solve_source_path: Optional[str] = None
     judge_source_path: Optional[str] = None
     binary_path: Optional[str] = None
+    # One entry per reference solution; the first is the main one.
+    # keys: language, source_path, build_dir, run_command, time_multiplier, build
+    solutions: List[Dict[str, Any]] = field(default_factory=list)
+    # Deliberately slow brute-force solution (same keys as a solutions entry), may be empty
+    naive: Dict[str, Any] = field(default_factory=dict)
+    generator_path: Optional[str] = None
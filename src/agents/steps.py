@@ -1,5 +1,11 @@
+import hashlib
 import json
-from typing import Dict, Any, Tuple
+import os
+import random
+import re
+import shlex
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Tuple
 from itertools import zip_longest
 
 from .prompts import (
@@ -7,8 +13,7 @@ from .prompts import (
     ALGO_ANALYSIS_PROMPT,
     PROBLEM_STATEMENT_PROMPT,
     CODEGEN_PROMPT,
-    CASEGEN_PROMPT,
-    BUILD_PROMPT,
+    CASEGEN_SHARD_PROMPT,
     OUTPUT_ANALYSIS_PROMPT,
     IMAGE_GEN_PROMPT,
     REVIEW_PROMPT,
@@ -16,10 +21,11 @@ from .prompts import (
 )
 from .state import AuthoringState, AuthoringConfig, ProblemIOBundle
 from .tools import Toolbelt
+from .languages import BACKENDS, resolve_backend, std_for
+from .complexity import INCONCLUSIVE, exceeds_budget, fit, hint_class, max_bound, project, slower_than
 
 
-def _call_llm_json(toolbelt: Toolbelt, prompt: str, system: str | None = None) -> Dict[str, Any]:
-    raw = toolbelt.llm_chat(prompt, system)
+def _parse_llm_json(raw: Any) -> Dict[str, Any]:
     if isinstance(raw, str):
         txt = raw
     else:
@@ -36,6 +42,79 @@ def _call_llm_json(toolbelt: Toolbelt, prompt: str, system: str | None = None) -
         raise
 
 
+def _call_llm_json(
+    toolbelt: Toolbelt,
+    prompt: str,
+    system: str | None = None,
+    cfg: AuthoringConfig | None = None,
+    step: str = "",
+) -> Dict[str, Any]:
+    # With a hedge_llm tool and a config, the call is bounded by cfg.step_deadlines[step] and
+    # hedged once it is slower than cfg.hedge_percentile of the step's recent latencies.
+    if toolbelt.hedge_llm is None or cfg is None:
+        return _parse_llm_json(toolbelt.llm_chat(prompt, system))
+    return toolbelt.hedge_llm(
+        toolbelt.llm_chat,
+        prompt,
+        system,
+        _parse_llm_json,
+        step,
+        deadline=cfg.step_deadlines.get(step),
+        hedge_percentile=cfg.hedge_percentile,
+        min_samples=cfg.hedge_min_samples,
+        fallback=toolbelt.llm_fallback,
+    )
+
+
+def _problem_id(state: AuthoringState, cfg: AuthoringConfig) -> Any:
+    # Resolve a stable problem id: prefer cfg.problem_id, then any id from previous steps,
+    # and finally fall back to the string "pending".
+    return (
+        cfg.problem_id
+        or state.requirement.get("id")
+        or state.algo.get("id")
+        or state.code.get("id")
+        or "pending"
+    )
+
+
+def _work_dir(state: AuthoringState, cfg: AuthoringConfig, *parts: str) -> str:
+    # Scratch space for solution runs, judging and searches. It lives outside problems/{id}
+    # so it is never persisted or walked, and step_persist removes it.
+    return "/".join([cfg.work_root.rstrip("/"), str(_problem_id(state, cfg)), *parts])
+
+
+# Cases longer than this are shown to the LLM as size, sha256 and a preview. Max-size inputs
+# (e.g. from step_adversarial) can be megabytes, far beyond any context window.
+_PROMPT_CASE_CHARS = 2048
+
+
+def _prompt_cases(texts: List[str]) -> List[Any]:
+    cases: List[Any] = []
+    for text in texts:
+        if len(text) <= _PROMPT_CASE_CHARS:
+            cases.append(text)
+            continue
+        data = text.encode("utf-8")
+        cases.append(
+            {
+                "truncated": True,
+                "bytes": len(data),
+                "sha256": hashlib.sha256(data).hexdigest(),
+                "preview": text[:_PROMPT_CASE_CHARS],
+            }
+        )
+    return cases
+
+
+def _parallel_map(cfg: AuthoringConfig, fn, items: List[Any]) -> List[Any]:
+    workers = cfg.parallel_jobs or os.cpu_count() or 1
+    if workers <= 1 or len(items) <= 1:
+        return [fn(x) for x in items]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fn, items))
+
+
 def step_requirement(state: AuthoringState, cfg: AuthoringConfig, tb: Toolbelt) -> AuthoringState:
     payload = f"{REQUIREMENT_ANALYSIS_PROMPT}\n\nUser seed:\n{state.user_seed}"
     system = (
@@ -43,7 +122,7 @@ def step_requirement(state: AuthoringState, cfg: AuthoringConfig, tb: Toolbelt)
         f"Write all natural-language text in the language indicated by code '{cfg.target_language}' "
         "(for example: 'en' for English, 'ko' for Korean)."
     )
-    state.requirement = _call_llm_json(tb, payload, system)
+    state.requirement = _call_llm_json(tb, payload, system, cfg, "requirement")
     return state
 
 
@@ -54,7 +133,7 @@ def step_algo(state: AuthoringState, cfg: AuthoringConfig, tb: Toolbelt) -> Auth
         "You are an algorithm taxonomist. "
         f"Write all natural-language text in the language indicated by code '{cfg.target_language}'."
     )
-    state.algo = _call_llm_json(tb, payload, system)
+    state.algo = _call_llm_json(tb, payload, system, cfg, "algo")
     return state
 
 
@@ -64,16 +143,61 @@ def step_statement(state: AuthoringState, cfg: AuthoringConfig, tb: Toolbelt) ->
         "algo": state.algo,
         "language": cfg.target_language,
     }
+    if state.dedupe.get("similar"):
+        # Regeneration after a near-duplicate hit: steer away from the existing problems.
+        ctx["avoid_similar_to"] = [h.get("abstract", "") for h in state.dedupe["similar"]]
     payload = f"{PROBLEM_STATEMENT_PROMPT}\n\nContext:\n{json.dumps(ctx, ensure_ascii=False)}"
     system = (
         "You write clear ICPC-style statements. "
         f"Write the entire problem statement and all natural-language text in the language "
         f"indicated by code '{cfg.target_language}' (e.g., 'en', 'ko')."
     )
-    state.statement = _call_llm_json(tb, payload, system)
+    state.statement = _call_llm_json(tb, payload, system, cfg, "statement")
+    return state
+
+
+def step_dedupe(state: AuthoringState, cfg: AuthoringConfig, tb: Toolbelt) -> AuthoringState:
+    """Check the fresh statement against the corpus of generated problems.
+
+    Runs before codegen so a near-duplicate is flagged or regenerated before any of the
+    expensive build, case and image steps.
+    """
+    find_similar = getattr(tb, "find_similar", None)
+    if not callable(find_similar):
+        return state
+    tags = state.algo.get("algorithms", [])
+    exclude = str(_problem_id(state, cfg))
+    attempts = 0
+    hits = find_similar(state.statement, tags, exclude, cfg.duplicate_threshold)
+    while hits and cfg.duplicate_policy == "regenerate" and attempts < cfg.max_regenerations:
+        attempts += 1
+        state.dedupe = {"similar": hits, "attempts": attempts}
+        state = step_statement(state, cfg, tb)
+        hits = find_similar(state.statement, tags, exclude, cfg.duplicate_threshold)
+    state.dedupe = {"similar": hits, "attempts": attempts, "duplicate": bool(hits)}
+    if hits and cfg.duplicate_policy == "stop":
+        raise RuntimeError(
+            f"problem {exclude} is a near-duplicate of problem {hits[0]['problem_id']} (score {hits[0]['score']})"
+        )
     return state
 
 
+def _write_solution(
+    tb: Toolbelt, cfg: AuthoringConfig, backend: Any, src_dir: str, label: str | None, code: str
+) -> Dict[str, Any]:
+    tb.ensure_dir(src_dir)
+    src_path = f"{src_dir}/{backend.source_name}"
+    tb.write_file(src_path, code)
+    std = std_for(label or cfg.example_prog_lang, backend, cfg.cpp_std if backend.key == "cpp" else "")
+    return {
+        "language": backend.key,
+        "source_path": src_path,
+        "std": std,
+        "build_dir": backend.cache_dir(code, std),
+        "time_multiplier": backend.time_multiplier,
+    }
+
+
 def step_codegen(state: AuthoringState, cfg: AuthoringConfig, tb: Toolbelt) -> AuthoringState:
     ctx = {
         "requirement": state.requirement,
@@ -81,6 +205,7 @@ def step_codegen(state: AuthoringState, cfg: AuthoringConfig, tb: Toolbelt) -> A
         "statement": state.statement,
         "cpp_std": cfg.cpp_std,
         "example_prog_lang": cfg.example_prog_lang,
+        "reference_languages": cfg.reference_languages,
     }
     payload = f"{CODEGEN_PROMPT}\n\nContext:\n{json.dumps(ctx, ensure_ascii=False)}"
     system = (
@@ -89,24 +214,42 @@ def step_codegen(state: AuthoringState, cfg: AuthoringConfig, tb: Toolbelt) -> A
         f"(field 'example_prog_lang', currently '{cfg.example_prog_lang}'), "
         "while still following any explicit rules in the prompt."
     )
-    state.code = _call_llm_json(tb, payload, system)
+    state.code = _call_llm_json(tb, payload, system, cfg, "codegen")
     # persist sources
-    solve_code = state.code.get("solve_code", "")
     needs_judge = bool(state.code.get("needs_judge", False))
-    # Resolve a stable problem id: prefer cfg.problem_id, then any id from previous steps,
-    # and finally fall back to the string "pending".
-    problem_id = (
-        cfg.problem_id
-        or state.requirement.get("id")
-        or state.algo.get("id")
-        or state.code.get("id")
-        or "pending"
-    )
-    base_dir = f"problems/{problem_id}"
-    solve_path = f"{base_dir}/solve.cpp"
+    base_dir = f"problems/{_problem_id(state, cfg)}"
     tb.ensure_dir(base_dir)
-    tb.write_file(solve_path, solve_code)
-    state.solve_source_path = solve_path
+
+    candidates = [(state.code.get("solve_language"), state.code.get("solve_code", ""))]
+    for extra in state.code.get("extra_solutions", []) or []:
+        if isinstance(extra, dict) and extra.get("code"):
+            candidates.append((extra.get("language"), extra["code"]))
+
+    state.solutions = []
+    seen: set[str] = set()
+    for i, (label, code) in enumerate(candidates):
+        # The main solution falls back to the configured language, then to C++.
+        backend = resolve_backend(label) or (
+            (resolve_backend(cfg.example_prog_lang) or BACKENDS["cpp"]) if i == 0 else None
+        )
+        if backend is None or backend.key in seen:
+            continue
+        seen.add(backend.key)
+        if i == 0:
+            src_dir = base_dir if backend.key != "java" else f"{base_dir}/solutions/java"
+        else:
+            src_dir = f"{base_dir}/solutions/{backend.key}"
+        state.solutions.append(_write_solution(tb, cfg, backend, src_dir, label, code))
+    state.solve_source_path = state.solutions[0]["source_path"]
+    naive_code = state.code.get("naive_code")
+    naive_backend = resolve_backend(state.code.get("naive_language")) or BACKENDS[state.solutions[0]["language"]]
+    state.naive = {}
+    if naive_code:
+        naive_dir = f"{base_dir}/solutions/naive"
+        state.naive = _write_solution(tb, cfg, naive_backend, naive_dir, state.code.get("naive_language"), naive_code)
+    if state.code.get("generator_code"):
+        state.generator_path = f"{base_dir}/gen.py"
+        tb.write_file(state.generator_path, state.code["generator_code"])
     if needs_judge:
         judge_code = state.code.get("judge_code", "")
         judge_path = f"{base_dir}/judge.py"
@@ -115,52 +258,615 @@ def step_codegen(state: AuthoringState, cfg: AuthoringConfig, tb: Toolbelt) -> A
     return state
 
 
+# (shard name, case tag, focus, requested count)
+_CASE_SHARDS: List[Tuple[str, str, str, int]] = [
+    (
+        "boundary",
+        "edge",
+        "minimum and maximum values of every parameter, empty/degenerate structures, off-by-one limits",
+        6,
+    ),
+    ("random", "random", "uniformly random valid inputs of small and medium size", 5),
+    ("worst_case", "max", "inputs at the largest allowed sizes that stress the intended complexity", 3),
+]
+
+# word in the problem type or input spec -> structures worth a dedicated shard. The algorithm
+# list is not consulted: it names techniques ("Segment Tree", "Fenwick Tree") rather than
+# the shape of the input.
+_SPECIAL_STRUCTURES: Dict[str, str] = {
+    "tree": "path-shaped trees, stars, caterpillars, complete binary trees",
+    "graph": "disconnected graphs, complete graphs, long chains, self-loop and multi-edge cases if allowed",
+    "string": "single repeated character, periodic strings, palindromes, all distinct characters",
+    "geometry": "collinear points, duplicate points, extreme coordinates",
+    "math": "primes, powers of two, values near overflow limits",
+    "grid": "single row/column grids, fully blocked and fully open grids",
+    "interval": "nested, identical and touching intervals",
+}
+
+
+def _case_shards(state: AuthoringState) -> List[Tuple[str, str, str, int]]:
+    shards = list(_CASE_SHARDS)
+    text = " ".join([str(state.requirement.get("type", "")), str(state.statement.get("input_spec", ""))]).lower()
+    focus = [desc for key, desc in _SPECIAL_STRUCTURES.items() if re.search(rf"\b{key}s?\b", text)]
+    if focus:
+        shards.insert(1, ("special", "special", "; ".join(dict.fromkeys(focus)), 4))
+    return shards
+
+
+def _normalize_case(text: str) -> str:
+    return "\n".join(" ".join(line.split()) for line in text.strip().splitlines())
+
+
 def step_casegen(state: AuthoringState, cfg: AuthoringConfig, tb: Toolbelt) -> AuthoringState:
-    ctx = {
+    """Generate cases in category shards requested concurrently.
+
+    Examples are taken from the statement directly. Each other shard is its own LLM request,
+    retried on its own; a shard that keeps failing is dropped and recorded instead of failing
+    the whole step. Shards are merged in a fixed order with duplicate inputs removed, so case
+    numbering is stable across runs.
+    """
+    examples = [ex for ex in state.statement.get("examples", []) if isinstance(ex, dict) and ex.get("input")]
+    shards = _case_shards(state)
+    if not examples:
+        shards.insert(0, ("examples", "example", "small cases that illustrate the statement", 2))
+    base_ctx = {
         "constraints": state.statement.get("constraints", ""),
-        "examples": state.statement.get("examples", []),
-        "language": cfg.target_language,
+        "input_spec": state.statement.get("input_spec", ""),
+        "output_spec": state.statement.get("output_spec", ""),
+        "algorithms": state.algo.get("algorithms", []),
+        "interactive_or_special_judge": bool(
+            state.requirement.get("is_interactive") or state.requirement.get("has_special_judge")
+        ),
     }
-    payload = f"{CASEGEN_PROMPT}\n\nContext:\n{json.dumps(ctx, ensure_ascii=False)}"
     system = (
         "You create diverse and valid test cases. "
         "Any explanatory natural-language text must use the same language as the problem statement, "
         f"indicated by code '{cfg.target_language}'."
     )
-    result = _call_llm_json(tb, payload, system)
+
+    def run_shard(shard: Tuple[str, str, str, int]) -> Dict[str, Any]:
+        name, _, focus, count = shard
+        ctx = {**base_ctx, "category": name, "focus": focus, "count": count}
+        payload = f"{CASEGEN_SHARD_PROMPT}\n\nContext:\n{json.dumps(ctx, ensure_ascii=False)}"
+        error = ""
+        for attempt in range(1, cfg.casegen_retries + 2):
+            # Resending the same prompt tends to repeat the same mistake; say what went wrong.
+            prompt = payload if not error else (
+                f"{payload}\n\nYour previous answer for this shard was rejected: {error[:500]}\n"
+                "Fix that and answer again with the JSON object described above."
+            )
+            try:
+                result = _call_llm_json(tb, prompt, system, cfg, "casegen")
+                inputs = [x for x in result.get("inputs", []) if isinstance(x, str) and x.strip()]
+                if not inputs:
+                    raise ValueError("shard returned no inputs")
+                pinned = {
+                    k for k in result.get("pinned", []) or [] if isinstance(k, int) and 0 <= k < len(inputs)
+                }
+                return {
+                    "inputs": inputs,
+                    "outputs": result.get("outputs", []) or [],
+                    "pinned": pinned,
+                    "attempts": attempt,
+                }
+            except Exception as e:
+                error = str(e)
+        return {"inputs": [], "outputs": [], "pinned": set(), "attempts": cfg.casegen_retries + 1, "error": error}
+
+    # submit + collect (not pool.map): every shard must run even if another one raises,
+    # so that bulk mode records all shard requests in the same batch round.
+    with ThreadPoolExecutor(max_workers=len(shards)) as pool:
+        futures = [pool.submit(run_shard, shard) for shard in shards]
+    results = [f.result() for f in futures]
+
+    io = ProblemIOBundle()
+    seen: set[str] = set()
+
+    def add(inp: str, out: str, tags: List[str]) -> bool:
+        key = _normalize_case(inp)
+        if key in seen:
+            return False
+        seen.add(key)
+        io.grading_inputs.append(inp)
+        io.grading_outputs.append(out)
+        io.grading_tags.append(tags)
+        return True
+
+    for ex in examples:
+        if add(ex["input"], ex.get("output", ""), ["example"]):
+            io.example_inputs.append(ex["input"])
+            io.example_outputs.append(ex.get("output", ""))
+    report: Dict[str, Any] = {}
+    for (name, tag, _, _), res in zip(shards, results):
+        outputs = res["outputs"] if len(res["outputs"]) == len(res["inputs"]) else [""] * len(res["inputs"])
+        added = 0
+        for k, (inp, out) in enumerate(zip(res["inputs"], outputs)):
+            # the shard tag describes the category; "pinned" marks a case the LLM singled out
+            if add(inp, out, [tag, "pinned"] if k in res["pinned"] else [tag]):
+                added += 1
+                if tag == "example":
+                    io.example_inputs.append(inp)
+                    io.example_outputs.append(out)
+        report[name] = {"cases": added, "attempts": res["attempts"]}
+        if "error" in res:
+            report[name]["error"] = res["error"]
+    if not io.grading_inputs:
+        raise RuntimeError(f"casegen produced no cases: {report}")
+    state.io = io
+    state.casegen = {"shards": report, "failed": [n for n, r in report.items() if "error" in r]}
+    return state
+
+
+def step_build(state: AuthoringState, cfg: AuthoringConfig, tb: Toolbelt) -> AuthoringState:
+    # Compile every reference solution with its language backend. Build directories are
+    # content-addressed, so an unchanged source whose artifact already exists is not rebuilt.
+    all_commands: List[str] = []
+    artifacts: List[str] = []
+    for sol in state.solutions + ([state.naive] if state.naive else []):
+        backend = BACKENDS[sol["language"]]
+        out_dir = sol["build_dir"]
+        artifact = backend.artifact_path(out_dir)
+        cached = artifact is not None and artifact in tb.list_dir(out_dir)
+        commands = [] if cached else backend.compile_commands(sol["source_path"], out_dir, sol["std"])
+        result = tb.run_shell(commands) if commands else {"returncode": 0, "stdout": "", "stderr": ""}
+        sol["build"] = {
+            "cached": cached,
+            "commands": commands,
+            "returncode": result.get("returncode", 0),
+            "stderr": result.get("stderr", ""),
+        }
+        sol["run_command"] = backend.run_command(sol["source_path"], out_dir, sol["std"])
+        all_commands.extend(commands)
+        if artifact:
+            artifacts.append(artifact)
+    state.build = {"compile_commands": all_commands, "artifacts": artifacts}
+    if state.solutions:
+        main = state.solutions[0]
+        state.binary_path = BACKENDS[main["language"]].artifact_path(main["build_dir"]) or main["source_path"]
+    return state
+
+
+def _compare_outputs(tb: Toolbelt, cfg: AuthoringConfig, expected_path: str, actual_path: str) -> Dict[str, Any]:
+    compare_output = getattr(tb, "compare_output", None)
+    if callable(compare_output):
+        return compare_output(expected_path, actual_path, cfg.output_compare, cfg.float_abs_tol, cfg.float_rel_tol)
+    same = tb.read_file(expected_path).split() == tb.read_file(actual_path).split()
+    return {"ok": same, "message": "ok" if same else "outputs differ"}
+
+
+def _built_solutions(state: AuthoringState) -> List[Dict[str, Any]]:
+    return [s for s in state.solutions if s.get("run_command") and s.get("build", {}).get("returncode", 1) == 0]
+
+
+def step_crosscheck(state: AuthoringState, cfg: AuthoringConfig, tb: Toolbelt) -> AuthoringState:
+    """Run all built reference solutions on the grading inputs and compare them with the main one.
+
+    The main solution's outputs replace the LLM-drafted grading outputs. For special-judge
+    problems they become the checker's expected answers and the comparison itself is left
+    to step_judge; interactive problems are run entirely by step_judge.
+    """
+    run_program = getattr(tb, "run_program", None)
+    built = _built_solutions(state)
+    if state.requirement.get("is_interactive"):
+        state.crosscheck = {"skipped": True, "reason": "interactive problem: handled by the judge harness"}
+        return state
+    if not callable(run_program) or not built or built[0] is not state.solutions[0]:
+        state.crosscheck = {"skipped": True, "reason": "no runner or main solution failed to build"}
+        return state
+    base = _work_dir(state, cfg, "crosscheck")
+    tb.ensure_dir(base)
+    inputs: List[str] = []
+    for i, inp in enumerate(state.io.grading_inputs, start=1):
+        path = f"{base}/case_{i}.in"
+        tb.write_file(path, inp)
+        inputs.append(path)
+
+    def run(job: Tuple[Dict[str, Any], int]) -> Dict[str, Any]:
+        sol, i = job
+        out_path = f"{base}/{sol['language']}/case_{i}.out"
+        res = run_program(
+            sol["run_command"],
+            input_path=inputs[i - 1],
+            output_path=out_path,
+            timeout=cfg.time_limit_ms * sol["time_multiplier"] / 1000,
+        )
+        return {"language": sol["language"], "case": i, "output_path": out_path, **res}
+
+    jobs = [(sol, i) for sol in built for i in range(1, len(inputs) + 1)]
+    results = _parallel_map(cfg, run, jobs)
+    by_lang: Dict[str, List[Dict[str, Any]]] = {}
+    for r in results:
+        by_lang.setdefault(r["language"], []).append(r)
+
+    main_lang = built[0]["language"]
+    main_runs = by_lang.get(main_lang, [])
+    failures = [
+        {"language": r["language"], "case": r["case"], "verdict": "TLE" if r["timed_out"] else "RE"}
+        for r in results
+        if r["timed_out"] or r["returncode"] != 0
+    ]
+    main_outputs = [tb.read_file(r["output_path"]) if r["returncode"] == 0 else None for r in main_runs]
+    mismatches: List[Dict[str, Any]] = []
+    if not state.requirement.get("has_special_judge"):
+        for sol in built[1:]:
+            for r in by_lang.get(sol["language"], []):
+                main_run = main_runs[r["case"] - 1]
+                if main_outputs[r["case"] - 1] is None or r["returncode"] != 0:
+                    continue
+                diff = _compare_outputs(tb, cfg, main_run["output_path"], r["output_path"])
+                if not diff["ok"]:
+                    mismatches.append({"language": sol["language"], "case": r["case"], "message": diff["message"]})
+    if main_outputs and all(o is not None for o in main_outputs):
+        state.io.grading_outputs = list(main_outputs)
+    state.crosscheck = {
+        "reference": main_lang,
+        "languages": [s["language"] for s in built],
+        "cases": len(inputs),
+        "work_dir": base,
+        "failures": failures,
+        "mismatches": mismatches,
+        "max_elapsed": {
+            lang: max((r["elapsed"] for r in runs), default=0.0) for lang, runs in by_lang.items()
+        },
+    }
+    return state
+
+
+def step_judge(state: AuthoringState, cfg: AuthoringConfig, tb: Toolbelt) -> AuthoringState:
+    """Run judge.py against every built solution.
+
+    The labels from step_requirement pick the mode: interactive problems run the solution and
+    the judge over two-way pipes, special-judge problems check the outputs produced by
+    step_crosscheck against the main solution's output.
+    """
+    if state.requirement.get("is_interactive"):
+        mode = "interactive"
+    elif state.requirement.get("has_special_judge"):
+        mode = "checker"
+    else:
+        return state
+    run_judge = getattr(tb, "run_judge", None)
+    built = _built_solutions(state)
+    if not callable(run_judge) or not state.judge_source_path or not built:
+        state.judge = {"mode": mode, "skipped": True, "reason": "no judge runner, judge source or built solution"}
+        return state
+
+    jobs: List[Tuple[str, int]] = []
+    cases: List[Dict[str, Any]] = []
+    if mode == "interactive":
+        base = _work_dir(state, cfg, "judge")
+        tb.ensure_dir(base)
+        for i, inp in enumerate(state.io.grading_inputs, start=1):
+            path = f"{base}/case_{i}.in"
+            tb.write_file(path, inp)
+            for sol in built:
+                jobs.append((sol["language"], i))
+                cases.append(
+                    {
+                        "input_path": path,
+                        "command": sol["run_command"],
+                        "timeout": cfg.time_limit_ms * sol["time_multiplier"] / 1000,
+                    }
+                )
+    else:
+        work = state.crosscheck.get("work_dir")
+        if not work:
+            state.judge = {"mode": mode, "skipped": True, "reason": "no outputs from step_crosscheck"}
+            return state
+        main_lang = built[0]["language"]
+        for i in range(1, state.crosscheck.get("cases", 0) + 1):
+            for sol in built:
+                jobs.append((sol["language"], i))
+                cases.append(
+                    {
+                        "input_path": f"{work}/case_{i}.in",
+                        "expected_path": f"{work}/{main_lang}/case_{i}.out",
+                        "output_path": f"{work}/{sol['language']}/case_{i}.out",
+                    }
+                )
+    results = run_judge(state.judge_source_path, mode, cases, cfg.parallel_jobs)
+    verdicts = [
+        {"language": lang, "case": i, "verdict": r.get("verdict"), "message": r.get("message", "")}
+        for (lang, i), r in zip(jobs, results)
+    ]
+    state.judge = {
+        "mode": mode,
+        "cases": len(state.io.grading_inputs),
+        "rejected": [v for v in verdicts if v["verdict"] != "AC"],
+        "accepted": sum(1 for v in verdicts if v["verdict"] == "AC"),
+    }
+    return state
+
+
+# Protected individually: examples, cases the LLM pinned, max-size adversarial inputs.
+# Whole shards (edge/max/special/random) are not, or minimization could only drop random cases.
+_KEEP_TAGS = {"example", "pinned", "adversarial"}
+
+
+def step_minimize(state: AuthoringState, cfg: AuthoringConfig, tb: Toolbelt) -> AuthoringState:
+    """Drop grading cases that add no branch coverage of the main solution.
+
+    Example cases, the largest inputs, cases casegen's LLM pinned individually, adversarial
+    max-size cases and cases whose coverage could not be measured are always kept; the rest
+    are chosen greedily until the kept set covers every branch reached by the full set.
+    """
+    collect_coverage = getattr(tb, "collect_coverage", None)
+    io = state.io
+    n = len(io.grading_inputs)
+    main = state.solutions[0] if state.solutions else None
+    if (
+        not cfg.minimize_cases
+        or not callable(collect_coverage)
+        or main is None
+        or main["language"] != "cpp"
+        or state.requirement.get("is_interactive")
+        or n <= 1
+    ):
+        return state
+    base = _work_dir(state, cfg, "minimize")
+    tb.ensure_dir(base)
+    paths = []
+    for i, inp in enumerate(io.grading_inputs, start=1):
+        path = f"{base}/case_{i}.in"
+        tb.write_file(path, inp)
+        paths.append(path)
+    # Instrumented builds run at -O0, so allow a generous multiple of the time limit.
+    timeout = cfg.time_limit_ms * 5 / 1000
+    coverage = collect_coverage(main["source_path"], paths, main["std"], cfg.parallel_jobs, timeout)
+
+    tags = [set(io.grading_tags[i]) if i < len(io.grading_tags) else set() for i in range(n)]
+    examples = set(io.example_inputs)
+    keep = {i for i in range(n) if io.grading_inputs[i] in examples or tags[i] & _KEEP_TAGS or coverage[i] is None}
+    keep |= set(sorted(range(n), key=lambda i: len(io.grading_inputs[i]), reverse=True)[: cfg.keep_largest])
+
+    sets = [set(c or ()) for c in coverage]
+    universe = set().union(*sets)
+    covered = set().union(*(sets[i] for i in keep))
+    rest = [i for i in range(n) if i not in keep]
+    while covered != universe:
+        # most new branches first, smaller input on ties
+        best = max(rest, key=lambda i: (len(sets[i] - covered), -len(io.grading_inputs[i])))
+        keep.add(best)
+        rest.remove(best)
+        covered |= sets[best]
+
+    kept = sorted(keep)
+    pick = lambda xs: [xs[i] for i in kept if i < len(xs)]
+    state.minimize = {
+        "before": n,
+        "after": len(kept),
+        "branches": len(universe),
+        "dropped": [i + 1 for i in range(n) if i not in keep],
+    }
     state.io = ProblemIOBundle(
-        example_inputs=result.get("example_inputs", []),
-        grading_inputs=result.get("grading_inputs", []),
-        example_outputs=result.get("example_outputs", []),
-        grading_outputs=result.get("grading_outputs", []),
+        example_inputs=io.example_inputs,
+        example_outputs=io.example_outputs,
+        grading_inputs=pick(io.grading_inputs),
+        grading_outputs=pick(io.grading_outputs),
+        grading_tags=pick(io.grading_tags),
     )
     return state
 
 
-def step_build(state: AuthoringState, cfg: AuthoringConfig, tb: Toolbelt) -> AuthoringState:
-    ctx = {
-        "solve_path": state.solve_source_path,
-        "cpp_std": cfg.cpp_std,
+def _mutate(rng: random.Random, params: Dict[str, int], spec: List[Dict[str, Any]]) -> Dict[str, int]:
+    child = dict(params)
+    for p in spec:
+        lo, hi = int(p["min"]), int(p["max"])
+        if rng.random() < 0.5:
+            continue
+        r = rng.random()
+        if r < 0.2:
+            child[p["name"]] = hi
+        elif r < 0.3:
+            child[p["name"]] = lo
+        else:
+            # multiplicative step keeps the search scale-free over wide ranges like 1..2e5
+            step = round(child[p["name"]] * rng.uniform(0.5, 2.0)) + rng.randint(-1, 1)
+            child[p["name"]] = min(hi, max(lo, step))
+    child["seed"] = rng.randrange(1 << 30)
+    return child
+
+
+def step_adversarial(state: AuthoringState, cfg: AuthoringConfig, tb: Toolbelt) -> AuthoringState:
+    """Search generator parameters for inputs that maximize the naive solution's runtime.
+
+    Each round mutates the slowest parameter sets found so far and evaluates the whole
+    population in parallel. The worst inputs on which the main solution finishes within the
+    limit are appended as grading cases, and the measured time gap between the main and naive
+    solutions is reported. Runs before step_crosscheck, so the reference solutions and the
+    judge check these cases like any other.
+    """
+    run_program = getattr(tb, "run_program", None)
+    spec = [p for p in state.code.get("generator_params", []) or [] if {"name", "min", "max"} <= set(p)]
+    built = _built_solutions(state)
+    naive_ok = state.naive.get("build", {}).get("returncode", 1) == 0 and state.naive.get("run_command")
+    if (
+        not callable(run_program)
+        or not state.generator_path
+        or not spec
+        or not naive_ok
+        or not built
+        or built[0] is not state.solutions[0]
+        or state.requirement.get("is_interactive")
+    ):
+        return state
+    main, naive = built[0], state.naive
+    pid = _problem_id(state, cfg)
+    base = _work_dir(state, cfg, "adversarial")
+    tb.ensure_dir(base)
+    limit = cfg.time_limit_ms / 1000
+    # Past ~3x the limit the naive solution is clearly too slow; no need to wait longer.
+    naive_timeout = limit * naive["time_multiplier"] * 3
+    rng = random.Random(f"adversarial-{pid}")
+
+    def evaluate(job: Tuple[int, int, Dict[str, int]]) -> Dict[str, Any]:
+        # Names depend only on the generation and position, so reruns (and cassettes) see the same paths
+        gen_no, idx, params = job
+        path = f"{base}/g{gen_no}_{idx}.in"
+        args = " ".join(shlex.quote(f"{name}={value}") for name, value in params.items())
+        gen = run_program(f"python3 {shlex.quote(state.generator_path)} {args}", output_path=path, timeout=60)
+        if gen["returncode"] != 0 or gen["timed_out"]:
+            return {"params": params, "path": path, "naive": -1.0}
+        res = run_program(naive["run_command"], input_path=path, output_path=f"{path}.naive", timeout=naive_timeout)
+        elapsed = naive_timeout if res["timed_out"] else res["elapsed"]
+        return {"params": params, "path": path, "naive": elapsed if res["returncode"] == 0 or res["timed_out"] else -1.0}
+
+    start = {p["name"]: int(p["max"]) for p in spec}
+    population = [dict(start, seed=rng.randrange(1 << 30)) for _ in range(2)]
+    population += [
+        {**{p["name"]: rng.randint(int(p["min"]), int(p["max"])) for p in spec}, "seed": rng.randrange(1 << 30)}
+        for _ in range(max(0, cfg.adversarial_population - len(population)))
+    ]
+    scored: List[Dict[str, Any]] = []
+    for gen_no in range(cfg.adversarial_rounds):
+        scored += _parallel_map(cfg, evaluate, [(gen_no, i, params) for i, params in enumerate(population)])
+        scored.sort(key=lambda c: c["naive"], reverse=True)
+        elite = [c["params"] for c in scored[: max(1, cfg.adversarial_population // 4)]]
+        population = [_mutate(rng, rng.choice(elite), spec) for _ in range(cfg.adversarial_population)]
+
+    # Confirm the slowest candidates against the main solution.
+    finalists = [c for c in scored if c["naive"] >= 0][: cfg.adversarial_cases * 2]
+
+    def confirm(c: Dict[str, Any]) -> Dict[str, Any]:
+        res = run_program(
+            main["run_command"], input_path=c["path"], output_path=f"{c['path']}.out",
+            timeout=limit * main["time_multiplier"],
+        )
+        return {**c, "main": res["elapsed"], "main_ok": res["returncode"] == 0 and not res["timed_out"]}
+
+    confirmed = [c for c in _parallel_map(cfg, confirm, finalists) if c["main_ok"]][: cfg.adversarial_cases]
+    if not confirmed:
+        state.adversarial = {"found": 0, "evaluated": len(scored)}
+        return state
+    for c in confirmed:
+        state.io.grading_inputs.append(tb.read_file(c["path"]))
+        state.io.grading_outputs.append(tb.read_file(f"{c['path']}.out"))
+        state.io.grading_tags.append(["max", "adversarial"])
+    worst = confirmed[0]
+    state.adversarial = {
+        "found": len(confirmed),
+        "evaluated": len(scored),
+        "params": worst["params"],
+        "naive_seconds": round(worst["naive"], 4),
+        "main_seconds": round(worst["main"], 4),
+        "gap": round(worst["naive"] / max(worst["main"], 1e-3), 1),
+        "naive_exceeds_limit": worst["naive"] > limit * naive["time_multiplier"],
+    }
+    return state
+
+
+def step_complexity(state: AuthoringState, cfg: AuthoringConfig, tb: Toolbelt) -> AuthoringState:
+    """Measure how the main solution's runtime grows and project it to the largest input.
+
+    Inputs are generated at geometrically increasing values of the size parameter (size
+    parameters scale together, the others stay at their maximum), and the main solution is
+    timed complexity_repeats times per size, one run at a time. The fastest run per size is fitted
+    against the classes in agents.complexity, compared with algo.complexity_hint and projected
+    to the largest size allowed by the statement constraints. A projection above the time
+    limit, a measured run above it or a growth class above the hint is flagged for output
+    analysis and review. Timings that stay near the start-up overhead are reported as
+    "inconclusive" and are neither projected nor compared with the hint (slow runs and sizes
+    that timed out still count against the limit).
+    """
+    run_program = getattr(tb, "run_program", None)
+    spec = [p for p in state.code.get("generator_params", []) or [] if {"name", "min", "max"} <= set(p)]
+    built = _built_solutions(state)
+    if (
+        not callable(run_program)
+        or not state.generator_path
+        or not spec
+        or not built
+        or built[0] is not state.solutions[0]
+        or state.requirement.get("is_interactive")
+    ):
+        return state
+    main = built[0]
+    sized = [p for p in spec if p.get("size")] or [spec[0]]
+    primary = sized[0]
+    lo, hi = max(1, int(primary["min"])), int(primary["max"])
+    sizes = sorted({max(lo, hi // 4**k) for k in range(cfg.complexity_points)})
+    if len(sizes) < 3:
+        state.complexity = {"skipped": f"range of '{primary['name']}' is too small to fit"}
+        return state
+    pid = _problem_id(state, cfg)
+    base = _work_dir(state, cfg, "complexity")
+    tb.ensure_dir(base)
+    budget = cfg.time_limit_ms / 1000 * main["time_multiplier"]
+
+    def generate(n: int) -> str | None:
+        params = {p["name"]: int(p["max"]) for p in spec}
+        for p in sized:
+            params[p["name"]] = max(int(p["min"]), min(int(p["max"]), round(int(p["max"]) * n / hi)))
+        params[primary["name"]] = n
+        params["seed"] = n
+        path = f"{base}/n_{n}.in"
+        args = " ".join(shlex.quote(f"{name}={value}") for name, value in params.items())
+        gen = run_program(f"python3 {shlex.quote(state.generator_path)} {args}", output_path=path, timeout=60)
+        return path if gen["returncode"] == 0 and not gen["timed_out"] else None
+
+    paths = dict(zip(sizes, _parallel_map(cfg, generate, sizes)))
+    jobs = [(n, r) for n in sizes if paths[n] for r in range(cfg.complexity_repeats)]
+
+    def measure(job: Tuple[int, int]) -> Tuple[int, float | None, bool]:
+        n, r = job
+        res = run_program(
+            main["run_command"], input_path=paths[n], output_path=f"{paths[n]}.out{r}", timeout=budget * 2
+        )
+        ok = res["returncode"] == 0 and not res["timed_out"]
+        return n, res["elapsed"] if ok else None, res["timed_out"]
+
+    best: Dict[int, float] = {}
+    timed_out = set()
+    # One run at a time: concurrent runs compete for cores and memory bandwidth and skew the timings.
+    for n, elapsed, slow in [measure(job) for job in jobs]:
+        if slow:
+            timed_out.add(n)
+        elif elapsed is not None:
+            best[n] = min(elapsed, best.get(n, elapsed))
+    # A size where any run hit the timeout is not a usable point; it already proves the limit is exceeded.
+    points = sorted((n, t) for n, t in best.items() if n not in timed_out)
+    if len(points) < 3:
+        state.complexity = {
+            "skipped": "fewer than three sizes ran successfully",
+            "timed_out_sizes": sorted(timed_out),
+            "exceeds_limit": exceeds_budget(points, budget, timed_out=timed_out),
+        }
+        return state
+    model = fit(points)
+    max_n = max_bound(state.statement.get("constraints", ""), primary["name"]) or hi
+    # Timings that barely rise above the start-up overhead cannot be classified or projected
+    conclusive = model["class"] != INCONCLUSIVE
+    projected = project(model, max_n) if conclusive else None
+    hint = state.algo.get("complexity_hint", "")
+    expected = hint_class(hint)
+    state.complexity = {
+        "size_param": primary["name"],
+        "points": [[n, round(t, 5)] for n, t in points],
+        "fitted": model["class"],
+        "slope": round(model["slope"], 2) if model["slope"] is not None else None,
+        "hint": hint,
+        "hint_class": expected,
+        "slower_than_hint": conclusive and expected is not None and slower_than(str(model["class"]), expected),
+        "max_n": max_n,
+        "projected_seconds": round(projected, 4) if projected is not None else None,
+        "budget_seconds": budget,
+        "timed_out_sizes": sorted(timed_out),
+        "exceeds_limit": exceeds_budget(points, budget, max_n, projected, timed_out),
     }
-    payload = f"{BUILD_PROMPT}\n\nContext:\n{json.dumps(ctx, ensure_ascii=False)}"
-    state.build = _call_llm_json(tb, payload, "Return only commands and artifacts JSON.")
-    # Run compile with provided tool (delegated to /src/tools)
-    commands = state.build.get("compile_commands", [])
-    if commands:
-        tb.run_shell(commands)
-    artifacts = state.build.get("artifacts", [])
-    if artifacts:
-        state.binary_path = artifacts[0]
     return state
 
 
 def step_output_analysis(state: AuthoringState, cfg: AuthoringConfig, tb: Toolbelt) -> AuthoringState:
     ctx = {
-        "inputs": state.io.grading_inputs,
+        "inputs": _prompt_cases(state.io.grading_inputs),
         "binary": state.binary_path,
+        "crosscheck": state.crosscheck,
+        "judge": state.judge,
+        "adversarial": state.adversarial,
+        "complexity": state.complexity,
     }
     payload = f"{OUTPUT_ANALYSIS_PROMPT}\n\nContext:\n{json.dumps(ctx, ensure_ascii=False)}"
-    state.output_analysis = _call_llm_json(tb, payload, "You are a strict judge.")
+    state.output_analysis = _call_llm_json(tb, payload, "You are a strict judge.", cfg, "output_analysis")
     return state
 
 
@@ -170,18 +876,18 @@ def step_image(state: AuthoringState, cfg: AuthoringConfig, tb: Toolbelt) -> Aut
         "statement": state.statement,
     }
     payload = f"{IMAGE_GEN_PROMPT}\n\nContext:\n{json.dumps(ctx, ensure_ascii=False)}"
-    prompts = _call_llm_json(tb, payload, "Return JSON only.").get("prompts", [])
+    prompts = _call_llm_json(tb, payload, "Return JSON only.", cfg, "image").get("prompts", [])
     images: list[Tuple[str, int]] = []
     # Use the same stable problem id resolution as in other steps
-    problem_id = (
-        cfg.problem_id
-        or state.requirement.get("id")
-        or state.algo.get("id")
-        or state.code.get("id")
-        or "pending"
-    )
+    problem_id = _problem_id(state, cfg)
+    failed: list[Dict[str, Any]] = []
     for i, p in enumerate(prompts):
-        img_bytes = tb.generate_image(cfg.image_model, p)
+        try:
+            img_bytes = tb.generate_image(cfg.image_model, p)
+        except Exception as e:
+            # A failed illustration must not leave a broken file behind; record it instead.
+            failed.append({"index": i + 1, "prompt": p, "error": str(e)})
+            continue
         img_base = f"problems/{problem_id}/images"
         rel = f"{img_base}/img_{i + 1}.png"
         tb.ensure_dir(img_base)
@@ -190,7 +896,7 @@ def step_image(state: AuthoringState, cfg: AuthoringConfig, tb: Toolbelt) -> Aut
         if callable(write_bytes):
             write_bytes(rel, img_bytes)
         images.append((rel, len(img_bytes)))
-    state.images = {"count": len(images), "paths": [p for p, _ in images]}
+    state.images = {"count": len(images), "paths": [p for p, _ in images], "failed": failed}
     return state
 
 
@@ -199,13 +905,14 @@ def step_review(state: AuthoringState, cfg: AuthoringConfig, tb: Toolbelt) -> Au
         "requirement": state.requirement,
         "statement": state.statement,
         "cases": {
-            "examples": state.io.example_inputs,
-            "grading": state.io.grading_inputs,
+            "examples": _prompt_cases(state.io.example_inputs),
+            "grading": _prompt_cases(state.io.grading_inputs),
         },
         "labels": {
             "interactive": state.requirement.get("is_interactive", False),
             "special_judge": state.requirement.get("has_special_judge", False),
         },
+        "complexity": state.complexity,
         "language": cfg.target_language,
     }
     payload = f"{REVIEW_PROMPT}\n\nContext:\n{json.dumps(ctx, ensure_ascii=False)}"
@@ -213,37 +920,38 @@ def step_review(state: AuthoringState, cfg: AuthoringConfig, tb: Toolbelt) -> Au
         "You are a careful editor. "
         f"Write all issues and fix_suggestions in the language indicated by code '{cfg.target_language}'."
     )
-    state.review = _call_llm_json(tb, payload, system)
+    state.review = _call_llm_json(tb, payload, system, cfg, "review")
     return state
 
 
 def step_persist(state: AuthoringState, cfg: AuthoringConfig, tb: Toolbelt) -> AuthoringState:
-    pid = (
-        cfg.problem_id
-        or state.requirement.get("id")
-        or state.algo.get("id")
-        or state.code.get("id")
-        or "pending"
-    )
+    pid = _problem_id(state, cfg)
     base = f"problems/{pid}"
+    # Scratch files of earlier steps are not part of the problem
+    remove_tree = getattr(tb, "remove_tree", None)
+    if callable(remove_tree):
+        remove_tree(_work_dir(state, cfg))
     ctx = {
         "problem_id": pid,
         "base_dir": base,
         "statement": state.statement,
         "io": {
-            "example_inputs": state.io.example_inputs,
-            "grading_inputs": state.io.grading_inputs,
-            "example_outputs": state.io.example_outputs,
-            "grading_outputs": state.io.grading_outputs,
+            "example_inputs": _prompt_cases(state.io.example_inputs),
+            "grading_inputs": _prompt_cases(state.io.grading_inputs),
+            "example_outputs": _prompt_cases(state.io.example_outputs),
+            "grading_outputs": _prompt_cases(state.io.grading_outputs),
         },
         "language": cfg.target_language,
     }
     payload = f"{PERSIST_PROMPT}\n\nContext:\n{json.dumps(ctx, ensure_ascii=False)}"
-    state.persist_plan = _call_llm_json(tb, payload, "Output only JSON.")
+    state.persist_plan = _call_llm_json(tb, payload, "Output only JSON.", cfg, "persist")
     # Write problem.md and per-case files
-    tb.ensure_dir(f"{base}/cases")
     problem_md_path = f"{base}/problem.md"
     cases_dir = f"{base}/cases"
+    # A regenerated (or minimized) problem may have fewer cases than the last run left on disk
+    if callable(remove_tree):
+        remove_tree(cases_dir)
+    tb.ensure_dir(cases_dir)
     # Render markdown
     st = state.statement
     examples = st.get("examples", [])
@@ -281,6 +989,9 @@ def step_persist(state: AuthoringState, cfg: AuthoringConfig, tb: Toolbelt) -> A
         for p in state.images["paths"]:
             md.append(f"![figure]({p})")
     tb.write_file(problem_md_path, "\n".join(md))
+    index_problem = getattr(tb, "index_problem", None)
+    if callable(index_problem):
+        index_problem(str(pid), st, state.algo.get("algorithms", []))
     # Cases content: split each grading case into its own {caseID}.in / {caseID}.out
     for idx, (inp, out) in enumerate(
         zip_longest(state.io.grading_inputs, state.io.grading_outputs or [], fillvalue=""),
@@ -290,4 +1001,52 @@ def step_persist(state: AuthoringState, cfg: AuthoringConfig, tb: Toolbelt) -> A
         case_out_path = f"{cases_dir}/case_{idx}.out"
         tb.write_file(case_in_path, inp)
         tb.write_file(case_out_path, out)
+    upsert_catalog = getattr(tb, "upsert_catalog", None)
+    if callable(upsert_catalog):
+        upsert_catalog(_catalog_record(state, cfg, pid, base))
     return state
+
+
+def _generation_flags(state: AuthoringState) -> List[str]:
+    # Warnings from earlier steps that a problem setter should look at before publishing.
+    flags = []
+    if state.dedupe.get("duplicate"):
+        flags.append("near_duplicate")
+    if state.crosscheck.get("mismatches"):
+        flags.append("reference_mismatch")
+    if state.crosscheck.get("failures"):
+        flags.append("reference_failure")
+    if state.judge.get("rejected"):
+        flags.append("judge_rejected")
+    if state.complexity.get("exceeds_limit"):
+        flags.append("exceeds_time_limit")
+    if state.complexity.get("slower_than_hint"):
+        flags.append("slower_than_hint")
+    if state.review.get("issues"):
+        flags.append("review_issues")
+    if state.images.get("failed"):
+        flags.append("image_failed")
+    return flags
+
+
+def _catalog_record(state: AuthoringState, cfg: AuthoringConfig, pid: Any, base: str) -> Dict[str, Any]:
+    # Raw title and case texts; the catalog derives the display title and the case hashes/sizes.
+    st = state.statement
+    io = state.io
+    cases = [
+        {"input": inp, "output": out, "tags": io.grading_tags[idx] if idx < len(io.grading_tags) else []}
+        for idx, (inp, out) in enumerate(zip_longest(io.grading_inputs, io.grading_outputs or [], fillvalue=""))
+    ]
+    flags = _generation_flags(state)
+    return {
+        "id": str(pid),
+        "title": str(st.get("title") or st.get("abstract", "")),
+        "tags": state.algo.get("algorithms", []),
+        "time_limit_ms": cfg.time_limit_ms,
+        "interactive": bool(state.requirement.get("is_interactive")),
+        "special_judge": bool(state.requirement.get("has_special_judge")),
+        "status": "flagged" if flags else "ok",
+        "flags": flags,
+        "path": base,
+        "cases": cases,
+    }
\ No newline at end of file
@@ -11,6 +11,33 @@ Expected injected tools (callables):
 - ensure_dir(path: str) -> None
 - generate_image(model: str, prompt: str) -> bytes
 - write_bytes(path: str, data: bytes) -> None (optional, for images/binary)
+- run_program(command: str, input_path: str | None, output_path: str | None, timeout: float | None) -> dict
+    { 'returncode': int, 'stdout': str, 'stderr': str, 'elapsed': float, 'timed_out': bool }
+    (optional; without it, solutions are built but never executed)
+- run_judge(judge_path: str, mode: str, cases: list[dict], workers: int | None) -> list[dict]
+    mode is 'checker' or 'interactive'; each result has 'verdict' (AC/WA/TLE/RE/JE) and 'message'
+    (optional; without it, judge.py is written but never run)
+- compare_output(expected_path: str, actual_path: str, mode: str, abs_tol: float, rel_tol: float) -> dict
+    streaming token comparison; result has 'ok' and, on mismatch, the first differing position
+    (optional; falls back to comparing whole strings in memory)
+- find_similar(statement: dict, tags: list[str], exclude: str | None, threshold: float) -> list[dict]
+    near-duplicate lookup over previously generated problems (optional)
+- index_problem(problem_id: str, statement: dict, tags: list[str]) -> None
+    adds a persisted problem to the near-duplicate index (optional)
+- unindex_problem(problem_id: str) -> None
+    removes a problem from the near-duplicate index; bulk runs use it for jobs that failed (optional)
+- collect_coverage(source_path: str, input_paths: list[str], std: str, workers: int | None,
+                   timeout: float | None) -> list[list[str] | None]
+    branches of a C++ source executed by each input (optional)
+- remove_tree(path: str) -> None
+    deletes a scratch directory recursively (optional; without it scratch files are left behind)
+- upsert_catalog(record: dict) -> None
+    adds or replaces a persisted problem's row in the problem catalog; record["title"] is raw text and
+    record["cases"] holds {"input", "output", "tags"} texts (optional; see tools/catalog.py)
+- hedge_llm(primary, prompt, system, parse, step, deadline, hedge_percentile, min_samples, fallback) -> Any
+    deadline-bounded, hedged llm_chat call returning parse(response) (optional; see tools/hedge.py)
+- llm_fallback(prompt: str, system: str | None = None) -> dict | str
+    second model that hedged requests are sent to (optional; defaults to llm_chat)
 """
 
 from typing import Callable, Dict, Any, List, Optional
@@ -27,6 +54,17 @@ class Toolbelt:
         ensure_dir: Callable[[str], None],
         generate_image: Callable[[str, str], bytes],
         write_bytes: Optional[Callable[[str, bytes], None]] = None,
+        run_program: Optional[Callable[..., Dict[str, Any]]] = None,
+        run_judge: Optional[Callable[..., List[Dict[str, Any]]]] = None,
+        compare_output: Optional[Callable[..., Dict[str, Any]]] = None,
+        find_similar: Optional[Callable[..., List[Dict[str, Any]]]] = None,
+        index_problem: Optional[Callable[[str, Dict[str, Any], List[str]], None]] = None,
+        collect_coverage: Optional[Callable[..., List[Optional[List[str]]]]] = None,
+        hedge_llm: Optional[Callable[..., Any]] = None,
+        llm_fallback: Optional[Callable[[str, str | None], Any]] = None,
+        upsert_catalog: Optional[Callable[[Dict[str, Any]], None]] = None,
+        remove_tree: Optional[Callable[[str], None]] = None,
+        unindex_problem: Optional[Callable[[str], None]] = None,
     ) -> None:
         self.llm_chat = llm_chat
         self.run_shell = run_shell
@@ -37,3 +75,22 @@ class Toolbelt:
         self.generate_image = generate_image
         # Optional binary writer, used for persisting images if available
         self.write_bytes = write_bytes
+        # Optional program runner, used to execute built solutions on cases
+        self.run_program = run_program
+        # Optional special-judge / interactive judge runner
+        self.run_judge = run_judge
+        # Optional streaming output comparator
+        self.compare_output = compare_output
+        # Optional near-duplicate index over generated problems
+        self.find_similar = find_similar
+        self.index_problem = index_problem
+        self.unindex_problem = unindex_problem
+        # Optional per-case branch coverage collector
+        self.collect_coverage = collect_coverage
+        # Optional deadline/hedging wrapper for LLM calls and the model hedges go to
+        self.hedge_llm = hedge_llm
+        self.llm_fallback = llm_fallback
+        # Optional problem catalog writer
+        self.upsert_catalog = upsert_catalog
+        # Optional recursive delete for scratch directories
+        self.remove_tree = remove_tree
@@ -1,79 +1,353 @@
-from typing import Dict, List
+from dataclasses import asdict, fields, replace
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+import argparse
+import json
 import os
+import sys
 import logging
 
-from agents import AuthoringState, AuthoringConfig, build_authoring_graph
+from agents import AuthoringState, AuthoringConfig, build_authoring_graph, run_bulk
 from agents.tools import Toolbelt
-from dotenv import load_dotenv
 
-from tools.llm import real_llm
-from tools.shell import noop_shell
-from tools.image import gemini_image
 from tools import fs
+from tools import providers
+from tools.shell import run_program
+from tools.judge import run_judge
+from tools.compare import compare_files
+from tools.corpus import find_similar, index_problem, unindex_problem
+from tools.catalog import upsert_catalog
+from tools.coverage import case_coverage
+from tools import hedge
 
 
-load_dotenv()
+def _build_parser() -> argparse.ArgumentParser:
+    """CLI 인자 파서를 만든다.
+
+    기본값은 환경 변수(.env 포함)에서 읽으므로 load_dotenv() 이후에 호출해야 한다.
+    """
+    parser = argparse.ArgumentParser(
+        prog="ps-generator",
+        description="Generate a competitive programming problem from a short seed description.",
+    )
+    seed = parser.add_mutually_exclusive_group()
+    seed.add_argument("--seed", help="problem description text")
+    seed.add_argument(
+        "--seed-file",
+        help="read the problem description from a file ('-' for stdin)",
+    )
+    parser.add_argument(
+        "--problem-id",
+        type=int,
+        default=int(os.environ["PROBLEM_ID"]) if os.getenv("PROBLEM_ID", "").isdigit() else None,
+        help="numeric problem id used for ./problems/{id} (default: env PROBLEM_ID or 'pending')",
+    )
+    # LANG: target natural language for problem statements (default: EN)
+    # PROGM_LANG: example programming language label (default: C++/17)
+    parser.add_argument(
+        "--language",
+        default=os.getenv("LANG", "EN"),
+        help="natural language of the statement, e.g. EN, KO (default: env LANG)",
+    )
+    parser.add_argument(
+        "--prog-lang",
+        default=os.getenv("PROGM_LANG", "C++/17"),
+        help="example programming language label (default: env PROGM_LANG)",
+    )
+    parser.add_argument(
+        "--ref-langs",
+        default=os.getenv("PSGEN_REF_LANGS", ""),
+        help="comma-separated extra reference solution languages, e.g. python,java (default: env PSGEN_REF_LANGS)",
+    )
+    parser.add_argument(
+        "--time-limit-ms",
+        type=int,
+        default=int(os.getenv("PSGEN_TIME_LIMIT_MS", "2000")),
+        help="base time limit per case before language multipliers (default: 2000)",
+    )
+    parser.add_argument(
+        "--on-duplicate",
+        choices=("flag", "regenerate", "stop"),
+        default=os.getenv("PSGEN_ON_DUPLICATE", "regenerate"),
+        help="what to do when the statement is a near-duplicate of an existing problem (default: regenerate)",
+    )
+    parser.add_argument(
+        "--llm",
+        default=os.getenv("PSGEN_LLM", "openai"),
+        help="LLM provider name (default: env PSGEN_LLM or 'openai')",
+    )
+    parser.add_argument(
+        "--image",
+        default=os.getenv("PSGEN_IMAGE", "gemini"),
+        help="image provider name (default: env PSGEN_IMAGE or 'gemini')",
+    )
+    parser.add_argument(
+        "--shell",
+        default=os.getenv("PSGEN_SHELL", "local"),
+        help="shell runner name; 'noop' only prints build commands (default: env PSGEN_SHELL or 'local')",
+    )
+    parser.add_argument(
+        "--bulk",
+        metavar="SEEDS_FILE",
+        help="offline bulk mode: JSONL of {seed, problem_id} objects or one seed per line "
+        "(lines without an id are numbered from --problem-id); "
+        "each step's LLM requests for all problems are sent as one batch job",
+    )
+    parser.add_argument(
+        "--batch",
+        default=os.getenv("PSGEN_BATCH", "openai"),
+        help="batch endpoint for --bulk: 'openai' or 'local' (runs the job file through --llm) "
+        "(default: env PSGEN_BATCH or 'openai')",
+    )
+    parser.add_argument(
+        "--batch-model",
+        default=os.getenv("PSGEN_BATCH_MODEL", "gpt-5.1"),
+        help="model name written into batch job files (default: gpt-5.1)",
+    )
+    parser.add_argument(
+        "--step-deadline",
+        action="append",
+        default=[],
+        metavar="STEP=SECONDS",
+        help="upper bound on each LLM call of a step, e.g. codegen=240 (repeatable)",
+    )
+    parser.add_argument(
+        "--hedge-percentile",
+        type=float,
+        default=float(os.environ["PSGEN_HEDGE_PERCENTILE"]) if os.getenv("PSGEN_HEDGE_PERCENTILE") else None,
+        help="re-send an LLM call slower than this percentile of the step's recent latencies, e.g. 95 "
+        "(default: off)",
+    )
+    parser.add_argument(
+        "--hedge-model",
+        default=os.getenv("PSGEN_HEDGE_MODEL"),
+        help="send hedged LLM requests to this model of the --llm provider instead of the primary one",
+    )
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument(
+        "--record",
+        metavar="CASSETTE",
+        help="record every tool call (LLM, image, shell, program runs, file I/O) of this run into a JSON cassette",
+    )
+    cassette.add_argument(
+        "--replay",
+        metavar="CASSETTE",
+        help="replay a recorded run offline; the seed and config stored in the cassette are reused",
+    )
+    parser.add_argument(
+        "--update-cassette",
+        action="store_true",
+        help="with --replay: run calls missing from the cassette live and add them (re-records changed steps only)",
+    )
+    parser.add_argument(
+        "--list-providers",
+        action="store_true",
+        help="print registered providers and exit",
+    )
+    return parser
+
+
+def _read_seed(args: argparse.Namespace) -> Optional[str]:
+    if args.seed is not None:
+        return args.seed
+    if args.seed_file == "-":
+        return sys.stdin.read()
+    if args.seed_file:
+        return fs.read_file(args.seed_file)
+    return os.getenv("PROBLEM_SEED") or None
+
+
+def _parse_deadlines(items: List[str]) -> Dict[str, float]:
+    deadlines: Dict[str, float] = {}
+    for item in items:
+        step, sep, seconds = item.partition("=")
+        if not sep:
+            raise ValueError(f"expected STEP=SECONDS, got '{item}'")
+        deadlines[step.strip()] = float(seconds)
+    return deadlines
 
 
+def _read_bulk(path: str, first_id: Optional[int]) -> List[Tuple[str, int]]:
+    """--bulk 파일을 (seed, problem_id) 목록으로 읽는다. id가 없으면 first_id부터 차례로 붙인다.
 
-def main() -> None:
+    모든 문제는 서로 다른 id를 가져야 한다 (id가 없으면 전부 problems/pending에 쓰게 된다).
+    id를 정할 수 없거나 겹치면 ValueError.
+    """
+    jobs: List[Tuple[str, int]] = []
+    seen: Dict[int, int] = {}
+    next_id = first_id
+    for lineno, line in enumerate(fs.read_file(path).splitlines(), start=1):
+        if not line.strip():
+            continue
+        if line.lstrip().startswith("{"):
+            obj = json.loads(line)
+            seed, pid = obj["seed"], obj.get("problem_id")
+        else:
+            seed, pid = line.strip(), None
+        if pid is None:
+            if next_id is None:
+                raise ValueError(f"{path}:{lineno}: no problem_id; give one per line or pass --problem-id")
+            pid = next_id
+        if not isinstance(pid, int):
+            raise ValueError(f"{path}:{lineno}: problem_id must be an integer, got {pid!r}")
+        if pid in seen:
+            raise ValueError(f"{path}:{lineno}: problem_id {pid} is already used on line {seen[pid]}")
+        seen[pid] = lineno
+        next_id = pid + 1
+        jobs.append((seed, pid))
+    return jobs
+
+
+def main(argv: Optional[List[str]] = None) -> None:
     """엔트리 포인트.
 
-    - API 키 설정
+    - CLI 인자/환경 변수로 설정을 구성 (대화형 입력 없음)
     - LangGraph 스타일 그래프 생성
-    - Toolbelt 구성 (LLM, 셸, FS, 이미지 생성기)
-    - 최종 결과를 메모리 FS에서 출력
+    - Toolbelt 구성 (LLM, 셸, FS, 이미지 생성기) - SDK는 첫 사용 시점에 로드
+    - 최종 결과를 ./problems 아래에 기록
     """
-    # 0) Setup API keys (OpenAI for LLM, Gemini for nano banana pro images)
-    if not os.getenv("OPENAI_API_KEY"):
-        os.environ["OPENAI_API_KEY"] = input("Enter your OpenAI API key: ")
-    if not os.getenv("GEMINI_API_KEY"):
-        os.environ["GEMINI_API_KEY"] = input("Enter your Gemini API key (for nano banana pro images): ")
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    if args.list_providers:
+        for kind in ("llm", "image", "shell", "batch"):
+            print(f"{kind}: {', '.join(providers.available(kind))}")
+        return
+
+    if args.update_cassette and not args.replay:
+        parser.error("--update-cassette requires --replay")
+    if args.bulk and (args.record or args.replay):
+        parser.error("--record/--replay cannot be combined with --bulk")
+
+    cassette = None
+    if args.record or args.replay:
+        from tools.cassette import Cassette
+
+        mode = "record" if args.record else ("update" if args.update_cassette else "replay")
+        cassette = Cassette(args.record or args.replay, mode)
+
+    try:
+        step_deadlines = _parse_deadlines(args.step_deadline)
+    except ValueError as e:
+        parser.error(f"--step-deadline: {e}")
+
+    # 0) Validate provider selection and required API keys up front
+    # (a pure replay never calls a provider, so keys are not needed)
+    selected = [("llm", args.llm), ("image", args.image), ("shell", args.shell)]
+    if args.bulk and args.batch != "local":
+        selected.append(("batch", args.batch))
+    for kind, name in selected:
+        try:
+            missing = providers.missing_env(kind, name)
+        except KeyError as e:
+            parser.error(str(e.args[0]))
+        if missing and (cassette is None or cassette.mode != "replay"):
+            parser.error(f"{kind} provider '{name}' requires environment variable(s): {', '.join(missing)}")
 
     # 1) Initialize problem configuration
-    description = input("Enter problem description: ")
-    # Optional explicit problem id (used for ./problems/{id} directory naming)
-    problem_id_raw = input("Enter numeric problem id (leave blank for 'pending'): ").strip()
-    problem_id: int | None
-    if problem_id_raw.isdigit():
-        problem_id = int(problem_id_raw)
-    else:
-        problem_id = None
+    description = None
+    if not args.bulk:
+        description = _read_seed(args)
+        if not description and cassette is not None and cassette.mode != "record":
+            description = cassette.meta.get("seed")
+        if not description or not description.strip():
+            parser.error("a problem description is required (--seed, --seed-file, --bulk or env PROBLEM_SEED)")
 
-    # Language and example programming language from environment (.env)
-    # LANG: target natural language for problem statements (default: EN)
-    # PROGM_LANG: example programming language label (default: C++/17)
-    lang_env = os.getenv("LANG", "EN")
-    language = lang_env.lower()
-    example_prog_lang = os.getenv("PROGM_LANG", "C++/17")
+    logging.basicConfig(level=logging.INFO)
 
     # 2) LangGraph style pipeline setup
     graph = build_authoring_graph()
 
-    # 3) Prepare Toolbelt (real filesystem + dummy runner)
+    # 3) Prepare Toolbelt (real filesystem + providers resolved on first use)
     tb = Toolbelt(
-        llm_chat=real_llm,
-        run_shell=noop_shell,
+        llm_chat=providers.lazy("llm", args.llm),
+        run_shell=providers.lazy("shell", args.shell),
         write_file=fs.write_file,
         read_file=fs.read_file,
         list_dir=fs.list_dir,
         ensure_dir=fs.ensure_dir,
-        generate_image=gemini_image,
+        remove_tree=fs.remove_tree,
+        generate_image=providers.lazy("image", args.image),
         write_bytes=fs.write_bytes,
+        # Solutions are only executed when a real shell is selected
+        run_program=run_program if args.shell != "noop" else None,
+        run_judge=run_judge if args.shell != "noop" else None,
+        compare_output=compare_files,
+        find_similar=find_similar,
+        index_problem=index_problem,
+        unindex_problem=unindex_problem,
+        collect_coverage=case_coverage if args.shell != "noop" else None,
+        upsert_catalog=upsert_catalog,
+        # Replayed calls return instantly and would skew the latency history
+        hedge_llm=hedge.hedged_call if cassette is None or cassette.mode == "record" else None,
+        llm_fallback=partial(providers.lazy("llm", args.llm), model=args.hedge_model) if args.hedge_model else None,
     )
 
     # 4) Initialize state and config
-    state = AuthoringState(description)
     cfg = AuthoringConfig(
-        target_language=language,
-        example_prog_lang=example_prog_lang,
-        problem_id=problem_id,
+        target_language=args.language.lower(),
+        example_prog_lang=args.prog_lang,
+        problem_id=args.problem_id,
+        reference_languages=[x.strip() for x in args.ref_langs.split(",") if x.strip()],
+        time_limit_ms=args.time_limit_ms,
+        duplicate_policy=args.on_duplicate,
+        step_deadlines=step_deadlines,
+        hedge_percentile=args.hedge_percentile,
     )
-    final_state = graph(state, cfg, tb)
+    if cassette is not None:
+        if cassette.mode == "record":
+            cassette.meta = {"seed": description, "config": asdict(cfg)}
+        elif "config" in cassette.meta:
+            known = {f.name for f in fields(AuthoringConfig)}
+            cfg = AuthoringConfig(**{k: v for k, v in cassette.meta["config"].items() if k in known})
+        tb = cassette.wrap(tb)
+    if args.bulk:
+        from tools.batch import LocalBatchEndpoint, batch_submitter
+
+        if args.batch == "local":
+            endpoint = LocalBatchEndpoint(tb.llm_chat)
+        else:
+            endpoint = providers.lazy("batch", args.batch)
+        try:
+            seeds = _read_bulk(args.bulk, args.problem_id)
+        except ValueError as e:
+            parser.error(str(e))
+        jobs = [(AuthoringState(seed), replace(cfg, problem_id=pid)) for seed, pid in seeds]
+        results = run_bulk(
+            jobs,
+            tb,
+            batch_submitter(endpoint, args.batch_model),
+            on_step=lambda name, rounds, n: logging.info("bulk step %s: %d batch(es), %d request(s)", name, rounds, n),
+        )
+        for (_, job_cfg), result in zip(jobs, results):
+            if isinstance(result, BaseException):
+                logging.error("problem %s failed: %s", job_cfg.problem_id, result)
+    elif cassette is not None:
+        try:
+            final_state = graph(AuthoringState(description), cfg, tb)
+        finally:
+            if cassette.mode != "replay":
+                cassette.save()
+            logging.info("cassette %s: %s", cassette.path, cassette.summary())
+    else:
+        final_state = graph(AuthoringState(description), cfg, tb)
+
+    hedge_metrics = hedge.metrics()
+    if hedge_metrics["calls"]:
+        hedge.tracker().save()
+        logging.info("llm hedging: %s", hedge_metrics)
+
+    # Provider call metrics (queue wait, retries, circuit state); only present if SDKs were used
+    if "tools.ratelimit" in sys.modules:
+        for name, m in sys.modules["tools.ratelimit"].all_metrics().items():
+            logging.info("provider %s: %s", name, m)
 
     # 5) Output notice of generated problem files
     print("Problems have been written under ./problems (e.g., ./problems/{id}/problem.md).")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
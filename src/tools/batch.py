@@ -0,0 +1,123 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+import json
+import logging
+import os
+import time
+
+
+# OpenAI Batch API 형식의 작업 파일(JSONL)을 다룬다.
+# 한 줄 = {"custom_id", "method": "POST", "url": "/v1/chat/completions", "body": {...}}
+
+BATCH_URL = "/v1/chat/completions"
+
+
+def write_job_file(path: str, requests: List[Dict[str, Any]], model: str) -> None:
+    """bulk 요청 목록을 배치 작업 파일로 기록한다."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for req in requests:
+            messages = []
+            if req.get("system"):
+                messages.append({"role": "system", "content": req["system"]})
+            messages.append({"role": "user", "content": req["prompt"]})
+            line = {
+                "custom_id": req["custom_id"],
+                "method": "POST",
+                "url": BATCH_URL,
+                "body": {"model": model, "messages": messages},
+            }
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+
+def read_output_file(path: str) -> Dict[str, str]:
+    """배치 결과 파일에서 custom_id -> 응답 텍스트를 읽는다. 실패한 줄은 건너뛴다."""
+    results: Dict[str, str] = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for raw in f:
+            if not raw.strip():
+                continue
+            line = json.loads(raw)
+            response = line.get("response") or {}
+            if line.get("error") or response.get("status_code", 200) != 200:
+                logging.warning("Batch request %s failed: %s", line.get("custom_id"), line.get("error"))
+                continue
+            choices = (response.get("body") or {}).get("choices") or []
+            if choices:
+                results[line["custom_id"]] = choices[0]["message"]["content"]
+    return results
+
+
+def openai_endpoint(job_path: str, output_path: str, poll_seconds: float = 30.0) -> None:
+    """OpenAI Batch API로 작업 파일을 제출하고 완료될 때까지 기다린 뒤 결과 파일을 내려받는다."""
+    from openai import OpenAI
+
+    client = OpenAI()
+    with open(job_path, "rb") as f:
+        uploaded = client.files.create(file=f, purpose="batch")
+    batch = client.batches.create(input_file_id=uploaded.id, endpoint=BATCH_URL, completion_window="24h")
+    logging.info("Submitted batch %s (%s)", batch.id, job_path)
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        time.sleep(poll_seconds)
+        batch = client.batches.retrieve(batch.id)
+    if batch.status != "completed" or not batch.output_file_id:
+        raise RuntimeError(f"batch {batch.id} ended with status {batch.status}")
+    content = client.files.content(batch.output_file_id)
+    with open(output_path, "wb") as f:
+        f.write(content.read())
+
+
+class LocalBatchEndpoint:
+    """테스트용 로컬 배치 엔드포인트.
+
+    작업 파일을 읽어 각 요청을 주입된 llm_chat(prompt, system)으로 처리하고,
+    OpenAI 배치 결과와 같은 형식의 결과 파일을 쓴다.
+    """
+
+    def __init__(self, llm_chat: Callable[[str, Optional[str]], Any], workers: int = 4) -> None:
+        self.llm_chat = llm_chat
+        self.workers = workers
+
+    def _answer(self, line: Dict[str, Any]) -> Dict[str, Any]:
+        messages = line["body"]["messages"]
+        system = next((m["content"] for m in messages if m["role"] == "system"), None)
+        prompt = next(m["content"] for m in messages if m["role"] == "user")
+        try:
+            raw = self.llm_chat(prompt, system)
+        except Exception as e:
+            return {"custom_id": line["custom_id"], "response": None, "error": {"message": str(e)}}
+        text = raw if isinstance(raw, str) else json.dumps(raw)
+        body = {"choices": [{"index": 0, "message": {"role": "assistant", "content": text}}]}
+        return {"custom_id": line["custom_id"], "response": {"status_code": 200, "body": body}, "error": None}
+
+    def __call__(self, job_path: str, output_path: str) -> None:
+        with open(job_path, "r", encoding="utf-8") as f:
+            lines = [json.loads(raw) for raw in f if raw.strip()]
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            outputs = list(pool.map(self._answer, lines))
+        with open(output_path, "w", encoding="utf-8") as f:
+            for out in outputs:
+                f.write(json.dumps(out, ensure_ascii=False) + "\n")
+
+
+def batch_submitter(
+    endpoint: Callable[[str, str], None],
+    model: str,
+    work_dir: str = "problems/.batches",
+) -> Callable[[List[Dict[str, Any]]], Dict[str, str]]:
+    """agents.bulk.run_bulk에 넘길 submit_batch를 만든다. 작업/결과 파일은 work_dir에 남는다."""
+    counter = [0]
+
+    def submit(requests: List[Dict[str, Any]]) -> Dict[str, str]:
+        counter[0] += 1
+        stamp = f"{int(time.time())}-{counter[0]:03d}"
+        job_path = os.path.join(work_dir, f"job-{stamp}.jsonl")
+        output_path = os.path.join(work_dir, f"out-{stamp}.jsonl")
+        write_job_file(job_path, requests, model)
+        logging.info("Running batch job %s with %d request(s)...", job_path, len(requests))
+        endpoint(job_path, output_path)
+        return read_output_file(output_path)
+
+    return submit
@@ -0,0 +1,224 @@
+from collections import defaultdict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+import base64
+import copy
+import hashlib
+import json
+import os
+import sys
+import threading
+
+
+# 외부 세계를 관찰하거나 비용이 드는 도구: replay 모드에서는 카세트에서 결과를 돌려준다.
+REPLAYED_TOOLS = (
+    "llm_chat",
+    "llm_fallback",
+    "generate_image",
+    "run_shell",
+    "run_program",
+    "run_judge",
+    "compare_output",
+    "collect_coverage",
+    "find_similar",
+    "read_file",
+    "list_dir",
+)
+# 부수 효과만 있는 도구: 기록은 하되 replay 모드에서도 실제로 실행한다 (memfs 등을 주입하면 된다).
+PASSTHROUGH_TOOLS = (
+    "write_file", "write_bytes", "ensure_dir", "index_problem", "unindex_problem", "upsert_catalog", "remove_tree",
+)
+
+
+# 인자에 파일 내용이나 케이스 전체가 들어가는 쓰기 도구: 녹화에는 요약만 남긴다.
+_DIGESTED_TOOLS = ("write_file", "write_bytes", "upsert_catalog")
+
+
+class CassetteMiss(KeyError):
+    """replay 모드에서 카세트에 없는 호출이 들어왔을 때 발생한다."""
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, (bytes, bytearray)):
+        return {"__bytes__": base64.b64encode(bytes(value)).decode("ascii")}
+    if isinstance(value, dict):
+        return {k: _encode(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    return value
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict):
+        if set(value) == {"__bytes__"}:
+            return base64.b64decode(value["__bytes__"])
+        return {k: _decode(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    return value
+
+
+def _key(tool: str, args: List[Any], kwargs: Dict[str, Any]) -> str:
+    blob = json.dumps([tool, _encode(args), _encode(kwargs)], sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _digest(value: Any) -> Dict[str, Any]:
+    if isinstance(value, str):
+        data = value.encode("utf-8")
+    elif isinstance(value, (bytes, bytearray)):
+        data = bytes(value)
+    else:
+        data = json.dumps(_encode(value), sort_keys=True, default=str, ensure_ascii=False).encode("utf-8")
+    return {"sha256": hashlib.sha256(data).hexdigest(), "bytes": len(data)}
+
+
+def _digest_args(args: List[Any]) -> List[Any]:
+    # write_file(path, content) / write_bytes(path, data) -> [path, digest]
+    # upsert_catalog(record) -> [{"id": ..., **digest}]
+    if args and isinstance(args[0], dict):
+        return [{"id": args[0].get("id"), **_digest(args[0])}]
+    return [args[0], *(_digest(a) for a in args[1:])] if args else []
+
+
+class Cassette:
+    """Toolbelt 호출 녹화/재생기.
+
+    - record: 모든 도구 호출을 실제로 실행하고 (요청, 응답)을 기록한다.
+    - replay: REPLAYED_TOOLS는 카세트의 응답을 돌려주고, 없으면 CassetteMiss를 던진다.
+    - update: replay와 같되 카세트에 없는 호출만 실제로 실행해 녹화한다.
+      프롬프트가 바뀐 단계(와 그 결과에 의존하는 이후 단계)만 다시 녹화되며, 쓰이지 않은 항목은 저장 시 버린다.
+    같은 요청이 여러 번 나오면 녹화된 순서대로 응답한다.
+    """
+
+    def __init__(self, path: str, mode: str = "record") -> None:
+        if mode not in ("record", "replay", "update"):
+            raise ValueError(f"unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.meta: Dict[str, Any] = {}
+        self.entries: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._queues: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._last: Dict[str, Dict[str, Any]] = {}
+        # 이번 실행에서 재생했거나 새로 녹화한 항목. update 모드는 이것만 저장해 낡은 항목을 버린다.
+        self._used: List[Dict[str, Any]] = []
+        self.stats: Dict[str, Any] = {"hits": 0, "live": defaultdict(int)}
+        if mode != "record":
+            self.load()
+
+    def load(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self.meta = data.get("meta", {})
+        self.entries = data.get("entries", [])
+        for entry in self.entries:
+            self._queues[entry["key"]].append(entry)
+
+    def save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            entries = self._used if self.mode == "update" else self.entries
+            data = {"version": 1, "meta": self.meta, "entries": entries}
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def _current_step(self) -> str:
+        # 호출 스택에서 step_* 함수를 찾는다. 작업 스레드라면 단계를 실행 중인 메인 스레드의 스택을 본다.
+        frames = [sys._getframe(2)]
+        main = threading.main_thread()
+        if threading.current_thread() is not main:
+            frames.append(sys._current_frames().get(main.ident))
+        for frame in frames:
+            while frame is not None:
+                if frame.f_code.co_name.startswith("step_"):
+                    return frame.f_code.co_name[len("step_"):]
+                frame = frame.f_back
+        return "unknown"
+
+    def _lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue:
+                entry = queue.popleft()
+                self._last[key] = entry
+                self._used.append(entry)
+                return entry
+            return self._last.get(key)
+
+    def _record(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self.entries.append(entry)
+            self._used.append(entry)
+
+    def _wrap(self, tool: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        replayed = tool in REPLAYED_TOOLS
+
+        def _call(*args: Any, **kwargs: Any) -> Any:
+            key = _key(tool, list(args), kwargs)
+            step = self._current_step()
+            if replayed and self.mode != "record":
+                hit = self._lookup(key)
+                if hit is not None:
+                    with self._lock:
+                        self.stats["hits"] += 1
+                    if "error" in hit:
+                        raise RuntimeError(f"replayed {tool} error: {hit['error']}")
+                    return copy.deepcopy(_decode(hit["result"]))
+                if self.mode == "replay":
+                    raise CassetteMiss(f"no recorded {tool} call in step '{step}' (key {key[:12]})")
+            if replayed:
+                with self._lock:
+                    self.stats["live"][step] += 1
+            entry: Dict[str, Any] = {"tool": tool, "step": step, "key": key, "args": _encode(list(args))}
+            if kwargs:
+                entry["kwargs"] = _encode(kwargs)
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                if replayed:
+                    entry["error"] = f"{type(e).__name__}: {e}"
+                    self._record(entry)
+                raise
+            if replayed:
+                entry["result"] = _encode(result)
+                self._record(entry)
+            elif self.mode == "record":
+                # 쓰기는 참고용으로 녹화 때만 남긴다 (재생/갱신 때마다 중복되지 않도록).
+                # 큰 내용은 그대로 두지 않고 경로/id와 해시, 크기만 남긴다.
+                if tool in _DIGESTED_TOOLS:
+                    entry["args"] = _digest_args(list(args))
+                    entry.pop("kwargs", None)
+                self._record(entry)
+            return result
+
+        _call.__name__ = f"cassette_{tool}"
+        return _call
+
+    def wrap(self, tb: Any) -> Any:
+        """Toolbelt의 얕은 복사본을 만들어 주입된 모든 callable을 감싼다."""
+        wrapped = copy.copy(tb)
+        for tool in REPLAYED_TOOLS + PASSTHROUGH_TOOLS:
+            fn = getattr(tb, tool, None)
+            if callable(fn):
+                setattr(wrapped, tool, self._wrap(tool, fn))
+            elif tool in REPLAYED_TOOLS and self.mode != "record":
+                # 녹화 당시 주입되어 있던 선택 도구는 실제 구현 없이도 재생할 수 있게 한다.
+                if any(e["tool"] == tool for e in self.entries):
+                    setattr(wrapped, tool, self._wrap(tool, _unavailable(tool)))
+        return wrapped
+
+    def summary(self) -> Dict[str, Any]:
+        entries = self._used if self.mode == "update" else self.entries
+        return {"mode": self.mode, "entries": len(entries), "hits": self.stats["hits"],
+                "live_calls_by_step": dict(self.stats["live"])}
+
+
+def _unavailable(tool: str) -> Callable[..., Any]:
+    def _fail(*_: Any, **__: Any) -> Any:
+        raise CassetteMiss(f"{tool} is not available live during replay")
+
+    return _fail
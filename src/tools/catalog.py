@@ -0,0 +1,323 @@
+"""
+생성된 문제 카탈로그 (SQLite).
+
+step_persist가 문제마다 한 행을 upsert하므로, 저지 연동이나 운영 스크립트는 problems/ 아래의
+케이스 파일을 훑지 않고도 목록/필터/조회를 할 수 있다.
+
+    python -m tools.catalog list --tag dp --status ok
+    python -m tools.catalog show 1001
+    python -m tools.catalog export --format csv --output catalog.csv
+    python -m tools.catalog scan            # 카탈로그 이전에 만들어진 문제를 한 번 등록
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+import argparse
+import csv
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+
+DEFAULT_CATALOG_PATH = "problems/.index/catalog.sqlite"
+
+_SUMMARY_COLUMNS = (
+    "id", "title", "tags", "time_limit_ms", "interactive", "special_judge",
+    "case_count", "total_bytes", "status", "flags", "path", "updated_at",
+)
+
+
+def case_entry(index: int, input_text: str, output_text: str, tags: Iterable[str] = ()) -> Dict[str, Any]:
+    """케이스 하나의 카탈로그 항목 (sha256과 바이트 수)."""
+    inp = input_text.encode("utf-8")
+    out = output_text.encode("utf-8")
+    return {
+        "index": index,
+        "input_sha256": hashlib.sha256(inp).hexdigest(),
+        "input_bytes": len(inp),
+        "output_sha256": hashlib.sha256(out).hexdigest(),
+        "output_bytes": len(out),
+        "tags": list(tags),
+    }
+
+
+class Catalog:
+    """문제 단위 메타데이터 카탈로그.
+
+    - problems: 문제당 한 행 (제목, 태그, 제한, 케이스 수/총 크기, 생성 상태와 경고 목록)
+    - problem_tags: 태그 필터용 역색인
+    - cases: 케이스별 해시와 크기
+    """
+
+    def __init__(self, path: str = DEFAULT_CATALOG_PATH) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        # WAL: 파이프라인이 쓰는 동안에도 CLI 조회가 막히지 않는다.
+        self._db.execute("PRAGMA journal_mode=WAL")
+        with self._db:
+            self._db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS problems (
+                    id TEXT PRIMARY KEY,
+                    title TEXT,
+                    tags TEXT,
+                    time_limit_ms INTEGER,
+                    interactive INTEGER,
+                    special_judge INTEGER,
+                    case_count INTEGER,
+                    total_bytes INTEGER,
+                    status TEXT,
+                    flags TEXT,
+                    path TEXT,
+                    updated_at REAL
+                );
+                CREATE TABLE IF NOT EXISTS problem_tags (
+                    problem_id TEXT,
+                    tag TEXT
+                );
+                CREATE INDEX IF NOT EXISTS problem_tags_tag ON problem_tags (tag);
+                CREATE INDEX IF NOT EXISTS problem_tags_problem ON problem_tags (problem_id);
+                CREATE INDEX IF NOT EXISTS problems_status ON problems (status);
+                CREATE TABLE IF NOT EXISTS cases (
+                    problem_id TEXT,
+                    idx INTEGER,
+                    input_sha256 TEXT,
+                    input_bytes INTEGER,
+                    output_sha256 TEXT,
+                    output_bytes INTEGER,
+                    tags TEXT,
+                    PRIMARY KEY (problem_id, idx)
+                );
+                """
+            )
+
+    def upsert(self, record: Dict[str, Any]) -> None:
+        """record: id, title, tags, time_limit_ms, interactive, special_judge, status, flags, path, cases."""
+        pid = str(record["id"])
+        cases = record.get("cases", [])
+        tags = sorted({str(t).strip().lower() for t in record.get("tags", []) if str(t).strip()})
+        total = sum(c["input_bytes"] + c["output_bytes"] for c in cases)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO problems VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    pid,
+                    record.get("title", ""),
+                    json.dumps(tags, ensure_ascii=False),
+                    record.get("time_limit_ms"),
+                    int(bool(record.get("interactive"))),
+                    int(bool(record.get("special_judge"))),
+                    len(cases),
+                    total,
+                    record.get("status", "ok"),
+                    json.dumps(record.get("flags", []), ensure_ascii=False),
+                    record.get("path", ""),
+                    time.time(),
+                ),
+            )
+            self._db.execute("DELETE FROM problem_tags WHERE problem_id = ?", (pid,))
+            self._db.executemany("INSERT INTO problem_tags VALUES (?, ?)", [(pid, t) for t in tags])
+            self._db.execute("DELETE FROM cases WHERE problem_id = ?", (pid,))
+            self._db.executemany(
+                "INSERT INTO cases VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (pid, c["index"], c["input_sha256"], c["input_bytes"], c["output_sha256"],
+                     c["output_bytes"], json.dumps(c.get("tags", [])))
+                    for c in cases
+                ],
+            )
+
+    @staticmethod
+    def _summary(row: sqlite3.Row) -> Dict[str, Any]:
+        item = dict(row)
+        item["tags"] = json.loads(item["tags"] or "[]")
+        item["flags"] = json.loads(item["flags"] or "[]")
+        item["interactive"] = bool(item["interactive"])
+        item["special_judge"] = bool(item["special_judge"])
+        return item
+
+    def search(
+        self,
+        tag: Optional[str] = None,
+        status: Optional[str] = None,
+        min_cases: Optional[int] = None,
+        interactive: Optional[bool] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        if tag:
+            clauses.append("id IN (SELECT problem_id FROM problem_tags WHERE tag = ?)")
+            params.append(tag.strip().lower())
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if min_cases is not None:
+            clauses.append("case_count >= ?")
+            params.append(min_cases)
+        if interactive is not None:
+            clauses.append("interactive = ?")
+            params.append(int(interactive))
+        sql = f"SELECT {', '.join(_SUMMARY_COLUMNS)} FROM problems"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        # 숫자 id는 숫자 순서로
+        sql += " ORDER BY CAST(id AS INTEGER), id"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        with self._lock:
+            return [self._summary(r) for r in self._db.execute(sql, params)]
+
+    def get(self, problem_id: str) -> Optional[Dict[str, Any]]:
+        pid = str(problem_id)
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {', '.join(_SUMMARY_COLUMNS)} FROM problems WHERE id = ?", (pid,)
+            ).fetchone()
+            if row is None:
+                return None
+            cases = self._db.execute(
+                'SELECT idx AS "index", input_sha256, input_bytes, output_sha256, output_bytes, tags '
+                "FROM cases WHERE problem_id = ? ORDER BY idx",
+                (pid,),
+            ).fetchall()
+        item = self._summary(row)
+        item["cases"] = [{**dict(c), "tags": json.loads(c["tags"] or "[]")} for c in cases]
+        return item
+
+    def close(self) -> None:
+        self._db.close()
+
+
+_DEFAULT: Optional[Catalog] = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def _default_catalog() -> Catalog:
+    global _DEFAULT
+    with _DEFAULT_LOCK:
+        if _DEFAULT is None:
+            _DEFAULT = Catalog(os.getenv("PSGEN_CATALOG", DEFAULT_CATALOG_PATH))
+    return _DEFAULT
+
+
+def problem_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """step_persist가 넘기는 원문 레코드를 Catalog.upsert 형식으로 바꾼다.
+
+    title은 첫 줄만 _title로 줄이고, cases의 {"input", "output", "tags"} 원문은 case_entry로 해시한다.
+    """
+    cases = [
+        case_entry(i, c.get("input", ""), c.get("output", ""), c.get("tags", ()))
+        for i, c in enumerate(record.get("cases", []), start=1)
+    ]
+    return {**record, "title": _title(str(record.get("title", ""))), "cases": cases}
+
+
+def upsert_catalog(record: Dict[str, Any]) -> None:
+    """Toolbelt용: 기본 카탈로그에 문제 행을 추가하거나 갱신한다 (record 형식은 problem_record 참고)."""
+    logging.info("Updating catalog entry for problem %s...", record.get("id"))
+    _default_catalog().upsert(problem_record(record))
+
+
+def scan_problems(catalog: Catalog, root: str = "problems") -> int:
+    """카탈로그가 생기기 전에 만들어진 문제 디렉터리를 등록한다. 이미 있는 id는 건너뛴다."""
+    added = 0
+    for name in sorted(os.listdir(root)) if os.path.isdir(root) else []:
+        base = os.path.join(root, name)
+        md_path = os.path.join(base, "problem.md")
+        if name.startswith(".") or not os.path.isfile(md_path) or catalog.get(name) is not None:
+            continue
+        with open(md_path, "r", encoding="utf-8") as f:
+            md = f.read()
+        abstract = md.split("## Abstract", 1)[1].split("\n## ", 1)[0].strip() if "## Abstract" in md else ""
+        cases = []
+        cases_dir = os.path.join(base, "cases")
+        i = 1
+        while os.path.exists(os.path.join(cases_dir, f"case_{i}.in")):
+            with open(os.path.join(cases_dir, f"case_{i}.in"), "r", encoding="utf-8") as f:
+                inp = f.read()
+            out_path = os.path.join(cases_dir, f"case_{i}.out")
+            out = ""
+            if os.path.exists(out_path):
+                with open(out_path, "r", encoding="utf-8") as f:
+                    out = f.read()
+            cases.append(case_entry(i, inp, out))
+            i += 1
+        catalog.upsert(
+            {"id": name, "title": _title(abstract), "path": base, "cases": cases, "status": "unknown", "flags": []}
+        )
+        added += 1
+    return added
+
+
+def _title(text: str, limit: int = 80) -> str:
+    first = text.strip().splitlines()[0] if text.strip() else ""
+    return first if len(first) <= limit else first[: limit - 1] + "…"
+
+
+def _main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m tools.catalog", description="Query the problem catalog.")
+    parser.add_argument("--db", default=os.getenv("PSGEN_CATALOG", DEFAULT_CATALOG_PATH))
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_list = sub.add_parser("list", help="list problems, optionally filtered")
+    p_list.add_argument("--tag")
+    p_list.add_argument("--status", help="ok, flagged or unknown")
+    p_list.add_argument("--min-cases", type=int)
+    p_list.add_argument("--interactive", choices=("yes", "no"))
+    p_list.add_argument("--limit", type=int)
+    p_list.add_argument("--json", action="store_true", help="one JSON object per line")
+    p_show = sub.add_parser("show", help="print one problem with its per-case hashes as JSON")
+    p_show.add_argument("problem_id")
+    p_export = sub.add_parser("export", help="export all problems")
+    p_export.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    p_export.add_argument("--with-cases", action="store_true", help="include per-case hashes (jsonl only)")
+    p_export.add_argument("--output", help="output file (default: stdout)")
+    p_scan = sub.add_parser("scan", help="register problem directories that are not in the catalog yet")
+    p_scan.add_argument("--root", default="problems")
+    args = parser.parse_args(argv)
+
+    catalog = Catalog(args.db)
+    if args.command == "list":
+        interactive = None if args.interactive is None else args.interactive == "yes"
+        rows = catalog.search(args.tag, args.status, args.min_cases, interactive, args.limit)
+        for row in rows:
+            if args.json:
+                print(json.dumps(row, ensure_ascii=False))
+            else:
+                tags = ",".join(row["tags"])
+                print(f"{row['id']}\t{row['status']}\t{row['case_count']} cases\t{tags}\t{row['title']}")
+    elif args.command == "show":
+        item = catalog.get(args.problem_id)
+        if item is None:
+            sys.exit(f"problem {args.problem_id} is not in the catalog")
+        print(json.dumps(item, ensure_ascii=False, indent=2))
+    elif args.command == "export":
+        rows = catalog.search()
+        out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+        try:
+            if args.format == "csv":
+                writer = csv.DictWriter(out, fieldnames=_SUMMARY_COLUMNS)
+                writer.writeheader()
+                for row in rows:
+                    writer.writerow({**row, "tags": ";".join(row["tags"]), "flags": ";".join(row["flags"])})
+            else:
+                for row in rows:
+                    item = catalog.get(row["id"]) if args.with_cases else row
+                    out.write(json.dumps(item, ensure_ascii=False) + "\n")
+        finally:
+            if out is not sys.stdout:
+                out.close()
+    elif args.command == "scan":
+        print(f"added {scan_problems(catalog, args.root)} problem(s)")
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,195 @@
+from typing import Any, Dict, Iterator, List, Optional, Union
+import mmap
+import re
+
+# mmap이나 bytes 모두 받을 수 있다.
+Buffer = Union[bytes, mmap.mmap]
+
+_CHUNK = 1 << 20
+_TOKEN_RE = re.compile(rb"\S+")
+
+
+def _token_batches(buf: Buffer, chunk_size: int = _CHUNK) -> Iterator[List[bytes]]:
+    """버퍼를 청크 단위로 잘라 공백 기준 토큰 리스트를 순서대로 내보낸다.
+
+    split()은 C 레벨에서 동작하므로 토큰을 하나씩 정규식으로 찾는 것보다 훨씬 빠르다.
+    청크 경계에서 잘린 토큰은 다음 청크의 첫 토큰과 이어 붙인다.
+    """
+    n = len(buf)
+    pos = 0
+    carry = b""
+    while pos < n:
+        chunk = buf[pos : pos + chunk_size]
+        pos += len(chunk)
+        parts = chunk.split()
+        if carry:
+            if parts and not chunk[:1].isspace():
+                parts[0] = carry + parts[0]
+            else:
+                parts.insert(0, carry)
+            carry = b""
+        if parts and pos < n and not chunk[-1:].isspace():
+            carry = parts.pop()
+        if parts:
+            yield parts
+    if carry:
+        yield [carry]
+
+
+class _TokenStream:
+    def __init__(self, buf: Buffer) -> None:
+        self._batches = _token_batches(buf)
+        self._cur: List[bytes] = []
+        self._i = 0
+        self.consumed = 0  # 지금까지 넘긴 토큰 수
+
+    def peek_block(self) -> List[bytes]:
+        """아직 소비하지 않은 현재 배치의 나머지 (비었으면 다음 배치를 읽는다)."""
+        while self._i >= len(self._cur):
+            nxt = next(self._batches, None)
+            if nxt is None:
+                return []
+            self._cur, self._i = nxt, 0
+        return self._cur[self._i :] if self._i else self._cur
+
+    def advance(self, k: int) -> None:
+        self._i += k
+        self.consumed += k
+
+
+def _floats_close(a: bytes, b: bytes, abs_tol: float, rel_tol: float) -> bool:
+    try:
+        x, y = float(a), float(b)
+    except ValueError:
+        return False
+    if x != x or y != y:  # NaN
+        return False
+    diff = abs(x - y)
+    return diff <= abs_tol or diff <= rel_tol * abs(x)
+
+
+def _locate(buf: Buffer, token_index: int, chunk_size: int = _CHUNK) -> Dict[str, Any]:
+    # 불일치 시에만 호출되는 경로: 토큰 위치를 바이트 오프셋과 줄 번호로 환산한다.
+    # 청크마다 split()으로 토큰 수만 세고, 목표 토큰이 있는 청크에서만 정규식을 쓴다.
+    n = len(buf)
+    pos = 0
+    seen = 0  # pos 이전에 시작한 토큰 수
+    lines = 1
+    prev_space = True
+    while pos < n:
+        chunk = buf[pos : pos + chunk_size]
+        continued = not prev_space and not chunk[:1].isspace()
+        started = len(chunk.split()) - (1 if continued else 0)
+        if seen + started > token_index:
+            for k, m in enumerate(_TOKEN_RE.finditer(chunk)):
+                if k - (1 if continued else 0) == token_index - seen:
+                    return {"offset": pos + m.start(), "line": lines + chunk[: m.start()].count(b"\n")}
+        seen += started
+        lines += chunk.count(b"\n")
+        prev_space = chunk[-1:].isspace()
+        pos += len(chunk)
+    return {"offset": n, "line": lines}
+
+
+def compare_buffers(
+    expected: Buffer,
+    actual: Buffer,
+    mode: str = "tokens",
+    abs_tol: float = 1e-6,
+    rel_tol: float = 1e-6,
+) -> Dict[str, Any]:
+    """두 출력 버퍼를 토큰 단위로 스트리밍 비교한다.
+
+    - mode="tokens": 공백(개행 포함)의 종류와 개수는 무시하고 토큰이 정확히 같아야 한다.
+    - mode="float": 두 토큰이 모두 실수이면 절대/상대 오차 허용 범위 안에서 같다고 본다.
+    결과: {ok, message} 와 불일치 시 첫 차이 위치(token, line, offset, expected, actual).
+    """
+    if mode not in ("tokens", "float"):
+        raise ValueError(f"unknown compare mode: {mode}")
+    exp, act = _TokenStream(expected), _TokenStream(actual)
+    while True:
+        eb, ab = exp.peek_block(), act.peek_block()
+        if not eb or not ab:
+            if not eb and not ab:
+                return {"ok": True, "message": "ok", "tokens": exp.consumed}
+            idx = exp.consumed
+            short = "actual output ended early" if not ab else "actual output has extra tokens"
+            return _mismatch(expected, actual, idx, eb[0] if eb else None, ab[0] if ab else None, short)
+        k = min(len(eb), len(ab))
+        if eb[:k] == ab[:k]:
+            exp.advance(k)
+            act.advance(k)
+            continue
+        for j in range(k):
+            e, a = eb[j], ab[j]
+            if e == a or (mode == "float" and _floats_close(e, a, abs_tol, rel_tol)):
+                continue
+            idx = exp.consumed + j
+            return _mismatch(expected, actual, idx, e, a, "token differs")
+        exp.advance(k)
+        act.advance(k)
+
+
+def _mismatch(
+    expected: Buffer,
+    actual: Buffer,
+    idx: int,
+    e: Optional[bytes],
+    a: Optional[bytes],
+    reason: str,
+) -> Dict[str, Any]:
+    exp_pos, act_pos = _locate(expected, idx), _locate(actual, idx)
+    show = lambda t: None if t is None else t[:64].decode("utf-8", errors="replace")
+    return {
+        "ok": False,
+        "message": f"{reason} at token {idx + 1} (expected line {exp_pos['line']}, actual line {act_pos['line']})",
+        "token": idx + 1,
+        "expected": show(e),
+        "actual": show(a),
+        "expected_line": exp_pos["line"],
+        "actual_line": act_pos["line"],
+        "expected_offset": exp_pos["offset"],
+        "actual_offset": act_pos["offset"],
+    }
+
+
+class _Mapped:
+    """빈 파일도 다룰 수 있는 읽기 전용 mmap 컨텍스트."""
+
+    def __init__(self, path: str) -> None:
+        self._f = open(path, "rb")
+        try:
+            self.buf: Buffer = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # 길이 0인 파일은 mmap할 수 없다
+            self.buf = b""
+
+    def __enter__(self) -> Buffer:
+        return self.buf
+
+    def __exit__(self, *exc: Any) -> None:
+        if isinstance(self.buf, mmap.mmap):
+            self.buf.close()
+        self._f.close()
+
+
+def compare_files(
+    expected_path: str,
+    actual_path: str,
+    mode: str = "tokens",
+    abs_tol: float = 1e-6,
+    rel_tol: float = 1e-6,
+) -> Dict[str, Any]:
+    """메모리 매핑된 두 파일을 비교한다. 파일 전체를 파이썬 문자열로 읽지 않는다."""
+    with _Mapped(expected_path) as e, _Mapped(actual_path) as a:
+        return compare_buffers(e, a, mode, abs_tol, rel_tol)
+
+
+def compare_text(
+    expected: str,
+    actual: str,
+    mode: str = "tokens",
+    abs_tol: float = 1e-6,
+    rel_tol: float = 1e-6,
+) -> Dict[str, Any]:
+    """이미 메모리에 있는 문자열 출력을 비교한다."""
+    return compare_buffers(expected.encode("utf-8"), actual.encode("utf-8"), mode, abs_tol, rel_tol)
@@ -0,0 +1,196 @@
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import sqlite3
+import threading
+
+
+DEFAULT_INDEX_PATH = "problems/.index/corpus.sqlite"
+
+NUM_PERM = 128
+BANDS = 32  # 32 bands x 4 rows: 유사도 약 0.42 이상이면 후보로 잡힌다
+ROWS = NUM_PERM // BANDS
+SHINGLE = 3
+
+_MERSENNE = (1 << 61) - 1
+_rng = random.Random(0x5EED)
+# 고정 시드의 해시 계수: 인덱스를 만든 프로세스와 조회하는 프로세스가 같은 값을 써야 한다.
+_PERMS = [(_rng.randrange(1, _MERSENNE), _rng.randrange(0, _MERSENNE)) for _ in range(NUM_PERM)]
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def statement_text(statement: Dict[str, Any]) -> str:
+    """중복 판정에 쓰는 지문 텍스트. 예제 입출력처럼 숫자만 있는 부분은 뺀다."""
+    return "\n".join(str(statement.get(k, "")) for k in ("abstract", "body", "input_spec", "output_spec"))
+
+
+def shingles(text: str, k: int = SHINGLE) -> set[bytes]:
+    words = [w for w in _WORD_RE.findall(text.lower()) if not w.isdigit()]
+    if len(words) < k:
+        return {" ".join(words).encode("utf-8")} if words else set()
+    return {" ".join(words[i : i + k]).encode("utf-8") for i in range(len(words) - k + 1)}
+
+
+def minhash(items: Iterable[bytes]) -> List[int]:
+    hashes = [int.from_bytes(hashlib.blake2b(s, digest_size=8).digest(), "little") for s in items]
+    if not hashes:
+        return [_MERSENNE] * NUM_PERM
+    return [min((a * h + b) % _MERSENNE for h in hashes) for a, b in _PERMS]
+
+
+def _band_keys(sig: Sequence[int]) -> List[int]:
+    keys = []
+    for band in range(BANDS):
+        chunk = sig[band * ROWS : (band + 1) * ROWS]
+        digest = hashlib.blake2b(array("Q", chunk).tobytes(), digest_size=8).digest()
+        # SQLite INTEGER는 부호 있는 64비트
+        keys.append(int.from_bytes(digest, "little", signed=True))
+    return keys
+
+
+def _norm_tags(tags: Iterable[str]) -> List[str]:
+    return sorted({t.strip().lower() for t in tags if isinstance(t, str) and t.strip()})
+
+
+class CorpusIndex:
+    """생성된 문제들의 MinHash/LSH 인덱스 (SQLite).
+
+    - 밴드 버킷에 인덱스를 걸어 두므로 수만 개의 문제가 있어도 후보 조회가 빠르다.
+    - 최종 점수는 지문 MinHash 유사도와 알고리즘 태그 Jaccard의 가중합이다.
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        # WAL: 여러 파이프라인 프로세스가 동시에 조회/갱신해도 서로 막지 않는다.
+        self._db.execute("PRAGMA journal_mode=WAL")
+        with self._db:
+            self._db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS problems (
+                    id TEXT PRIMARY KEY,
+                    abstract TEXT,
+                    tags TEXT,
+                    signature BLOB
+                );
+                CREATE TABLE IF NOT EXISTS bands (
+                    band INTEGER,
+                    bucket INTEGER,
+                    problem_id TEXT
+                );
+                CREATE INDEX IF NOT EXISTS bands_lookup ON bands (band, bucket);
+                CREATE INDEX IF NOT EXISTS bands_problem ON bands (problem_id);
+                """
+            )
+
+    def upsert(self, problem_id: str, statement: Dict[str, Any], tags: Iterable[str]) -> None:
+        sig = minhash(shingles(statement_text(statement)))
+        pid = str(problem_id)
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM bands WHERE problem_id = ?", (pid,))
+            self._db.execute(
+                "INSERT OR REPLACE INTO problems (id, abstract, tags, signature) VALUES (?, ?, ?, ?)",
+                (pid, str(statement.get("abstract", "")), json.dumps(_norm_tags(tags)), array("Q", sig).tobytes()),
+            )
+            self._db.executemany(
+                "INSERT INTO bands (band, bucket, problem_id) VALUES (?, ?, ?)",
+                [(band, key, pid) for band, key in enumerate(_band_keys(sig))],
+            )
+
+    def remove(self, problem_id: str) -> None:
+        pid = str(problem_id)
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM bands WHERE problem_id = ?", (pid,))
+            self._db.execute("DELETE FROM problems WHERE id = ?", (pid,))
+
+    def query(
+        self,
+        statement: Dict[str, Any],
+        tags: Iterable[str] = (),
+        threshold: float = 0.6,
+        limit: int = 5,
+        exclude: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        sig = minhash(shingles(statement_text(statement)))
+        keys = _band_keys(sig)
+        tag_set = set(_norm_tags(tags))
+        clause = " OR ".join(["(band = ? AND bucket = ?)"] * BANDS)
+        params: List[Any] = [x for band, key in enumerate(keys) for x in (band, key)]
+        with self._lock:
+            candidates = [row[0] for row in self._db.execute(
+                f"SELECT DISTINCT problem_id FROM bands WHERE {clause}", params
+            )]
+            if exclude is not None:
+                candidates = [c for c in candidates if c != str(exclude)]
+            rows = []
+            for i in range(0, len(candidates), 500):
+                part = candidates[i : i + 500]
+                rows.extend(self._db.execute(
+                    f"SELECT id, abstract, tags, signature FROM problems WHERE id IN ({','.join('?' * len(part))})",
+                    part,
+                ))
+        hits = []
+        for pid, abstract, tags_json, blob in rows:
+            other = array("Q")
+            other.frombytes(blob)
+            text_sim = sum(1 for x, y in zip(sig, other) if x == y) / NUM_PERM
+            other_tags = set(json.loads(tags_json or "[]"))
+            if tag_set and other_tags:
+                tag_sim = len(tag_set & other_tags) / len(tag_set | other_tags)
+                score = 0.8 * text_sim + 0.2 * tag_sim
+            else:
+                tag_sim = None
+                score = text_sim
+            if score >= threshold:
+                hits.append(
+                    {"problem_id": pid, "score": round(score, 3), "text_similarity": round(text_sim, 3),
+                     "tag_similarity": tag_sim, "abstract": abstract}
+                )
+        hits.sort(key=lambda h: h["score"], reverse=True)
+        return hits[:limit]
+
+    def close(self) -> None:
+        self._db.close()
+
+
+_DEFAULT: Optional[CorpusIndex] = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def _default_index() -> CorpusIndex:
+    global _DEFAULT
+    with _DEFAULT_LOCK:
+        if _DEFAULT is None:
+            _DEFAULT = CorpusIndex(os.getenv("PSGEN_CORPUS_INDEX", DEFAULT_INDEX_PATH))
+    return _DEFAULT
+
+
+def find_similar(
+    statement: Dict[str, Any],
+    tags: List[str],
+    exclude: Optional[str] = None,
+    threshold: float = 0.6,
+) -> List[Dict[str, Any]]:
+    """Toolbelt용: 기본 인덱스에서 근접 중복 문제를 찾는다."""
+    return _default_index().query(statement, tags, threshold=threshold, exclude=exclude)
+
+
+def index_problem(problem_id: str, statement: Dict[str, Any], tags: List[str]) -> None:
+    """Toolbelt용: 기본 인덱스에 문제를 추가하거나 갱신한다."""
+    logging.info("Indexing problem %s for duplicate detection...", problem_id)
+    _default_index().upsert(problem_id, statement, tags)
+
+
+def unindex_problem(problem_id: str) -> None:
+    """Toolbelt용: 기본 인덱스에서 문제를 지운다 (저장되지 못한 문제)."""
+    logging.info("Removing problem %s from the duplicate index...", problem_id)
+    _default_index().remove(problem_id)
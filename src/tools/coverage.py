@@ -0,0 +1,93 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+
+
+def _build_instrumented(source_path: str, work: str, std: str) -> Optional[str]:
+    """gcov 계측 바이너리를 만든다. 오브젝트를 따로 만들어 .gcno 이름을 고정한다."""
+    obj = os.path.join(work, "solve.o")
+    binary = os.path.join(work, "solve_cov")
+    for cmd in (
+        ["g++", "-c", "-O0", "--coverage", f"-std={std}", "-o", obj, source_path],
+        ["g++", "--coverage", "-o", binary, obj],
+    ):
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+        if proc.returncode != 0:
+            logging.warning("Coverage build failed: %s", proc.stderr[-1024:])
+            return None
+    return binary
+
+
+def _branches(work: str, run_dir: str, source_path: str) -> List[str]:
+    # GCOV_PREFIX 아래에 절대 경로 그대로 .gcda가 생기므로 .gcno를 옆에 복사해 gcov에 넘긴다.
+    obj_dir = run_dir + work
+    shutil.copy(os.path.join(work, "solve.gcno"), obj_dir)
+    proc = subprocess.run(
+        ["gcov", "--json-format", "--stdout", "--branch-probabilities", "--object-directory", obj_dir, "solve.o"],
+        cwd=work,
+        capture_output=True,
+        text=True,
+    )
+    covered: List[str] = []
+    name = os.path.basename(source_path)
+    for line in proc.stdout.splitlines():
+        if not line.startswith("{"):
+            continue
+        for f in json.loads(line).get("files", []):
+            if os.path.basename(f.get("file", "")) != name:
+                continue  # 시스템 헤더 등은 제외
+            for ln in f.get("lines", []):
+                branches = ln.get("branches", [])
+                for k, br in enumerate(branches):
+                    if br.get("count", 0) > 0:
+                        covered.append(f"{ln['line_number']}:{k}")
+                if not branches and ln.get("count", 0) > 0:
+                    covered.append(f"{ln['line_number']}")
+    return covered
+
+
+def case_coverage(
+    source_path: str,
+    input_paths: List[str],
+    std: str = "c++17",
+    workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> List[Optional[List[str]]]:
+    """각 입력 케이스가 C++ 솔루션에서 실행한 분기(branch) 목록을 돌려준다.
+
+    - 케이스마다 GCOV_PREFIX로 .gcda 출력 위치를 분리하므로 병렬 실행이 가능하다.
+    - 계측 빌드 실패 시 모든 케이스에 대해 None, 실행이 시간 초과/비정상 종료된 케이스는 None.
+    """
+    logging.info("Collecting branch coverage for %d case(s)...", len(input_paths))
+    work = tempfile.mkdtemp(prefix="psgen-cov-")
+    try:
+        binary = _build_instrumented(os.path.abspath(source_path), work, std)
+        if binary is None:
+            return [None] * len(input_paths)
+
+        def run(job: int) -> Optional[List[str]]:
+            run_dir = os.path.join(work, f"run_{job}")
+            os.makedirs(run_dir)
+            env: Dict[str, str] = {**os.environ, "GCOV_PREFIX": run_dir, "GCOV_PREFIX_STRIP": "0"}
+            with open(input_paths[job], "rb") as stdin:
+                try:
+                    proc = subprocess.run(
+                        [binary], stdin=stdin, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                        env=env, timeout=timeout,
+                    )
+                except subprocess.TimeoutExpired:
+                    return None
+            if proc.returncode != 0:
+                return None
+            return _branches(work, run_dir, source_path)
+
+        n = max(1, workers or os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=n) as pool:
+            return list(pool.map(run, range(len(input_paths))))
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
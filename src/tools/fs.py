@@ -1,4 +1,5 @@
 import os
+import shutil
 from typing import List
 
 
@@ -42,4 +43,9 @@ def list_dir(prefix: str) -> List[str]:
 def ensure_dir(path: str) -> None:
     """디렉터리가 없으면 생성한다."""
     if path:
-        os.makedirs(path, exist_ok=True)
\ No newline at end of file
+        os.makedirs(path, exist_ok=True)
+
+
+def remove_tree(path: str) -> None:
+    """디렉터리를 통째로 지운다. 없으면 아무 것도 하지 않는다."""
+    shutil.rmtree(path, ignore_errors=True)
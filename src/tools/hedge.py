@@ -0,0 +1,184 @@
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, List, Optional
+import json
+import logging
+import os
+import threading
+import time
+
+
+# 단계별 최근 LLM 지연 시간.
+# 한 번의 실행에서는 단계마다 호출이 한두 번뿐이므로 파일에 누적해 다음 실행에서도 쓴다.
+DEFAULT_LATENCY_PATH = os.path.join("problems", ".stats", "llm_latency.json")
+_WINDOW = 50
+
+
+class LatencyTracker:
+    """단계별 최근 지연 시간(초)을 보관하고 백분위수를 계산한다."""
+
+    def __init__(self, path: Optional[str] = None, window: int = _WINDOW) -> None:
+        self.path = path
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=self.window))
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    for step, values in json.load(f).items():
+                        self._samples[step].extend(float(v) for v in values)
+            except (OSError, ValueError) as e:
+                logging.warning("Ignoring unreadable latency history %s: %s", path, e)
+
+    def add(self, step: str, seconds: float) -> None:
+        with self._lock:
+            self._samples[step].append(seconds)
+
+    def percentile(self, step: str, pct: float, min_samples: int) -> Optional[float]:
+        with self._lock:
+            values = sorted(self._samples.get(step, ()))
+        if len(values) < max(1, min_samples):
+            return None
+        # nearest-rank
+        rank = min(len(values) - 1, max(0, int(round(pct / 100.0 * len(values))) - 1))
+        return values[rank]
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            data = {step: list(values) for step, values in self._samples.items()}
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+
+_TRACKER: Optional[LatencyTracker] = None
+_TRACKER_LOCK = threading.Lock()
+_POOL = ThreadPoolExecutor(max_workers=32, thread_name_prefix="llm-hedge")
+_METRICS_LOCK = threading.Lock()
+_METRICS: Dict[str, float] = {
+    "calls": 0,
+    "hedged": 0,
+    "hedge_wins": 0,
+    "deadline_exceeded": 0,
+    "invalid_responses": 0,
+    "wasted_tokens": 0.0,
+}
+
+
+def tracker() -> LatencyTracker:
+    """프로세스 공유 트래커. PSGEN_LATENCY_FILE로 저장 위치를 바꿀 수 있다 (빈 값이면 저장하지 않음)."""
+    global _TRACKER
+    with _TRACKER_LOCK:
+        if _TRACKER is None:
+            _TRACKER = LatencyTracker(os.getenv("PSGEN_LATENCY_FILE", DEFAULT_LATENCY_PATH) or None)
+        return _TRACKER
+
+
+def _count(key: str, value: float = 1) -> None:
+    with _METRICS_LOCK:
+        _METRICS[key] += value
+
+
+def metrics() -> Dict[str, float]:
+    with _METRICS_LOCK:
+        return dict(_METRICS)
+
+
+def _estimate_tokens(*texts: Any) -> float:
+    return sum(len(t if isinstance(t, str) else json.dumps(t, default=str)) for t in texts if t) / 4
+
+
+def hedged_call(
+    primary: Callable[[str, Optional[str]], Any],
+    prompt: str,
+    system: Optional[str],
+    parse: Callable[[Any], Any],
+    step: str,
+    deadline: Optional[float] = None,
+    hedge_percentile: Optional[float] = None,
+    min_samples: int = 5,
+    fallback: Optional[Callable[[str, Optional[str]], Any]] = None,
+) -> Any:
+    """primary(prompt, system)를 호출하고 parse(응답)의 결과를 돌려준다.
+
+    - deadline(초) 안에 유효한 응답이 없으면 TimeoutError.
+    - hedge_percentile이 주어지고 이 단계의 지연 기록이 min_samples 이상이면, 그 백분위수
+      시간까지 응답이 없을 때 같은 요청을 한 번 더 보낸다 (fallback이 있으면 fallback으로).
+    - parse가 성공한 첫 응답이 이긴다. 진 요청은 시작 전이면 취소하고, 이미 실행 중이면
+      결과를 버린다 (스레드는 강제로 멈출 수 없으므로 끝나면 사용 토큰을 낭비로 집계한다).
+    """
+    _count("calls")
+    track = tracker()
+    hedge_after = track.percentile(step, hedge_percentile, min_samples) if hedge_percentile else None
+    if deadline is None and hedge_after is None:
+        # 헤징/마감이 없으면 스레드 없이 그대로 호출한다 (bulk의 PendingBatch도 그대로 전파된다).
+        start = time.monotonic()
+        raw = primary(prompt, system)
+        track.add(step, time.monotonic() - start)
+        return parse(raw)
+
+    start = time.monotonic()
+    end = start + deadline if deadline is not None else None
+    started: Dict[Future, float] = {}
+    hedges: List[Future] = []
+
+    def submit(fn: Callable[[str, Optional[str]], Any]) -> Future:
+        fut = _POOL.submit(fn, prompt, system)
+        started[fut] = time.monotonic()
+        return fut
+
+    pending = {submit(primary)}
+    last_error: Optional[BaseException] = None
+    while pending:
+        now = time.monotonic()
+        timeouts = []
+        if end is not None:
+            timeouts.append(end - now)
+        if hedge_after is not None and not hedges:
+            timeouts.append(start + hedge_after - now)
+        timeout = max(0.0, min(timeouts)) if timeouts else None
+        done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        for fut in done:
+            try:
+                raw = fut.result()
+                result = parse(raw)
+            except Exception as e:
+                _count("invalid_responses")
+                last_error = e
+                continue
+            track.add(step, time.monotonic() - started[fut])
+            if fut in hedges:
+                _count("hedge_wins")
+            _abandon(pending, prompt, system)
+            return result
+        now = time.monotonic()
+        if end is not None and now >= end:
+            _count("deadline_exceeded")
+            _abandon(pending, prompt, system)
+            raise TimeoutError(f"LLM call in step '{step}' exceeded its {deadline:g}s deadline")
+        # 느린 호출이거나, 헤지 전에 돌아온 응답이 유효하지 않았다면 한 번 더 보낸다.
+        if hedge_after is not None and not hedges and (not pending or now >= start + hedge_after):
+            logging.info("Hedging LLM call in step %s after %.1fs", step, now - start)
+            _count("hedged")
+            hedge = submit(fallback or primary)
+            hedges.append(hedge)
+            pending.add(hedge)
+    raise last_error or RuntimeError(f"LLM call in step '{step}' returned no response")
+
+
+def _abandon(futures: Any, prompt: str, system: Optional[str]) -> None:
+    for fut in futures:
+        if fut.cancel():
+            continue
+
+        def _waste(f: Future) -> None:
+            if f.cancelled():
+                return
+            response = f.result() if f.exception() is None else None
+            _count("wasted_tokens", _estimate_tokens(prompt, system, response))
+
+        fut.add_done_callback(_waste)
@@ -6,6 +6,8 @@ from typing import Optional
 from google import genai
 from google.genai import types
 
+from tools.ratelimit import limiter
+
 
 def gemini_image(model: str, prompt: str, aspect_ratio: str = "16:9") -> bytes:
     """Google Gemini(nano banana pro)로 이미지를 생성해 PNG 바이트로 반환한다.
@@ -45,26 +47,23 @@ def gemini_image(model: str, prompt: str, aspect_ratio: str = "16:9") -> bytes:
         # 사용자가 실제 Gemini 모델명을 넘겼다면 우선 사용
         model_name = model
 
-    try:
-        response = client.models.generate_content(
-            model=model_name,
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                response_modalities=["Image"],
-                image_config=types.ImageConfig(
-                    aspect_ratio=aspect_ratio,
-                ),
+    # 호출은 공유 리미터(RPM, 백오프, 회로 차단기)를 거친다. 재시도가 모두 실패하면 예외를 그대로 올려
+    # 깨진 이미지가 조용히 저장되지 않게 한다.
+    response = limiter("gemini").call(
+        client.models.generate_content,
+        model=model_name,
+        contents=prompt,
+        config=types.GenerateContentConfig(
+            response_modalities=["Image"],
+            image_config=types.ImageConfig(
+                aspect_ratio=aspect_ratio,
             ),
-        )
+        ),
+    )
 
-        # 3) 첫 번째 이미지 파트를 찾아 PNG bytes로 직렬화
-        for part in response.parts:
-            if image := part.as_image():
-                return image.image_bytes
+    # 3) 첫 번째 이미지 파트를 찾아 PNG bytes로 직렬화
+    for part in response.parts or []:
+        if image := part.as_image():
+            return image.image_bytes
 
-        logging.warning("No image part found in Gemini response; returning PNG header fallback.")
-        return b"\x89PNG\r\n\x1a\n"
-    except Exception as e:  # pragma: no cover - 방어적 코드
-        logging.exception("Gemini image generation failed: %s", e)
-        # 파이프라인이 죽지 않도록 최소 PNG 헤더 반환
-        return b"\x89PNG\r\n\x1a\n"
\ No newline at end of file
+    raise RuntimeError("No image part found in Gemini response")
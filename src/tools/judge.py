@@ -0,0 +1,293 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+import json
+import logging
+import os
+import queue
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+
+# 영속 저지 워커에서 실행되는 드라이버.
+# judge.py를 한 번만 임포트한 뒤 stdin으로 들어오는 JSON 요청을 한 줄씩 처리한다.
+# 저지 코드의 print가 프로토콜 채널을 오염시키지 않도록 sys.stdout은 stderr로 돌려 둔다.
+_WORKER_SOURCE = r'''
+import importlib.util, json, os, queue, signal, subprocess, sys, threading, time, traceback
+
+proto = os.fdopen(os.dup(1), "w", buffering=1, encoding="utf-8")
+sys.stdout = sys.stderr
+spec = importlib.util.spec_from_file_location("judge", sys.argv[1])
+judge = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(judge)
+
+
+def _read(path):
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def _verdict(ret):
+    if isinstance(ret, tuple):
+        return bool(ret[0]), str(ret[1]) if len(ret) > 1 else ""
+    return bool(ret), ""
+
+
+class Timeout(Exception):
+    pass
+
+
+def _interact(req):
+    proc = subprocess.Popen(req["command"], shell=True, executable="/bin/bash", stdin=subprocess.PIPE,
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, bufsize=1,
+                            start_new_session=True)
+    lines = queue.Queue()
+    threading.Thread(target=lambda: ([lines.put(l) for l in proc.stdout], lines.put(None)), daemon=True).start()
+    deadline = time.monotonic() + req["timeout"]
+
+    def read_line():
+        try:
+            line = lines.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            raise Timeout()
+        if line is None:
+            raise EOFError("contestant closed output")
+        return line.rstrip("\n")
+
+    def write_line(s):
+        try:
+            proc.stdin.write(f"{s}\n")
+            proc.stdin.flush()
+        except (BrokenPipeError, OSError):
+            pass
+
+    start = time.monotonic()
+    try:
+        ok, msg = _verdict(judge.interact(_read(req["input_path"]), read_line, write_line))
+        verdict = "AC" if ok else "WA"
+    except Timeout:
+        verdict, msg = "TLE", "no response before the time limit"
+    except EOFError as e:
+        verdict, msg = "WA", str(e)
+    finally:
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            proc.wait(timeout=max(0.05, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            os.killpg(proc.pid, signal.SIGKILL)
+            proc.wait()
+            if verdict == "AC":
+                verdict, msg = "TLE", "did not exit before the time limit"
+    if verdict == "AC" and proc.returncode != 0:
+        verdict, msg = "RE", f"exit code {proc.returncode}"
+    return {"verdict": verdict, "message": msg, "elapsed": time.monotonic() - start}
+
+
+for raw in sys.stdin:
+    req = json.loads(raw)
+    try:
+        if req["mode"] == "checker":
+            ok, msg = _verdict(judge.check(_read(req["input_path"]), _read(req["expected_path"]),
+                                           _read(req["output_path"])))
+            res = {"verdict": "AC" if ok else "WA", "message": msg}
+        else:
+            res = _interact(req)
+    except Exception:
+        res = {"verdict": "JE", "message": traceback.format_exc(limit=3)}
+    proto.write(json.dumps(res) + "\n")
+'''
+
+
+class _Worker:
+    """judge.py를 한 번 임포트해 두고 여러 케이스를 처리하는 서브프로세스."""
+
+    def __init__(self, judge_path: str) -> None:
+        self.proc = subprocess.Popen(
+            [sys.executable, "-c", _WORKER_SOURCE, judge_path],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+        )
+
+    def request(self, req: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        assert self.proc.stdin and self.proc.stdout
+        self.proc.stdin.write(json.dumps(req) + "\n")
+        self.proc.stdin.flush()
+        # 저지 자체가 멈추는 경우를 대비해 응답 대기에도 상한을 둔다.
+        result: List[str] = []
+        reader = threading.Thread(target=lambda: result.append(self.proc.stdout.readline()), daemon=True)
+        reader.start()
+        reader.join(timeout)
+        if not result or not result[0]:
+            raise RuntimeError("judge worker did not answer")
+        return json.loads(result[0])
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def close(self) -> None:
+        if self.alive():
+            self.proc.kill()
+        self.proc.wait()
+
+
+# judge.py를 워커와 같은 방식으로 임포트해 함수가 callable인지 확인한다.
+_PROBE_SOURCE = r'''
+import importlib.util, sys
+sys.stdout = sys.stderr
+spec = importlib.util.spec_from_file_location("judge", sys.argv[1])
+judge = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(judge)
+sys.exit(0 if callable(getattr(judge, sys.argv[2], None)) else 1)
+'''
+
+
+def _has_function(judge_path: str, name: str, timeout: float = 10.0) -> bool:
+    # 소스 문자열 검색은 주석/문자열/다른 이름(def check_all()) 등에 속으므로 실제로 임포트해 본다.
+    # 최상위 코드가 stdin을 읽거나 죽을 수 있으니 별도 프로세스에서 확인하고, 실패하면 스크립트 모드로 둔다.
+    if not os.path.isfile(judge_path):
+        return False
+    try:
+        proc = subprocess.run([sys.executable, "-c", _PROBE_SOURCE, judge_path, name], stdin=subprocess.DEVNULL,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=timeout)
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return proc.returncode == 0
+
+
+class JudgeHarness:
+    """스페셜 저지(checker) / 인터랙티브 저지 실행기.
+
+    - judge.py가 check()/interact() 함수를 정의하면 영속 워커 풀에서 처리한다.
+    - 그렇지 않으면 케이스마다 스크립트를 실행하는 방식으로 되돌아간다:
+      - checker: `python3 judge.py input expected output`, 종료 코드 0이면 AC
+      - interactive: `python3 judge.py input`의 stdin/stdout을 솔루션과 교차 연결
+    """
+
+    def __init__(self, judge_path: str, mode: str, workers: Optional[int] = None) -> None:
+        if mode not in ("checker", "interactive"):
+            raise ValueError(f"unknown judge mode: {mode}")
+        self.judge_path = judge_path
+        self.mode = mode
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.persistent = _has_function(judge_path, "check" if mode == "checker" else "interact")
+        self._pool: "queue.Queue[_Worker]" = queue.Queue()
+        self._started = 0
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> _Worker:
+        with self._lock:
+            if self._pool.empty() and self._started < self.workers:
+                self._started += 1
+                return _Worker(self.judge_path)
+        return self._pool.get()
+
+    def _release(self, worker: _Worker) -> None:
+        if worker.alive():
+            self._pool.put(worker)
+        else:
+            # 죽은 워커는 버리고 다음 요청 때 새로 띄운다.
+            with self._lock:
+                self._started -= 1
+
+    def _run_persistent(self, case: Dict[str, Any]) -> Dict[str, Any]:
+        worker = self._acquire()
+        try:
+            req = {"mode": self.mode, **case}
+            return worker.request(req, timeout=case.get("timeout", 10.0) + 10.0)
+        except Exception as e:
+            worker.close()
+            return {"verdict": "JE", "message": str(e)}
+        finally:
+            self._release(worker)
+
+    def _run_script_checker(self, case: Dict[str, Any]) -> Dict[str, Any]:
+        proc = subprocess.run(
+            [sys.executable, self.judge_path, case["input_path"], case["expected_path"], case["output_path"]],
+            capture_output=True,
+            text=True,
+            timeout=case.get("timeout", 10.0) + 10.0,
+        )
+        return {"verdict": "AC" if proc.returncode == 0 else "WA", "message": (proc.stdout + proc.stderr)[-1024:]}
+
+    def _run_script_interactive(self, case: Dict[str, Any]) -> Dict[str, Any]:
+        # solution.stdout -> judge.stdin, judge.stdout -> solution.stdin
+        sol_r, judge_w = os.pipe()
+        judge_r, sol_w = os.pipe()
+        start = time.monotonic()
+        sol = subprocess.Popen(case["command"], shell=True, executable="/bin/bash", stdin=sol_r, stdout=sol_w,
+                               stderr=subprocess.DEVNULL, start_new_session=True)
+        jdg = subprocess.Popen([sys.executable, self.judge_path, case["input_path"]], stdin=judge_r,
+                               stdout=judge_w, stderr=subprocess.PIPE, start_new_session=True)
+        for fd in (sol_r, judge_w, judge_r, sol_w):
+            os.close(fd)
+        timeout = case.get("timeout", 10.0)
+        verdict = "AC"
+        try:
+            sol.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            verdict = "TLE"
+            os.killpg(sol.pid, signal.SIGKILL)
+            sol.wait()
+        try:
+            _, err = jdg.communicate(timeout=max(1.0, timeout - (time.monotonic() - start)))
+        except subprocess.TimeoutExpired:
+            os.killpg(jdg.pid, signal.SIGKILL)
+            _, err = jdg.communicate()
+            return {"verdict": "JE", "message": "judge did not finish", "elapsed": time.monotonic() - start}
+        if verdict == "AC" and jdg.returncode != 0:
+            verdict = "WA"
+        if verdict == "AC" and sol.returncode != 0:
+            verdict = "RE"
+        return {"verdict": verdict, "message": err.decode("utf-8", errors="replace")[-1024:],
+                "elapsed": time.monotonic() - start}
+
+    def judge_case(self, case: Dict[str, Any]) -> Dict[str, Any]:
+        if self.persistent:
+            return self._run_persistent(case)
+        try:
+            if self.mode == "checker":
+                return self._run_script_checker(case)
+            return self._run_script_interactive(case)
+        except Exception as e:  # 저지 스크립트 자체의 실패는 JE로 보고한다.
+            return {"verdict": "JE", "message": str(e)}
+
+    def run(self, cases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if len(cases) <= 1 or self.workers == 1:
+            return [self.judge_case(c) for c in cases]
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(self.judge_case, cases))
+
+    def close(self) -> None:
+        while not self._pool.empty():
+            self._pool.get().close()
+        self._started = 0
+
+
+def run_judge(
+    judge_path: str,
+    mode: str,
+    cases: List[Dict[str, Any]],
+    workers: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Toolbelt용 저지 실행 함수.
+
+    - checker 케이스: {input_path, expected_path, output_path}
+    - interactive 케이스: {input_path, command, timeout}
+    결과는 케이스 순서대로 {verdict: AC|WA|TLE|RE|JE, message, ...}.
+    """
+    logging.info("Running %s judge on %d case(s)...", mode, len(cases))
+    # 워커는 이 호출의 케이스들끼리만 공유한다. step_judge 외에는 호출하는 곳이 없으므로
+    # 끝나면 바로 닫는다 (bulk 실행에서 문제마다 워커가 쌓이지 않도록).
+    harness = JudgeHarness(judge_path, mode, workers)
+    try:
+        return harness.run(cases)
+    finally:
+        harness.close()
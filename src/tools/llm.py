@@ -1,27 +1,44 @@
-from typing import Any
+from functools import lru_cache
+from typing import Any, Optional
 import logging
 
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
 
+from tools.ratelimit import limiter
 
-def real_llm(prompt: str, system: str | None = None) -> Any:
+# 응답 길이 추정치: TPM 버킷에 미리 예약하고, 실제 사용량이 오면 차액을 정산한다.
+_EXPECTED_OUTPUT_TOKENS = 2000
+
+
+@lru_cache(maxsize=None)
+def _client(model: str, temperature: float) -> ChatOpenAI:
+    # 재시도는 공유 리미터가 담당하므로 SDK 자체 재시도는 끈다.
+    return ChatOpenAI(model=model, temperature=temperature, max_retries=0)
+
+
+def _usage_tokens(response: Any) -> Optional[float]:
+    usage = getattr(response, "usage_metadata", None) or {}
+    total = usage.get("total_tokens") if isinstance(usage, dict) else None
+    return float(total) if total is not None else None
+
+
+def real_llm(prompt: str, system: str | None = None, model: str = "gpt-5.1") -> Any:
     """LLM 호출 래퍼.
 
-    - LangChain ChatOpenAI를 사용해 gpt-5.1 모델을 호출한다.
+    - LangChain ChatOpenAI를 사용해 model(기본 gpt-5.1)을 호출한다.
     - system 프롬프트가 있으면 SystemMessage로 선행한다.
+    - 호출은 프로세스 공유 리미터(RPM/TPM, 백오프, 회로 차단기)를 거친다.
     """
     logging.info("Starting LLM step...")
-    llm = ChatOpenAI(
-        model="gpt-5.1",
-        temperature=0.2,
-    )
+    llm = _client(model, 0.2)
 
     messages = []
     if system:
         messages.append(SystemMessage(content=system))
     messages.append(HumanMessage(content=prompt))
 
-    response = llm.invoke(messages)
+    estimate = (len(prompt) + len(system or "")) / 4 + _EXPECTED_OUTPUT_TOKENS
+    response = limiter("openai").call(llm.invoke, messages, tokens=estimate, usage=_usage_tokens)
     logging.info("LLM step completed")
-    return response.content
\ No newline at end of file
+    return response.content
@@ -0,0 +1,94 @@
+from dataclasses import dataclass, field
+from importlib import import_module
+from typing import Any, Callable, Dict, List, Tuple
+import os
+import threading
+
+
+@dataclass(frozen=True)
+class ProviderSpec:
+    """프로바이더 하나에 대한 등록 정보.
+
+    - target: "module:attr" 형태의 임포트 경로. 실제 임포트는 첫 호출 시점까지 미룬다.
+    - env: 이 프로바이더가 동작하려면 필요한 환경 변수 이름들.
+    """
+
+    target: str
+    env: Tuple[str, ...] = field(default_factory=tuple)
+
+
+# kind -> name -> spec
+# SDK(langchain_openai, google.genai 등)는 여기서 문자열로만 참조되므로
+# 레지스트리를 임포트해도 무거운 의존성이 로드되지 않는다.
+_REGISTRY: Dict[str, Dict[str, ProviderSpec]] = {
+    "llm": {
+        "openai": ProviderSpec("tools.llm:real_llm", env=("OPENAI_API_KEY",)),
+    },
+    "image": {
+        "gemini": ProviderSpec("tools.image:gemini_image", env=("GEMINI_API_KEY",)),
+    },
+    "batch": {
+        "openai": ProviderSpec("tools.batch:openai_endpoint", env=("OPENAI_API_KEY",)),
+    },
+    "shell": {
+        "noop": ProviderSpec("tools.shell:noop_shell"),
+        "local": ProviderSpec("tools.shell:local_shell"),
+    },
+}
+
+_LOADED: Dict[Tuple[str, str], Callable[..., Any]] = {}
+_LOCK = threading.Lock()
+
+
+def register(kind: str, name: str, target: str, env: Tuple[str, ...] = ()) -> None:
+    """새 프로바이더를 등록한다. 같은 이름이 있으면 덮어쓴다."""
+    _REGISTRY.setdefault(kind, {})[name] = ProviderSpec(target, tuple(env))
+    _LOADED.pop((kind, name), None)
+
+
+def available(kind: str) -> List[str]:
+    """kind에 등록된 프로바이더 이름 목록."""
+    return sorted(_REGISTRY.get(kind, {}))
+
+
+def spec(kind: str, name: str) -> ProviderSpec:
+    try:
+        return _REGISTRY[kind][name]
+    except KeyError:
+        raise KeyError(
+            f"unknown {kind} provider '{name}' (available: {', '.join(available(kind)) or 'none'})"
+        ) from None
+
+
+def missing_env(kind: str, name: str) -> List[str]:
+    """프로바이더에 필요한 환경 변수 중 비어 있는 것들을 돌려준다."""
+    return [key for key in spec(kind, name).env if not os.getenv(key)]
+
+
+def resolve(kind: str, name: str) -> Callable[..., Any]:
+    """프로바이더를 즉시 임포트해 실제 callable을 돌려준다 (결과는 캐시된다)."""
+    key = (kind, name)
+    fn = _LOADED.get(key)
+    if fn is not None:
+        return fn
+    with _LOCK:
+        fn = _LOADED.get(key)
+        if fn is None:
+            module_name, _, attr = spec(kind, name).target.partition(":")
+            fn = getattr(import_module(module_name), attr)
+            _LOADED[key] = fn
+    return fn
+
+
+def lazy(kind: str, name: str) -> Callable[..., Any]:
+    """첫 호출 시점에 프로바이더를 임포트하는 얇은 래퍼를 돌려준다.
+
+    이름 검증은 즉시 수행하므로 잘못된 프로바이더 이름은 시작 시점에 드러난다.
+    """
+    spec(kind, name)
+
+    def _call(*args: Any, **kwargs: Any) -> Any:
+        return resolve(kind, name)(*args, **kwargs)
+
+    _call.__name__ = f"lazy_{kind}_{name}"
+    return _call
@@ -0,0 +1,303 @@
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional
+import logging
+import os
+import random
+import threading
+import time
+
+
+class CircuitOpenError(RuntimeError):
+    """회로 차단기가 열려 있어 호출을 보내지 않았을 때 발생한다."""
+
+
+class TokenBucket:
+    """분당 한도를 갖는 토큰 버킷. 같은 프로세스의 모든 스레드가 공유한다."""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None) -> None:
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self._level = self.capacity
+        self._stamp = time.monotonic()
+        self._cond = threading.Condition()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._level = min(self.capacity, self._level + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """amount만큼 꺼낼 수 있을 때까지 기다린다. 기다린 시간(초)을 돌려준다."""
+        # 용량보다 큰 요청은 용량만큼만 요구해 영원히 막히지 않게 한다.
+        amount = min(amount, self.capacity)
+        start = time.monotonic()
+        with self._cond:
+            while True:
+                self._refill()
+                if self._level >= amount:
+                    self._level -= amount
+                    return time.monotonic() - start
+                self._cond.wait((amount - self._level) / self.rate)
+
+    def adjust(self, delta: float) -> None:
+        """추정치와 실제 사용량의 차이를 반영한다 (양수면 환급, 음수면 추가 차감)."""
+        with self._cond:
+            self._refill()
+            self._level = min(self.capacity, self._level + delta)
+            self._cond.notify_all()
+
+
+class CircuitBreaker:
+    """연속 실패가 threshold에 도달하면 reset_after초 동안 호출을 막는다 (이후 시험 호출 1회 허용).
+
+    막힌 동안 호출자는 바로 실패하지 않고 half-open이 될 때까지 기다린다. 시험 호출이 진행 중이면
+    그 결과가 나올 때까지 기다리며, max_wait초가 지나도 통과하지 못하면 CircuitOpenError를 던진다.
+    clock/sleep은 테스트에서 가짜 시계를 주입하기 위한 것이다.
+    """
+
+    def __init__(
+        self,
+        threshold: int = 5,
+        reset_after: float = 30.0,
+        max_wait: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.max_wait = max_wait
+        self._clock = clock
+        self._sleep = sleep
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        return "half-open" if self._clock() - self._opened_at >= self.reset_after else "open"
+
+    def before_call(self) -> float:
+        """호출해도 될 때까지 기다린다. 기다린 시간(초)을 돌려준다."""
+        start = self._clock()
+        while True:
+            with self._lock:
+                now = self._clock()
+                state = self.state
+                if state == "closed":
+                    return now - start
+                if state == "half-open" and not self._probing:
+                    self._probing = True
+                    return now - start
+                # open이면 half-open까지 남은 시간, 시험 호출 중이면 잠깐씩 결과를 확인한다.
+                if state == "open":
+                    wait = self._opened_at + self.reset_after - now
+                else:
+                    wait = min(1.0, self.reset_after)
+            left = start + self.max_wait - now
+            if left <= 0:
+                raise CircuitOpenError(f"circuit open: provider is failing, gave up after {now - start:.1f}s")
+            self._sleep(max(0.0, min(wait, left)))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._failures >= self.threshold or self._opened_at is not None:
+                self._opened_at = self._clock()
+
+
+def _status_of(exc: BaseException) -> Optional[int]:
+    # openai/httpx: status_code 또는 response.status_code, google.genai: code
+    for attr in ("status_code", "code", "status"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(exc, "response", None)
+    value = getattr(response, "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    headers = getattr(getattr(exc, "response", None), "headers", None) or getattr(exc, "headers", None)
+    if not headers:
+        return None
+    raw = headers.get("retry-after") or headers.get("Retry-After")
+    if raw is None:
+        return None
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(raw).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    status = _status_of(exc)
+    if status is not None:
+        return status in (408, 409, 429) or status >= 500
+    name = type(exc).__name__.lower()
+    return any(k in name for k in ("timeout", "connection", "ratelimit", "unavailable"))
+
+
+class ProviderLimiter:
+    """프로바이더 호출 계층.
+
+    - 요청 수(RPM)와 토큰 수(TPM) 토큰 버킷으로 프로세스 전체 호출량을 제한한다.
+    - 재시도 가능한 오류는 지터가 섞인 지수 백오프로 재시도하고, Retry-After가 있으면 따른다.
+    - 연속 실패 시 회로 차단기로 호출을 잠시 멈춘다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rpm: float = 60,
+        tpm: Optional[float] = None,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
+        self.name = name
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker or CircuitBreaker()
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, float] = {
+            "calls": 0,
+            "retries": 0,
+            "failures": 0,
+            "rejected_open_circuit": 0,
+            "circuit_wait_total": 0.0,
+            "queue_wait_total": 0.0,
+            "queue_wait_max": 0.0,
+            "backoff_total": 0.0,
+        }
+
+    def _count(self, key: str, value: float = 1) -> None:
+        with self._lock:
+            self._metrics[key] += value
+
+    def _waited(self, seconds: float) -> None:
+        with self._lock:
+            self._metrics["queue_wait_total"] += seconds
+            self._metrics["queue_wait_max"] = max(self._metrics["queue_wait_max"], seconds)
+
+    def call(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        tokens: float = 0,
+        usage: Optional[Callable[[Any], Optional[float]]] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """fn(*args, **kwargs)를 한도/재시도/차단기 아래에서 호출한다.
+
+        tokens는 예상 토큰 수이며, usage(result)가 실제 사용량을 돌려주면 차액을 버킷에 반영한다.
+        """
+        attempt = 0
+        while True:
+            try:
+                self._count("circuit_wait_total", self.breaker.before_call())
+            except CircuitOpenError:
+                self._count("rejected_open_circuit")
+                raise
+            waited = self.requests.acquire(1)
+            if self.tokens is not None and tokens:
+                waited += self.tokens.acquire(tokens)
+            self._waited(waited)
+            self._count("calls")
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                retryable = is_retryable(e)
+                if retryable:
+                    self.breaker.record_failure()
+                else:
+                    # 요청 자체의 오류(400 등)는 프로바이더 장애가 아니다.
+                    self.breaker.record_success()
+                if not retryable or attempt >= self.max_retries:
+                    self._count("failures")
+                    raise
+                delay = _retry_after(e)
+                if delay is None:
+                    # full jitter
+                    delay = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+                attempt += 1
+                self._count("retries")
+                self._count("backoff_total", delay)
+                logging.warning("%s call failed (%s); retry %d in %.1fs", self.name, e, attempt, delay)
+                time.sleep(delay)
+                continue
+            self.breaker.record_success()
+            if self.tokens is not None and usage is not None:
+                actual = usage(result)
+                if actual is not None:
+                    self.tokens.adjust(tokens - actual)
+            return result
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            m = dict(self._metrics)
+        m["circuit"] = self.breaker.state
+        m["queue_wait_avg"] = m["queue_wait_total"] / m["calls"] if m["calls"] else 0.0
+        return m
+
+
+_LIMITERS: Dict[str, ProviderLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+# 환경 변수가 없을 때의 기본 한도
+_DEFAULTS: Dict[str, Dict[str, float]] = {
+    "openai": {"rpm": 500, "tpm": 200_000},
+    "gemini": {"rpm": 10},
+}
+
+
+def _env_float(key: str) -> Optional[float]:
+    raw = os.getenv(key)
+    try:
+        return float(raw) if raw else None
+    except ValueError:
+        return None
+
+
+def _env_or(value: Optional[float], default: float) -> float:
+    # 0도 유효한 값이다 (차단기가 열리면 기다리지 않고 바로 실패).
+    return default if value is None else value
+
+
+def limiter(name: str) -> ProviderLimiter:
+    """프로바이더별 공유 리미터. PSGEN_{NAME}_RPM / PSGEN_{NAME}_TPM 으로 한도를,
+    PSGEN_{NAME}_CIRCUIT_WAIT 로 차단기가 열렸을 때 기다릴 최대 시간(초)을 바꿀 수 있다."""
+    with _LIMITERS_LOCK:
+        lim = _LIMITERS.get(name)
+        if lim is None:
+            defaults = _DEFAULTS.get(name, {})
+            prefix = f"PSGEN_{name.upper()}"
+            lim = ProviderLimiter(
+                name,
+                rpm=_env_float(f"{prefix}_RPM") or defaults.get("rpm", 60),
+                tpm=_env_float(f"{prefix}_TPM") or defaults.get("tpm"),
+                breaker=CircuitBreaker(max_wait=_env_or(_env_float(f"{prefix}_CIRCUIT_WAIT"), 300.0)),
+            )
+            _LIMITERS[name] = lim
+    return lim
+
+
+def all_metrics() -> Dict[str, Dict[str, Any]]:
+    with _LIMITERS_LOCK:
+        return {name: lim.metrics() for name, lim in _LIMITERS.items()}
@@ -1,5 +1,9 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 import logging
+import os
+import signal
+import subprocess
+import time
 
 
 def noop_shell(commands: List[str]) -> Dict[str, Any]:
@@ -13,4 +17,80 @@ def noop_shell(commands: List[str]) -> Dict[str, Any]:
         "returncode": 0,
         "stdout": "\n".join(commands),
         "stderr": "",
-    }
\ No newline at end of file
+    }
+
+
+def local_shell(commands: List[str]) -> Dict[str, Any]:
+    """로컬 셸 실행기.
+
+    - 명령을 순서대로 bash로 실행하고, 첫 실패에서 멈춘다.
+    - stdout/stderr는 모든 명령의 출력을 이어 붙여 돌려준다.
+    """
+    logging.info("Running shell step (%d command(s))...", len(commands))
+    stdout: List[str] = []
+    stderr: List[str] = []
+    returncode = 0
+    for cmd in commands:
+        proc = subprocess.run(cmd, shell=True, executable="/bin/bash", capture_output=True, text=True)
+        stdout.append(proc.stdout)
+        stderr.append(proc.stderr)
+        returncode = proc.returncode
+        if returncode != 0:
+            logging.warning("Command failed (%d): %s", returncode, cmd)
+            break
+    return {
+        "returncode": returncode,
+        "stdout": "".join(stdout),
+        "stderr": "".join(stderr),
+    }
+
+
+def run_program(
+    command: str,
+    input_path: Optional[str] = None,
+    output_path: Optional[str] = None,
+    timeout: Optional[float] = None,
+) -> Dict[str, Any]:
+    """단일 프로그램 실행기.
+
+    - input_path가 있으면 stdin으로, output_path가 있으면 stdout을 그 파일로 연결한다.
+    - output_path가 없을 때만 stdout을 문자열로 돌려준다 (큰 출력은 파일로 받는 것을 권장).
+    - 시간 초과 시 프로세스 그룹 전체를 종료하고 timed_out=True를 돌려준다.
+    """
+    stdin = open(input_path, "rb") if input_path else subprocess.DEVNULL
+    if output_path:
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+    stdout = open(output_path, "wb") if output_path else subprocess.PIPE
+    start = time.perf_counter()
+    timed_out = False
+    try:
+        proc = subprocess.Popen(
+            command,
+            shell=True,
+            executable="/bin/bash",
+            stdin=stdin,
+            stdout=stdout,
+            stderr=subprocess.PIPE,
+            start_new_session=True,
+        )
+        try:
+            out, err = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            timed_out = True
+            os.killpg(proc.pid, signal.SIGKILL)
+            out, err = proc.communicate()
+        elapsed = time.perf_counter() - start
+    finally:
+        if input_path:
+            stdin.close()
+        if output_path:
+            stdout.close()
+    return {
+        "returncode": proc.returncode,
+        "stdout": out.decode("utf-8", errors="replace") if out is not None else "",
+        "stderr": err.decode("utf-8", errors="replace")[-4096:],
+        "elapsed": elapsed,
+        "timed_out": timed_out,
+    }
@@ -0,0 +1,91 @@
+import json
+
+from agents import AuthoringConfig, AuthoringState, run_bulk
+from agents import bulk
+from agents.steps import step_dedupe, step_statement
+from agents.tools import Toolbelt
+
+
+def _toolbelt(**kwargs) -> Toolbelt:
+    none = lambda *a, **k: None
+    return Toolbelt(llm_chat=none, run_shell=none, write_file=none, read_file=none, list_dir=none,
+                    ensure_dir=none, generate_image=none, **kwargs)
+
+
+def _statement(abstract: str) -> str:
+    return json.dumps({"abstract": abstract, "body": "", "input_spec": "", "output_spec": "", "constraints": "",
+                       "examples": [], "image_descriptions": []})
+
+
+def _answer_all(answer):
+    def submit(requests):
+        return {r["custom_id"]: answer(r) for r in requests}
+    return submit
+
+
+def test_failed_batch_fails_only_the_waiting_jobs(monkeypatch):
+    monkeypatch.setattr(bulk, "AUTHORING_STEPS", [("statement", step_statement)])
+    calls = []
+
+    def submit(requests):
+        calls.append(len(requests))
+        raise RuntimeError("batch ended with status expired")
+
+    jobs = [(AuthoringState("a"), AuthoringConfig(problem_id=1))]
+    [result] = run_bulk(jobs, _toolbelt(), submit, batch_retries=2)
+    assert isinstance(result, RuntimeError)
+    assert "expired" in str(result)
+    assert calls == [1, 1, 1]
+
+
+def test_failed_batch_is_retried(monkeypatch):
+    monkeypatch.setattr(bulk, "AUTHORING_STEPS", [("statement", step_statement)])
+    attempts = []
+
+    def submit(requests):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("batch failed")
+        return _answer_all(lambda r: _statement("ok"))(requests)
+
+    [result] = run_bulk([(AuthoringState("a"), AuthoringConfig(problem_id=1))], _toolbelt(), submit)
+    assert isinstance(result, AuthoringState)
+    assert result.statement["abstract"] == "ok"
+
+
+def test_repeated_regeneration_gets_a_new_answer(monkeypatch):
+    monkeypatch.setattr(bulk, "AUTHORING_STEPS", [("statement", step_statement), ("dedupe", step_dedupe)])
+    answers = iter(_statement(f"draft {k}") for k in range(10))
+    seen_abstracts = []
+
+    def find_similar(statement, tags, exclude, threshold):
+        seen_abstracts.append(statement["abstract"])
+        return [{"problem_id": "9", "score": 1.0}]
+
+    cfg = AuthoringConfig(problem_id=1, duplicate_policy="regenerate", max_regenerations=3)
+    tb = _toolbelt(find_similar=find_similar)
+    [result] = run_bulk([(AuthoringState("a"), cfg)], tb, _answer_all(lambda r: next(answers)))
+    assert result.dedupe["attempts"] == 3
+    # one statement plus three distinct regenerations
+    assert seen_abstracts[-4:] == ["draft 0", "draft 1", "draft 2", "draft 3"]
+
+
+def test_failed_jobs_are_removed_from_the_index(monkeypatch):
+    def fail_second(state, cfg, tb):
+        if cfg.problem_id == 2:
+            raise RuntimeError("codegen failed")
+        return state
+
+    monkeypatch.setattr(
+        bulk, "AUTHORING_STEPS", [("statement", step_statement), ("dedupe", step_dedupe), ("codegen", fail_second)]
+    )
+    index = {}
+    tb = _toolbelt(
+        find_similar=lambda statement, tags, exclude, threshold: [],
+        index_problem=lambda pid, statement, tags: index.__setitem__(pid, statement),
+        unindex_problem=index.pop,
+    )
+    jobs = [(AuthoringState(s), AuthoringConfig(problem_id=i)) for i, s in ((1, "a"), (2, "b"))]
+    results = run_bulk(jobs, tb, _answer_all(lambda r: _statement("x")))
+    assert isinstance(results[0], AuthoringState) and isinstance(results[1], RuntimeError)
+    assert list(index) == ["1"]
@@ -0,0 +1,62 @@
+import json
+
+from agents import AuthoringConfig, AuthoringState
+from agents.steps import _case_shards, step_casegen, step_minimize
+from agents.tools import Toolbelt
+
+
+def _toolbelt(**kwargs) -> Toolbelt:
+    none = lambda *a, **k: None
+    defaults = dict(llm_chat=none, run_shell=none, write_file=none, read_file=none, list_dir=none,
+                    ensure_dir=none, generate_image=none)
+    return Toolbelt(**{**defaults, **kwargs})
+
+
+def _special(state: AuthoringState) -> bool:
+    return any(name == "special" for name, *_ in _case_shards(state))
+
+
+def test_special_shard_follows_the_input_not_the_technique():
+    state = AuthoringState("x")
+    state.requirement = {"type": "Data Structure"}
+    state.algo = {"algorithms": ["Segment Tree", "Fenwick Tree (BIT)"]}
+    state.statement = {"input_spec": "N, then N integers a_1 ... a_N, then Q queries l r."}
+    assert not _special(state)
+
+    state.statement = {"input_spec": "N, then N-1 edges u v that form a tree."}
+    assert _special(state)
+
+    state.statement = {"input_spec": "A line with the subtree sizes."}
+    state.requirement = {"type": "Graph"}
+    assert _special(state)
+
+
+def test_casegen_tags_pinned_cases_individually():
+    def llm(prompt, system=None):
+        category = json.loads(prompt.split("Context:\n", 1)[1])["category"]
+        inputs = [f"{category} {k}\n" for k in range(3)]
+        return json.dumps({"inputs": inputs, "outputs": [], "pinned": [1, 7, "x"]})
+
+    state = AuthoringState("x")
+    state.statement = {"examples": [{"input": "1\n", "output": "1\n"}]}
+    state = step_casegen(state, AuthoringConfig(), _toolbelt(llm_chat=llm))
+    tags = dict(zip(state.io.grading_inputs, state.io.grading_tags))
+    assert tags["1\n"] == ["example"]
+    assert tags["boundary 0\n"] == ["edge"]
+    assert tags["boundary 1\n"] == ["edge", "pinned"]
+    assert tags["worst_case 2\n"] == ["max"]
+
+
+def test_minimize_can_drop_cases_of_any_shard():
+    state = AuthoringState("x")
+    state.solutions = [{"language": "cpp", "source_path": "solve.cpp", "std": "c++17"}]
+    state.io.grading_inputs = ["e\n", "edge a\n", "edge b\n", "max a\n", "max b\n", "pin\n", "adv\n"]
+    state.io.grading_outputs = [""] * 7
+    state.io.grading_tags = [["example"], ["edge"], ["edge"], ["max"], ["max"], ["edge", "pinned"],
+                             ["max", "adversarial"]]
+    state.io.example_inputs = ["e\n"]
+    # every case reaches the same branches
+    coverage = lambda src, paths, std, jobs, timeout: [["b1", "b2"]] * len(paths)
+    state = step_minimize(state, AuthoringConfig(keep_largest=0), _toolbelt(collect_coverage=coverage))
+    assert state.io.grading_inputs == ["e\n", "pin\n", "adv\n"]
+    assert state.minimize["dropped"] == [2, 3, 4, 5]
@@ -0,0 +1,39 @@
+import hashlib
+import json
+
+from agents.tools import Toolbelt
+from tools.cassette import Cassette
+
+
+def _toolbelt(**kwargs) -> Toolbelt:
+    none = lambda *a, **k: None
+    defaults = dict(llm_chat=none, run_shell=none, write_file=none, read_file=none, list_dir=none,
+                    ensure_dir=none, generate_image=none)
+    return Toolbelt(**{**defaults, **kwargs})
+
+
+def test_record_keeps_only_digests_of_written_content(tmp_path):
+    written = {}
+    tb = _toolbelt(
+        write_file=lambda path, content: written.__setitem__(path, content),
+        llm_chat=lambda prompt, system=None: "answer",
+        upsert_catalog=lambda record: None,
+    )
+    cassette = Cassette(str(tmp_path / "c.json"), "record")
+    wrapped = cassette.wrap(tb)
+    content = "1 2 3\n" * 10000
+    wrapped.write_file("problems/1/cases/case_1.in", content)
+    wrapped.upsert_catalog({"id": "1", "cases": [{"input": content}]})
+    assert wrapped.llm_chat("prompt") == "answer"
+    cassette.save()
+
+    assert written == {"problems/1/cases/case_1.in": content}
+    entries = {e["tool"]: e for e in json.loads((tmp_path / "c.json").read_text())["entries"]}
+    assert entries["write_file"]["args"] == [
+        "problems/1/cases/case_1.in",
+        {"sha256": hashlib.sha256(content.encode()).hexdigest(), "bytes": len(content)},
+    ]
+    assert entries["upsert_catalog"]["args"][0]["id"] == "1"
+    assert "cases" not in entries["upsert_catalog"]["args"][0]
+    assert entries["llm_chat"]["args"] == ["prompt"] and entries["llm_chat"]["result"] == "answer"
+    assert (tmp_path / "c.json").stat().st_size < 2000
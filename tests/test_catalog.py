@@ -0,0 +1,53 @@
+import hashlib
+
+from agents import AuthoringConfig, AuthoringState
+from agents.steps import _catalog_record
+from tools.catalog import Catalog, problem_record
+
+
+def _state() -> AuthoringState:
+    state = AuthoringState("sum")
+    state.statement = {"abstract": "Sum N integers.\nSecond line is not part of the title."}
+    state.algo = {"algorithms": ["Prefix Sum", "Math"]}
+    state.io.grading_inputs = ["3\n1 2 3\n", "1\n5\n"]
+    state.io.grading_outputs = ["6\n", "5\n"]
+    state.io.grading_tags = [["example"], ["edge"]]
+    return state
+
+
+def test_persisted_record_round_trip(tmp_path):
+    catalog = Catalog(str(tmp_path / "catalog.sqlite"))
+    record = _catalog_record(_state(), AuthoringConfig(problem_id=1001), 1001, "problems/1001")
+    catalog.upsert(problem_record(record))
+
+    item = catalog.get("1001")
+    assert item["title"] == "Sum N integers."
+    assert item["tags"] == ["math", "prefix sum"]
+    assert item["status"] == "ok"
+    assert item["case_count"] == 2
+    assert item["total_bytes"] == len("3\n1 2 3\n6\n1\n5\n5\n")
+    first = item["cases"][0]
+    assert first["index"] == 1
+    assert first["input_sha256"] == hashlib.sha256(b"3\n1 2 3\n").hexdigest()
+    assert first["tags"] == ["example"]
+
+    assert [p["id"] for p in catalog.search(tag="Prefix Sum", status="ok")] == ["1001"]
+    assert catalog.search(tag="dp") == []
+    catalog.close()
+
+
+def test_upsert_replaces_previous_row(tmp_path):
+    catalog = Catalog(str(tmp_path / "catalog.sqlite"))
+    state = _state()
+    catalog.upsert(problem_record(_catalog_record(state, AuthoringConfig(), 7, "problems/7")))
+    state.io.grading_inputs.pop()
+    state.io.grading_outputs.pop()
+    state.dedupe = {"duplicate": True}
+    catalog.upsert(problem_record(_catalog_record(state, AuthoringConfig(), 7, "problems/7")))
+
+    item = catalog.get("7")
+    assert item["case_count"] == 1
+    assert item["status"] == "flagged"
+    assert item["flags"] == ["near_duplicate"]
+    assert len(catalog.search()) == 1
+    catalog.close()
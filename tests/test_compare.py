@@ -0,0 +1,71 @@
+import re
+
+import pytest
+
+from tools.compare import _locate, _token_batches, compare_files, compare_text
+
+SAMPLES = [
+    b"",
+    b"   \n\t ",
+    b"12345",
+    b"1 22 333\n4444 55555\n",
+    b"  leading and trailing  \n\n",
+    b"a\n\n\nbb   ccc\r\ndddd\teeeee ffffff\n",
+    b"x" * 50 + b" " + b"y" * 3 + b"\n" + b" " * 20 + b"z",
+]
+CHUNKS = [1, 2, 3, 4, 5, 7, 8, 16, 64]
+
+
+@pytest.mark.parametrize("chunk_size", CHUNKS)
+@pytest.mark.parametrize("buf", SAMPLES)
+def test_token_batches_rejoin_tokens_split_across_chunks(buf, chunk_size):
+    batches = list(_token_batches(buf, chunk_size))
+    assert all(batches), "no empty batches, even for whitespace-only chunks"
+    assert [t for batch in batches for t in batch] == buf.split()
+
+
+@pytest.mark.parametrize("chunk_size", CHUNKS)
+@pytest.mark.parametrize("buf", SAMPLES)
+def test_locate_reports_offset_and_line(buf, chunk_size):
+    for index, m in enumerate(re.finditer(rb"\S+", buf)):
+        expected = {"offset": m.start(), "line": buf[: m.start()].count(b"\n") + 1}
+        assert _locate(buf, index, chunk_size) == expected
+    past_end = len(buf.split())
+    assert _locate(buf, past_end, chunk_size) == {"offset": len(buf), "line": buf.count(b"\n") + 1}
+
+
+def test_whitespace_is_ignored():
+    assert compare_text("1 2\n3\n", "1\n2 3")["ok"]
+    assert compare_text("", " \n\n ")["ok"]
+
+
+def test_mismatch_position():
+    res = compare_text("1 2\n3 4\n", "1 2\n3 5\n")
+    assert not res["ok"]
+    assert (res["token"], res["expected"], res["actual"]) == (4, "4", "5")
+    assert (res["expected_line"], res["actual_line"]) == (2, 2)
+    assert res["expected_offset"] == 6
+
+
+def test_length_mismatch():
+    assert compare_text("1 2 3", "1 2")["message"].startswith("actual output ended early")
+    assert compare_text("1 2", "1 2 3")["message"].startswith("actual output has extra tokens")
+
+
+def test_float_tolerance():
+    assert not compare_text("0.5", "0.5000001")["ok"]
+    assert compare_text("0.5", "0.5000001", mode="float")["ok"]
+    assert compare_text("1000000", "1000000.5", mode="float")["ok"]  # relative
+    assert not compare_text("1.0", "1.01", mode="float")["ok"]
+    assert not compare_text("nan", "0.0", mode="float")["ok"]
+    assert not compare_text("abc", "abd", mode="float")["ok"]
+    with pytest.raises(ValueError):
+        compare_text("1", "1", mode="exact")
+
+
+def test_compare_files_handles_empty_files(tmp_path):
+    empty, data = tmp_path / "empty.out", tmp_path / "data.out"
+    empty.write_bytes(b"")
+    data.write_bytes(b"7\n")
+    assert compare_files(str(empty), str(empty))["ok"]
+    assert not compare_files(str(data), str(empty))["ok"]
@@ -0,0 +1,81 @@
+import pytest
+
+from agents.complexity import INCONCLUSIVE, exceeds_budget, fit, hint_class, project, slower_than
+
+
+@pytest.mark.parametrize(
+    "hint, expected",
+    [
+        ("O(1)", "1"),
+        ("O(log N)", "log n"),
+        ("O(N + M)", "n"),
+        ("O(N log N)", "n log n"),
+        ("O((N + Q) log N)", "n log n"),
+        (r"O(N \cdot \log N)", "n log n"),
+        ("O(Q log^2 N)", "n log n"),
+        (r"O(N \sqrt{N})", "n sqrt n"),
+        ("O(N√N)", "n sqrt n"),
+        ("O(n^{3/2})", "n sqrt n"),
+        ("O(n^2)", "n^2"),
+        ("O(NM)", "n^2"),
+        (r"O(n^2 \log n)", "n^2 log n"),
+        ("O(N^2 M)", "n^3"),
+        ("O(N) with a segment tree (O(log N) per query)", "n"),
+    ],
+)
+def test_hint_class(hint, expected):
+    assert hint_class(hint) == expected
+
+
+@pytest.mark.parametrize("hint", ["", "O(2^N)", "O(N 2^N)", "O(N!)", "O(n^k)", "O(n^4)", "linear time"])
+def test_hint_class_unknown(hint):
+    assert hint_class(hint) is None
+
+
+def _points(g, overhead=0.001, scale=1e-7):
+    return [(n, overhead + scale * g(n)) for n in (3125, 12500, 50000, 200000, 800000)]
+
+
+def test_fit_linear():
+    model = fit(_points(lambda n: n))
+    assert model["class"] == "n"
+    assert model["slope"] == pytest.approx(1.0, abs=0.1)
+    assert project(model, 1600000) == pytest.approx(0.001 + 1e-7 * 1600000, rel=0.05)
+
+
+def test_fit_quadratic():
+    model = fit(_points(lambda n: n * n, scale=1e-12))
+    assert model["class"] == "n^2"
+    assert model["slope"] == pytest.approx(2.0, abs=0.1)
+
+
+def test_fit_is_inconclusive_near_the_overhead():
+    # Only the largest size rises clearly above the start-up time.
+    model = fit([(3125, 0.0100), (12500, 0.0101), (50000, 0.0102), (200000, 0.0103), (800000, 0.02)])
+    assert model["class"] == INCONCLUSIVE
+    assert model["above_overhead"] < 3
+
+
+def test_slower_than_compares_polynomial_degree():
+    assert slower_than("n^2", "n log n")
+    assert slower_than("n sqrt n", "n")
+    assert not slower_than("n log n", "n")
+    assert not slower_than("n", "n^2")
+
+
+def test_slow_measured_point_exceeds_budget_even_when_inconclusive():
+    points = [(781, 0.003), (3125, 0.0031), (12500, 0.0035), (50000, 0.031), (200000, 1.8)]
+    model = fit(points)
+    assert model["class"] == INCONCLUSIVE
+    assert exceeds_budget(points, 1.0, max_n=200000)
+    assert not exceeds_budget(points, 2.0, max_n=200000)
+
+
+def test_exceeds_budget_projection_and_timeouts():
+    points = [(3125, 0.01), (12500, 0.02), (50000, 0.05)]
+    assert exceeds_budget(points, 1.0, max_n=200000, projected=1.5)
+    assert not exceeds_budget(points, 1.0, max_n=200000, projected=0.5)
+    assert exceeds_budget(points, 1.0, max_n=200000, timed_out=[200000])
+    # A timeout above the largest allowed size does not count, unless the bound is unknown.
+    assert not exceeds_budget(points, 1.0, max_n=100000, timed_out=[200000])
+    assert exceeds_budget(points, 1.0, timed_out=[200000])
@@ -0,0 +1,140 @@
+import json
+import time
+
+import pytest
+
+from tools import hedge
+
+
+@pytest.fixture(autouse=True)
+def fresh_tracker(monkeypatch):
+    # Keep latency samples in memory only, and start every test without history.
+    monkeypatch.setenv("PSGEN_LATENCY_FILE", "")
+    monkeypatch.setattr(hedge, "_TRACKER", None)
+    yield hedge.tracker()
+
+
+def _seed(step: str, seconds: float, count: int = 5) -> None:
+    for _ in range(count):
+        hedge.tracker().add(step, seconds)
+
+
+def _delta(before, key):
+    return hedge.metrics()[key] - before[key]
+
+
+def _llm(answer, delay=0.0, log=None, name="primary"):
+    def call(prompt, system):
+        if log is not None:
+            log.append((name, time.monotonic()))
+        time.sleep(delay)
+        return answer
+
+    return call
+
+
+def test_fast_call_without_history_is_not_hedged():
+    before = hedge.metrics()
+    calls = []
+    result = hedge.hedged_call(
+        _llm('{"v": 1}', log=calls), "p", None, json.loads, "t-nohistory",
+        hedge_percentile=90, fallback=_llm('{"v": 2}', log=calls, name="fallback"),
+    )
+    assert result == {"v": 1}
+    assert [name for name, _ in calls] == ["primary"]
+    assert _delta(before, "hedged") == 0
+    # The call itself becomes history for the next one.
+    assert hedge.tracker().percentile("t-nohistory", 90, 1) is not None
+
+
+def test_slow_primary_is_hedged_after_the_percentile_and_the_hedge_wins():
+    _seed("t-slow", 0.05)
+    before = hedge.metrics()
+    calls = []
+    start = time.monotonic()
+    result = hedge.hedged_call(
+        _llm('{"v": "primary"}', delay=0.5, log=calls), "p", None, json.loads, "t-slow",
+        hedge_percentile=90, fallback=_llm('{"v": "hedge"}', delay=0.01, log=calls, name="fallback"),
+    )
+    elapsed = time.monotonic() - start
+
+    assert result == {"v": "hedge"}
+    assert [name for name, _ in calls] == ["primary", "fallback"]
+    hedge_sent = calls[1][1] - start
+    assert 0.04 <= hedge_sent < 0.3
+    assert elapsed < 0.4  # did not wait for the primary
+    assert _delta(before, "hedged") == 1
+    assert _delta(before, "hedge_wins") == 1
+
+
+def test_primary_that_answers_before_the_threshold_is_not_hedged():
+    _seed("t-quick", 0.3)
+    before = hedge.metrics()
+    calls = []
+    result = hedge.hedged_call(
+        _llm('{"v": 1}', delay=0.01, log=calls), "p", None, json.loads, "t-quick",
+        hedge_percentile=90, fallback=_llm('{"v": 2}', log=calls, name="fallback"),
+    )
+    assert result == {"v": 1}
+    assert [name for name, _ in calls] == ["primary"]
+    assert _delta(before, "hedged") == 0
+    assert _delta(before, "hedge_wins") == 0
+
+
+def test_primary_can_still_win_after_the_hedge_is_sent():
+    _seed("t-race", 0.02)
+    before = hedge.metrics()
+    result = hedge.hedged_call(
+        _llm('{"v": "primary"}', delay=0.1), "p", None, json.loads, "t-race",
+        hedge_percentile=90, fallback=_llm('{"v": "hedge"}', delay=0.5),
+    )
+    assert result == {"v": "primary"}
+    assert _delta(before, "hedged") == 1
+    assert _delta(before, "hedge_wins") == 0
+
+
+def test_deadline_raises_timeout_error():
+    before = hedge.metrics()
+    start = time.monotonic()
+    with pytest.raises(TimeoutError, match="t-deadline"):
+        hedge.hedged_call(_llm('{"v": 1}', delay=0.5), "p", None, json.loads, "t-deadline", deadline=0.05)
+    assert time.monotonic() - start < 0.3
+    assert _delta(before, "deadline_exceeded") == 1
+
+
+def test_deadline_applies_to_the_hedge_too():
+    _seed("t-both-slow", 0.02)
+    before = hedge.metrics()
+    with pytest.raises(TimeoutError):
+        hedge.hedged_call(
+            _llm('{"v": 1}', delay=0.5), "p", None, json.loads, "t-both-slow",
+            deadline=0.1, hedge_percentile=90, fallback=_llm('{"v": 2}', delay=0.5),
+        )
+    assert _delta(before, "hedged") == 1
+    assert _delta(before, "deadline_exceeded") == 1
+
+
+def test_invalid_early_response_sends_the_hedge_immediately():
+    _seed("t-invalid", 1.0)
+    before = hedge.metrics()
+    calls = []
+    start = time.monotonic()
+    result = hedge.hedged_call(
+        _llm("not json", delay=0.01, log=calls), "p", None, json.loads, "t-invalid",
+        hedge_percentile=90, fallback=_llm('{"v": "hedge"}', delay=0.01, log=calls, name="fallback"),
+    )
+    assert result == {"v": "hedge"}
+    assert [name for name, _ in calls] == ["primary", "fallback"]
+    # Sent as soon as the bad answer arrived, not after the 1 s percentile.
+    assert calls[1][1] - start < 0.5
+    assert _delta(before, "invalid_responses") == 1
+    assert _delta(before, "hedge_wins") == 1
+
+
+def test_invalid_responses_from_both_calls_raise_the_parse_error():
+    _seed("t-all-invalid", 1.0)
+    with pytest.raises(json.JSONDecodeError):
+        hedge.hedged_call(
+            _llm("nope"), "p", None, json.loads, "t-all-invalid",
+            hedge_percentile=90, fallback=_llm("still nope"),
+        )
@@ -0,0 +1,85 @@
+import pytest
+
+from tools.ratelimit import CircuitBreaker, CircuitOpenError, ProviderLimiter
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _open(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.threshold):
+        breaker.record_failure()
+    assert breaker.state == "open"
+
+
+def test_open_circuit_waits_until_half_open_and_lets_one_probe_through():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=2, reset_after=30, max_wait=60, clock=clock, sleep=clock.sleep)
+    _open(breaker)
+    clock.now = 10.0
+
+    assert breaker.before_call() == pytest.approx(20.0)
+    assert clock.sleeps == [pytest.approx(20.0)]
+    assert breaker.state == "half-open"
+
+    # A second caller waits for the probe's result instead of sending its own request.
+    clock.sleeps.clear()
+
+    def probe_succeeds(seconds: float) -> None:
+        clock.sleep(seconds)
+        breaker.record_success()
+
+    breaker._sleep = probe_succeeds
+    assert breaker.before_call() == pytest.approx(1.0)
+    assert breaker.state == "closed"
+
+
+def test_failed_probe_reopens_the_circuit():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=1, reset_after=5, max_wait=60, clock=clock, sleep=clock.sleep)
+    _open(breaker)
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.before_call() == pytest.approx(5.0)
+
+
+def test_gives_up_after_max_wait():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=1, reset_after=100, max_wait=30, clock=clock, sleep=clock.sleep)
+    _open(breaker)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert clock.now == pytest.approx(30.0)
+
+
+def test_zero_max_wait_fails_immediately():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=1, reset_after=100, max_wait=0, clock=clock, sleep=clock.sleep)
+    _open(breaker)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert clock.sleeps == []
+
+
+def test_limiter_waits_for_the_circuit_and_counts_the_wait():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=1, reset_after=30, max_wait=60, clock=clock, sleep=clock.sleep)
+    lim = ProviderLimiter("test", rpm=6000, breaker=breaker)
+    _open(breaker)
+
+    assert lim.call(lambda: "ok") == "ok"
+    m = lim.metrics()
+    assert m["circuit"] == "closed"
+    assert m["circuit_wait_total"] == pytest.approx(30.0)
+    assert m["rejected_open_circuit"] == 0